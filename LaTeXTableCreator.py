@@ -12,21 +12,102 @@ the user selects.
 
 """
 
+import time
+startupClock = time.perf_counter()
+
+import argparse
 import pickle
 import platform
 import sys
 import os
-
-from PySide6.QtCore import Qt, QSize, QDir
-from PySide6.QtGui import QIcon, QAction
-from PySide6.QtWidgets import *
+import re
+import json
+import math
+import bisect
+import csv
+import heapq
+import operator
+import mmap
+import struct
+import unicodedata
+import zlib
+from array import array
+from collections import OrderedDict
+from collections.abc import Mapping
+from itertools import accumulate
+from types import MappingProxyType
+from html.parser import HTMLParser
+
+from PySide6.QtCore import (Qt, QSize, QDir, QAbstractTableModel, QModelIndex, QLockFile, QStandardPaths, QTimer,
+                            QObject, QRunnable, QThreadPool, Signal)
+from PySide6.QtGui import QIcon, QAction, QColor, QFont, QFontDatabase, QFontMetricsF, QPalette
+from PySide6.QtWidgets import (QAbstractItemView, QApplication, QButtonGroup, QCheckBox, QComboBox, QDialog,
+                               QDialogButtonBox, QDockWidget, QFileDialog, QFormLayout, QGroupBox, QHBoxLayout,
+                               QInputDialog, QLabel, QLineEdit, QListWidget, QMainWindow, QMessageBox,
+                               QPlainTextEdit, QProgressDialog, QRadioButton, QScrollArea, QSizePolicy, QSpinBox,
+                               QStackedWidget, QStyle, QStyledItemDelegate, QStyleFactory, QTabWidget, QTableView, QTableWidget,
+                               QTableWidgetItem, QToolBar, QVBoxLayout, QWidget)
 
 import webbrowser
 
+# Icons compiled into a Qt resource module, see LTCResources.qrc.  When the
+# module has not been generated the icons are read from the icons folder.
+try:
+    import LTCResources_rc
+    hasResourceBundle = True
+except ImportError:
+    hasResourceBundle = False
+
+# NumPy is optional, the conditional format rules are evaluated with it when
+# it is installed.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 # For the Mac OS
 os.environ['QT_MAC_WANTS_LAYER'] = '1'
 
 
+class LTCStartupProfiler:
+    """
+    Records the time spent in each phase of the program start when the program
+    is run with --profile-startup.
+    """
+
+    enabled = False
+    phases = []
+    lastMark = None
+
+    @classmethod
+    def mark(cls, phase, start=None):
+        """
+        End the named phase, it started at start or at the previous mark.
+        """
+        if not cls.enabled:
+            return
+        now = time.perf_counter()
+        if start is None:
+            start = cls.lastMark if cls.lastMark is not None else now
+        cls.phases.append((phase, now - start))
+        cls.lastMark = now
+
+    @classmethod
+    def report(cls):
+        """
+        Print the phase timings to stderr.
+        """
+        if not cls.enabled:
+            return
+        cls.mark("First event loop pass")
+        width = max(len(phase) for phase, _ in cls.phases)
+        total = sum(seconds for _, seconds in cls.phases)
+        print("Startup profile:", file=sys.stderr)
+        for phase, seconds in cls.phases:
+            print("  {0:<{1}}  {2:8.1f} ms".format(phase, width, seconds * 1000), file=sys.stderr)
+        print("  {0:<{1}}  {2:8.1f} ms".format("Total", width, total * 1000), file=sys.stderr)
+
+
 class LTCappcss:
     def __init__(self):
         super().__init__()
@@ -44,7 +125,584 @@ class LTCappcss:
     def getCSS(self):
         return self.css
 
+class LTCColumnStatistics:
+    """
+    Per column facts about the table: the rows holding the longest items, the
+    number of empty and numeric cells and the decimal places of the numbers.
+    The index is built from a table snapshot, so it can be built on a worker,
+    and is kept up to date as cells change or are pasted.  It describes the
+    table at revision, after a structural change it is rebuilt from the
+    current history entry rather than from the grid.
+
+    Each column has a revision number that changes whenever one of its cells
+    changes, so results computed from a column can be cached by it.
+    """
+
+    longestCount = 8
+    numberPattern = re.compile(r'[-+]?(?:\d+(?:,\d{3})*(?:\.(\d*))?|\.(\d+))(?:[eE][-+]?\d+)?$')
+    columnRevisions = 0
+
+    def __init__(self, items, revision, task=None):
+        self.revision = revision
+        self.items = items
+        self.changed = {}
+        self.stale = set()
+        self.rowCount = len(items)
+        self.longest = []
+        self.empty = []
+        self.numeric = []
+        self.decimals = []
+        self.columnRevision = []
+        cols = len(items[0]) if len(items) > 0 else 0
+        for j in range(cols):
+            if task is not None:
+                task.setProgress(j, cols)
+            self.longest.append(self.findLongest(j))
+            empty = 0
+            numeric = 0
+            decimals = {}
+            for row in items:
+                kind = self.classify(row[j])
+                if kind is None:
+                    empty += 1
+                elif kind >= 0:
+                    numeric += 1
+                    decimals[kind] = decimals.get(kind, 0) + 1
+            self.empty.append(empty)
+            self.numeric.append(numeric)
+            self.decimals.append(decimals)
+            self.columnRevision.append(self.nextColumnRevision())
+
+    @classmethod
+    def nextColumnRevision(cls):
+        cls.columnRevisions += 1
+        return cls.columnRevisions
+
+    @classmethod
+    def classify(cls, text):
+        """
+        Returns None for an empty item, the number of decimal places for a
+        number, in or out of math mode, and -1 for any other text.
+        """
+        text = text.strip()
+        if text == '':
+            return None
+        if len(text) > 1 and text[0] == '$' and text[-1] == '$':
+            text = text[1:-1].strip()
+        match = cls.numberPattern.match(text)
+        if match is None:
+            return -1
+        places = match.group(1) or match.group(2) or ''
+        return len(places)
+
+    def cellText(self, row, col):
+        return self.changed.get((row, col), self.items[row][col])
+
+    def findLongest(self, col):
+        """
+        Returns the (length, row) pairs of the longest items of the column.
+        """
+        lengths = [len(self.cellText(i, col)) for i in range(self.rowCount)]
+        rows = heapq.nlargest(self.longestCount, range(len(lengths)), key=lengths.__getitem__)
+        return [(lengths[i], i) for i in rows]
+
+    def refreshStale(self):
+        """
+        Rebuilds the longest item lists of the columns marked stale.
+        """
+        for col in self.stale:
+            self.longest[col] = self.findLongest(col)
+        self.stale = set()
+
+    def countItem(self, col, text, step):
+        kind = self.classify(text)
+        if kind is None:
+            self.empty[col] += step
+        elif kind >= 0:
+            self.numeric[col] += step
+            decimals = self.decimals[col]
+            decimals[kind] = decimals.get(kind, 0) + step
+            if decimals[kind] == 0:
+                del decimals[kind]
+
+    def cellChanged(self, row, col, text):
+        """
+        Updates the index for a changed cell.  If one of the longest items got
+        shorter another row may now be longer, so the column is marked stale.
+        """
+        old = self.cellText(row, col)
+        if old == text:
+            return
+        self.countItem(col, old, -1)
+        self.countItem(col, text, 1)
+        self.changed[(row, col)] = text
+        self.columnRevision[col] = self.nextColumnRevision()
+
+        entries = self.longest[col]
+        length = len(text)
+        for k in range(len(entries)):
+            if entries[k][1] == row:
+                if length < entries[k][0]:
+                    self.stale.add(col)
+                entries[k] = (length, row)
+                break
+        else:
+            if len(entries) < self.longestCount or length > entries[-1][0]:
+                entries.append((length, row))
+        entries.sort(reverse=True)
+        del entries[self.longestCount:]
+
+    def blockChanged(self, startrow, startcol, items):
+        """
+        Updates the index for a pasted block that lies inside the table.
+        """
+        for i in range(len(items)):
+            for j in range(len(items[i])):
+                self.cellChanged(startrow + i, startcol + j, items[i][j])
+
+    def candidateRows(self, col):
+        return [row for length, row in self.longest[col]]
+
+    def columnCount(self):
+        return len(self.longest)
+
+    def maxLength(self, col):
+        return self.longest[col][0][0] if len(self.longest[col]) > 0 else 0
+
+    def emptyCount(self, col):
+        return self.empty[col]
+
+    def maxDecimals(self, col):
+        return max(self.decimals[col]) if len(self.decimals[col]) > 0 else 0
+
+    def isNumeric(self, col):
+        """
+        True if the column has numbers and every other item is empty.
+        """
+        return self.numeric[col] > 0 and self.numeric[col] + self.empty[col] == self.rowCount
+
+    def suggestedAlignment(self):
+        """
+        Suggests Right alignment if every non-empty column is numeric and Left
+        otherwise.
+        """
+        used = [j for j in range(self.columnCount()) if self.empty[j] < self.rowCount]
+        if len(used) > 0 and all(self.isNumeric(j) for j in used):
+            return 'Right'
+        return 'Left'
+
+    def suggestedTabbingWidth(self):
+        """
+        Suggests a tabbing column width in points from the longest item, about
+        5pt per character plus a 10pt gap.
+        """
+        longest = max([self.maxLength(j) for j in range(self.columnCount())], default=0)
+        return 5 * longest + 10
+
+
+class LTCSpanIndex:
+    """
+    Immutable set of merged cell blocks, each a (row, column, rows, columns)
+    tuple with its text in the upper left cell.  The spans of each row are
+    sorted by column, so the span covering a cell is found by bisection.
+    """
+
+    def __init__(self, spans=()):
+        self.spans = tuple(sorted(tuple(span) for span in spans))
+        self.rowSpans = {}
+        for span in self.spans:
+            for i in range(span[0], span[0] + span[2]):
+                self.rowSpans.setdefault(i, []).append(span)
+        self.rowStarts = {}
+        for i, rowSpans in self.rowSpans.items():
+            rowSpans.sort(key=lambda span: span[1])
+            self.rowStarts[i] = [span[1] for span in rowSpans]
+
+    def __iter__(self):
+        return iter(self.spans)
+
+    def __len__(self):
+        return len(self.spans)
+
+    def __eq__(self, other):
+        return isinstance(other, LTCSpanIndex) and self.spans == other.spans
+
+    def __hash__(self):
+        return hash(self.spans)
+
+    def find(self, row, col):
+        """
+        Returns the span covering the cell, or None.
+        """
+        starts = self.rowStarts.get(row)
+        if starts is None:
+            return None
+        k = bisect.bisect_right(starts, col) - 1
+        if k >= 0:
+            span = self.rowSpans[row][k]
+            if col < span[1] + span[3]:
+                return span
+        return None
+
+    def spansInRow(self, row):
+        """
+        Returns the spans covering the row, sorted by column.
+        """
+        return self.rowSpans.get(row, ())
+
+    def hasMultirow(self):
+        """
+        True if a span covers more than one row.
+        """
+        return any(span[2] > 1 for span in self.spans)
+
+    def overlapping(self, row, col, rows, cols):
+        """
+        Returns the set of spans that overlap the block of cells.
+        """
+        found = set()
+        for i in range(row, row + rows):
+            for span in self.rowSpans.get(i, ()):
+                if span[1] < col + cols and col < span[1] + span[3]:
+                    found.add(span)
+        return found
+
+    def merge(self, row, col, rows, cols):
+        """
+        Returns the index with the block of cells merged.  The block is grown
+        to take in the spans it overlaps, which are replaced.
+        """
+        while True:
+            overlapped = self.overlapping(row, col, rows, cols)
+            top = min([row] + [span[0] for span in overlapped])
+            left = min([col] + [span[1] for span in overlapped])
+            bottom = max([row + rows] + [span[0] + span[2] for span in overlapped])
+            right = max([col + cols] + [span[1] + span[3] for span in overlapped])
+            if (top, left, bottom - top, right - left) == (row, col, rows, cols):
+                break
+            row, col, rows, cols = top, left, bottom - top, right - left
+
+        spans = [span for span in self.spans if span not in overlapped]
+        if rows * cols > 1:
+            spans.append((row, col, rows, cols))
+        return LTCSpanIndex(spans)
+
+    def unmerge(self, row, col, rows, cols):
+        """
+        Returns the index without the spans that overlap the block of cells.
+        """
+        overlapped = self.overlapping(row, col, rows, cols)
+        return LTCSpanIndex([span for span in self.spans if span not in overlapped])
+
+    @staticmethod
+    def shiftRange(start, size, at, count):
+        """
+        Returns the start and size of a range of rows or columns after count
+        are inserted at a position, or removed from it if count is negative.
+        Inserting inside the range grows it.
+        """
+        if count >= 0:
+            if at <= start:
+                return start + count, size
+            if at < start + size:
+                return start, size + count
+            return start, size
+        end = start + size
+        removed = range(at, at - count)
+        start -= len(range(removed.start, min(removed.stop, start)))
+        end -= len(range(removed.start, min(removed.stop, end)))
+        return start, end - start
+
+    def shift(self, axis, at, count):
+        """
+        Returns the index after rows (axis 0) or columns (axis 1) are inserted
+        or removed.  Spans cut down to a single cell are dropped.
+        """
+        spans = []
+        for span in self.spans:
+            span = list(span)
+            span[axis], span[axis + 2] = self.shiftRange(span[axis], span[axis + 2], at, count)
+            if span[2] * span[3] > 1:
+                spans.append(span)
+        return LTCSpanIndex(spans)
+
+    def insertRows(self, at, count):
+        return self.shift(0, at, count)
+
+    def removeRows(self, at, count):
+        return self.shift(0, at, -count)
+
+    def insertColumns(self, at, count):
+        return self.shift(1, at, count)
+
+    def removeColumns(self, at, count):
+        return self.shift(1, at, -count)
+
+    def transpose(self):
+        """
+        Returns the index of the transposed table.
+        """
+        return LTCSpanIndex([(col, row, cols, rows) for row, col, rows, cols in self.spans])
+
+    def clip(self, rows, cols):
+        """
+        Returns the index cut down to a table of rows by cols.
+        """
+        spans = []
+        for row, col, spanRows, spanCols in self.spans:
+            spanRows = min(spanRows, rows - row)
+            spanCols = min(spanCols, cols - col)
+            if spanRows > 0 and spanCols > 0 and spanRows * spanCols > 1:
+                spans.append((row, col, spanRows, spanCols))
+        if len(spans) == len(self.spans) and all(a == b for a, b in zip(spans, self.spans)):
+            return self
+        return LTCSpanIndex(spans)
+
+    def toList(self):
+        """
+        Returns the spans as lists, for JSON.
+        """
+        return [list(span) for span in self.spans]
+
+
+class LTCCellStyles:
+    """
+    Immutable per-cell text styles, a 16 bit mask of flags, alignment and
+    color for each cell, kept in an array('H') for each row with a styled cell.
+    """
+
+    bold = 0x1
+    italic = 0x2
+    underline = 0x4
+    alignShift = 3
+    alignMask = 0x3 << alignShift
+    colorShift = 5
+    colorMask = 0xf << colorShift
+    allMask = 0xffff
+
+    alignments = ['', 'l', 'c', 'r']
+
+    # The xcolor name and HTML value of each color number, 0 is the text color.
+    colors = [(None, None), ('red', '#FF0000'), ('green', '#00FF00'), ('blue', '#0000FF'), ('cyan', '#00FFFF'),
+              ('magenta', '#FF00FF'), ('orange', '#FF8000'), ('purple', '#BF0040'), ('brown', '#BF8040'),
+              ('olive', '#808000'), ('teal', '#008080'), ('violet', '#800080'), ('gray', '#808080')]
+
+    def __init__(self, rows=None):
+        self.rows = {} if rows is None else rows
+
+    @classmethod
+    def fromList(cls, entries):
+        """
+        Returns the styles saved by toList.
+        """
+        return cls({row: array('H', values) for row, values in entries})
+
+    def toList(self):
+        """
+        Returns the styled rows as [row, masks] lists, for JSON.
+        """
+        return [[row, values.tolist()] for row, values in sorted(self.rows.items())]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __eq__(self, other):
+        return isinstance(other, LTCCellStyles) and self.rows == other.rows
+
+    def key(self):
+        """
+        Returns a hashable copy of the styles.
+        """
+        return tuple((row, values.tobytes()) for row, values in sorted(self.rows.items()))
+
+    __hash__ = None
+
+    def get(self, row, col):
+        """
+        Returns the style mask of the cell.
+        """
+        values = self.rows.get(row)
+        if values is None or col >= len(values):
+            return 0
+        return values[col]
+
+    def rowKey(self, row):
+        """
+        Returns the masks of the row as bytes for the row fragment keys, or
+        None if the row has no styles.
+        """
+        values = self.rows.get(row)
+        return None if values is None else values.tobytes()
+
+    @classmethod
+    def alignment(cls, style):
+        """
+        Returns the alignment letter of a style, or '' for the column alignment.
+        """
+        return cls.alignments[(style & cls.alignMask) >> cls.alignShift]
+
+    @classmethod
+    def color(cls, style):
+        """
+        Returns the (xcolor name, HTML value) of a style.
+        """
+        return cls.colors[min((style & cls.colorMask) >> cls.colorShift, len(cls.colors) - 1)]
+
+    def hasColor(self):
+        """
+        True if a cell has a color.
+        """
+        return any(style & self.colorMask for values in self.rows.values() for style in values)
+
+    def allSet(self, row, col, rows, cols, flag):
+        """
+        True if every cell of the block has the flag.
+        """
+        return all(self.get(i, j) & flag for i in range(row, row + rows) for j in range(col, col + cols))
+
+    def apply(self, row, col, rows, cols, setMask, clearMask=0):
+        """
+        Returns the styles with the bits of clearMask cleared and then the bits
+        of setMask set in the block of cells.
+        """
+        newRows = dict(self.rows)
+        for i in range(row, row + rows):
+            values = array('H', newRows.get(i, ()))
+            if len(values) < col + cols:
+                values.extend(bytes(col + cols - len(values)))
+            for j in range(col, col + cols):
+                values[j] = (values[j] & ~clearMask) | setMask
+            if any(values):
+                newRows[i] = values
+            else:
+                newRows.pop(i, None)
+        return LTCCellStyles(newRows)
+
+    def applyMarks(self, marks, cols):
+        """
+        Returns the styles with a list of (row, column, setMask, clearMask)
+        marks applied in order, in a table of cols columns.
+        """
+        if len(marks) == 0:
+            return self
+        newRows = dict(self.rows)
+        copied = set()
+        for row, col, setMask, clearMask in marks:
+            if row not in copied:
+                values = array('H', newRows.get(row, ()))
+                if len(values) < cols:
+                    values.extend(bytes(cols - len(values)))
+                newRows[row] = values
+                copied.add(row)
+            values = newRows[row]
+            values[col] = (values[col] & ~clearMask) | setMask
+        for row in copied:
+            if not any(newRows[row]):
+                del newRows[row]
+        return LTCCellStyles(newRows)
+
+    def insertRows(self, at, count):
+        if len(self.rows) == 0:
+            return self
+        return LTCCellStyles({(i + count if i >= at else i): values for i, values in self.rows.items()})
+
+    def removeRows(self, at, count):
+        if len(self.rows) == 0:
+            return self
+        return LTCCellStyles({(i - count if i >= at + count else i): values for i, values in self.rows.items()
+                              if not at <= i < at + count})
+
+    def insertColumns(self, at, count):
+        if len(self.rows) == 0:
+            return self
+        rows = {}
+        for i, values in self.rows.items():
+            if at < len(values):
+                values = values[:at] + array('H', bytes(2 * count)) + values[at:]
+            rows[i] = values
+        return LTCCellStyles(rows)
+
+    def removeColumns(self, at, count):
+        if len(self.rows) == 0:
+            return self
+        rows = {}
+        for i, values in self.rows.items():
+            values = values[:at] + values[at + count:]
+            if any(values):
+                rows[i] = values
+        return LTCCellStyles(rows)
+
+    def transpose(self):
+        """
+        Returns the styles of the transposed table.
+        """
+        if len(self.rows) == 0:
+            return self
+        rows = {}
+        for i, values in self.rows.items():
+            for j, style in enumerate(values):
+                if style != 0:
+                    column = rows.setdefault(j, array('H'))
+                    if len(column) <= i:
+                        column.extend(bytes(i + 1 - len(column)))
+                    column[i] = style
+        return LTCCellStyles(rows)
+
+    def clip(self, rows, cols):
+        """
+        Returns the styles cut down to a table of rows by cols.
+        """
+        if all(i < rows and len(values) <= cols for i, values in self.rows.items()):
+            return self
+        clipped = {}
+        for i, values in self.rows.items():
+            if i < rows and any(values[:cols]):
+                clipped[i] = values[:cols]
+        return LTCCellStyles(clipped)
+
+
+class LTCStyleDelegate(QStyledItemDelegate):
+    """
+    Draws the cells of a table with their cell styles.
+    """
+
+    alignFlags = {'l': Qt.AlignLeft, 'c': Qt.AlignHCenter, 'r': Qt.AlignRight}
+
+    def __init__(self, table):
+        super().__init__(table)
+        self.table = table
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        style = self.table.cellStyles.get(index.row(), index.column())
+        if style == 0:
+            return
+
+        font = QFont(option.font)
+        font.setBold(bool(style & LTCCellStyles.bold))
+        font.setItalic(bool(style & LTCCellStyles.italic))
+        font.setUnderline(bool(style & LTCCellStyles.underline))
+        option.font = font
+
+        alignment = LTCCellStyles.alignment(style)
+        if alignment != '':
+            option.displayAlignment = self.alignFlags[alignment] | Qt.AlignVCenter
+
+        name, value = LTCCellStyles.color(style)
+        if value is not None:
+            palette = QPalette(option.palette)
+            palette.setColor(QPalette.Text, QColor(value))
+            palette.setColor(QPalette.HighlightedText, QColor(value))
+            option.palette = palette
+
+
 class LTC_Table(QTableWidget):
+
+    tableChanged = Signal()
+    coalesceWindow = 1500
+    textWidthCache = {}
+    textWidthCacheLimit = 100000
+
     def __init__(self, parent=None):
         super(LTC_Table, self).__init__(parent)
         self.setRowCount(3)
@@ -52,9 +710,33 @@ class LTC_Table(QTableWidget):
         self.setSelectionMode(QAbstractItemView.ContiguousSelection)
         self.setCurrentCell(0, 0)
         self.cellChanged.connect(self.onCellChanged)
+        self.journal = None
+        self.journalSuspended = 0
+        self.revision = 0
+        self.shrinkStash = None
         self.tableHistory = []
+        self.spanIndex = LTCSpanIndex()
+        self.spanHistory = []
+        self.cellStyles = LTCCellStyles()
+        self.styleHistory = []
+        self.setItemDelegate(LTCStyleDelegate(self))
         self.historyPos = 0
+        self.transactionDepth = 0
+        self.columnStats = None
+        self.autoFit = False
+        self.pendingEdits = False
+        self.pendingCells = {}
+        self.enterRun = False
+        self.enterMoving = False
         self.addToHistory()
+        self.currentCellChanged.connect(self.onCurrentCellChanged)
+
+        # Cell edits made within the coalescing window of each other become
+        # one undo entry.
+        self.coalesce_timer = QTimer(self)
+        self.coalesce_timer.setSingleShot(True)
+        self.coalesce_timer.setInterval(self.coalesceWindow)
+        self.coalesce_timer.timeout.connect(self.coalesceTimeout)
         ft = self.font()
         self.fontPointSize = 12
         ft.setPointSize(self.fontPointSize)
@@ -75,14 +757,21 @@ class LTC_Table(QTableWidget):
                 col = col + 1
             if col >= self.columnCount():
                 col = 0
+            # Edits along a run of Enter moves are one undo entry.
+            self.enterRun = True
+            self.enterMoving = True
             self.setCurrentCell(row, col)
+            self.enterMoving = False
         elif key == Qt.Key_Delete:
+            self.commitPendingEdits()
             self.blockSignals(True)
             rng = self.selectedCellRanges()
             if len(rng) > 0:
                 for i in range(rng[0][0], rng[0][1] + 1):
                     for j in range(rng[1][0], rng[1][1] + 1):
                         self.setItem(i, j, QTableWidgetItem(''))
+                blank = [[''] * (rng[1][1] - rng[1][0] + 1) for i in range(rng[0][1] - rng[0][0] + 1)]
+                self.journalOp(['paste', rng[0][0], rng[1][0], blank])
 
             self.addToHistory()
             self.blockSignals(False)
@@ -110,10 +799,107 @@ class LTC_Table(QTableWidget):
         ft.setPointSize(self.fontPointSize)
         self.setFont(ft)
 
+    @staticmethod
+    def textWidth(text, metrics, cache):
+        """
+        Width of the longest line of the text, cached per font.
+        """
+        width = cache.get(text)
+        if width is None:
+            if '\n' in text:
+                width = math.ceil(max(metrics.horizontalAdvance(line) for line in text.split('\n')))
+            else:
+                width = math.ceil(metrics.horizontalAdvance(text))
+            if len(cache) >= LTC_Table.textWidthCacheLimit:
+                cache.clear()
+            cache[text] = width
+        return width
+
+    def cellPadding(self):
+        """
+        Space around the text in a cell, as used by resizeColumnsToContents.
+        """
+        margin = self.style().pixelMetric(QStyle.PM_FocusFrameHMargin, None, self)
+        return 2 * (margin + 1) + (1 if self.showGrid() else 0)
+
+    def visibleRows(self):
+        """
+        Returns the rows in view and one page below.
+        """
+        top = max(self.rowAt(0), 0)
+        bottom = self.rowAt(self.viewport().height() - 1)
+        if bottom < 0:
+            bottom = self.rowCount() - 1
+        bottom = min(bottom + (bottom - top) + 1, self.rowCount() - 1)
+        return range(top, bottom + 1)
+
+    @staticmethod
+    def measureColumnWidths(items, stats, sampleRows, font, revision, task=None):
+        """
+        Measures the column widths on a sample of the table, the sample rows and
+        the rows with the longest items in each column.  The column statistics
+        are rebuilt if they do not match the revision.  Returns the text widths
+        and the statistics.
+        """
+        if stats is None or stats.revision != revision or len(stats.stale) > 0:
+            stats = LTCColumnStatistics(items, revision, task)
+        metrics = QFontMetricsF(font)
+        cache = LTC_Table.textWidthCache.setdefault(font.key(), {})
+        cols = len(items[0]) if len(items) > 0 else 0
+        widths = []
+        for j in range(cols):
+            rows = set(sampleRows)
+            rows.update(stats.candidateRows(j))
+            width = 0
+            for i in rows:
+                if i < len(items):
+                    width = max(width, LTC_Table.textWidth(items[i][j], metrics, cache))
+            widths.append(width)
+        return widths, stats
+
+    def applyColumnWidths(self, widths):
+        """
+        Sets the column widths from measured text widths.
+        """
+        padding = self.cellPadding()
+        header = self.horizontalHeader()
+        for j in range(min(len(widths), self.columnCount())):
+            header.resizeSection(j, max(widths[j] + padding, header.sectionSizeHint(j)))
+
+    def fitColumnToText(self, col, text):
+        """
+        Widens the column if the text does not fit, used in auto-fit mode.
+        """
+        font = self.font()
+        cache = LTC_Table.textWidthCache.setdefault(font.key(), {})
+        width = self.textWidth(text, QFontMetricsF(font), cache) + self.cellPadding()
+        if width > self.columnWidth(col):
+            self.setColumnWidth(col, width)
+
+    def fitVisibleRowHeights(self):
+        """
+        Fits the heights of the rows in view only.
+        """
+        for i in self.visibleRows():
+            self.resizeRowToContents(i)
+
     def addToHistory(self):
         """
         Adds the curent table to the undo/redo history.  Removes stored tables
-        from the current table position to the end of the list.
+        from the current table position to the end of the list.  Inside a
+        transaction the entry is added when the transaction ends.
+        """
+        self.revision += 1
+        self.tableChanged.emit()
+        if self.transactionDepth > 0:
+            self.pendingEdits = True
+            return
+        self.storeHistory()
+        self.setFocus()
+
+    def storeHistory(self):
+        """
+        Appends the current table to the history.
         """
         currentTable = self.getTableContents()
 
@@ -122,14 +908,195 @@ class LTC_Table(QTableWidget):
                 self.tableHistory.pop(len(self.tableHistory) - 1)
 
         self.tableHistory.append(currentTable)
+        del self.spanHistory[len(self.tableHistory) - 1:]
+        self.spanHistory.append(self.spanIndex)
+        del self.styleHistory[len(self.tableHistory) - 1:]
+        self.styleHistory.append(self.cellStyles)
         self.historyPos = len(self.tableHistory) - 1
-        self.setFocus()
+        self.pendingCells = {}
 
-    def onCellChanged(self):
+    def setSpanIndex(self, spanIndex):
         """
-        if a cell is changed the new table is stored.
+        Sets the merged cells and mirrors them on the grid.
         """
-        self.addToHistory()
+        self.spanIndex = spanIndex
+        self.applySpans()
+
+    def applySpans(self):
+        """
+        Sets the grid spans from the span index.
+        """
+        self.clearSpans()
+        for row, col, rows, cols in self.spanIndex:
+            self.setSpan(row, col, rows, cols)
+
+    def setCellStyles(self, cellStyles):
+        """
+        Sets the cell styles and redraws the grid.
+        """
+        self.cellStyles = cellStyles
+        self.viewport().update()
+
+    def styleCells(self, setMask, clearMask=0):
+        """
+        Clears the bits of clearMask and sets the bits of setMask in the style
+        of the selected cells.
+        """
+        self.commitPendingEdits()
+        block = self.selectedBlock()
+        if block is None:
+            return
+        cellStyles = self.cellStyles.apply(*block, setMask, clearMask)
+        if cellStyles != self.cellStyles:
+            self.setCellStyles(cellStyles)
+            self.addToHistory()
+
+    def toggleCellStyle(self, flag):
+        """
+        Turns the flag off in the selected cells if they all have it, and on
+        otherwise.
+        """
+        block = self.selectedBlock()
+        if block is not None and self.cellStyles.allSet(*block, flag):
+            self.styleCells(0, flag)
+        else:
+            self.styleCells(flag)
+
+    def setCellAlignment(self, alignment):
+        """
+        Sets the alignment of the selected cells, '' for the column alignment.
+        """
+        number = LTCCellStyles.alignments.index(alignment)
+        self.styleCells(number << LTCCellStyles.alignShift, LTCCellStyles.alignMask)
+
+    def setCellColor(self, number):
+        """
+        Sets the color number of the selected cells, 0 for the text color.
+        """
+        self.styleCells(number << LTCCellStyles.colorShift, LTCCellStyles.colorMask)
+
+    def selectedBlock(self):
+        """
+        Returns the selected block as (row, column, rows, columns), or None.
+        """
+        rng = self.selectedCellRanges()
+        if len(rng) == 0:
+            return None
+        return rng[0][0], rng[1][0], rng[0][1] - rng[0][0] + 1, rng[1][1] - rng[1][0] + 1
+
+    def mergeCells(self):
+        """
+        Merges the selected cells into one cell.  The text of the covered
+        cells is kept, it comes back when the cells are unmerged.
+        """
+        self.commitPendingEdits()
+        block = self.selectedBlock()
+        if block is None:
+            return
+        spanIndex = self.spanIndex.merge(*block)
+        if spanIndex != self.spanIndex:
+            self.setSpanIndex(spanIndex)
+            self.setCurrentCell(block[0], block[1])
+            self.addToHistory()
+
+    def unmergeCells(self):
+        """
+        Splits the merged cells in the selection.
+        """
+        self.commitPendingEdits()
+        block = self.selectedBlock()
+        if block is None:
+            return
+        spanIndex = self.spanIndex.unmerge(*block)
+        if spanIndex != self.spanIndex:
+            self.setSpanIndex(spanIndex)
+            self.addToHistory()
+
+    def onCellChanged(self, row=-1, col=-1):
+        """
+        if a cell is changed the new table is stored.  The history entry is
+        added once the edits stop, see commitPendingEdits.
+        """
+        inSync = self.columnStats is not None and self.columnStats.revision == self.revision
+        self.revision += 1
+        if row >= 0 and col >= 0:
+            item = self.item(row, col)
+            text = '' if item is None else item.text()
+            self.journalOp(['cell', row, col, text])
+            self.pendingCells[(row, col)] = text
+            if inSync:
+                self.columnStats.cellChanged(row, col, text)
+                self.columnStats.revision = self.revision
+            if self.autoFit:
+                self.fitColumnToText(col, text)
+        self.pendingEdits = True
+        if self.transactionDepth == 0:
+            self.coalesce_timer.start()
+        self.tableChanged.emit()
+
+    def onCurrentCellChanged(self, row, col, previousRow, previousCol):
+        """
+        Moving to another cell other than with Enter ends an Enter run.
+        """
+        if not self.enterMoving and self.enterRun:
+            self.enterRun = False
+            if not self.coalesce_timer.isActive():
+                self.commitPendingEdits()
+
+    def coalesceTimeout(self):
+        """
+        Commits the pending edits once they stop.  Storing the history ends
+        cell editing, so while a cell editor is open the timer is restarted.
+        """
+        if self.state() == QAbstractItemView.EditingState:
+            self.coalesce_timer.start()
+        elif not self.enterRun:
+            self.commitPendingEdits()
+
+    def commitPendingEdits(self):
+        """
+        Adds the coalesced cell edits to the history as one entry.  Called
+        before any other change to the table and before the history is read.
+        """
+        self.coalesce_timer.stop()
+        if self.pendingEdits and self.transactionDepth == 0:
+            self.pendingEdits = False
+            self.storeHistory()
+
+    def beginTransaction(self):
+        """
+        Starts a group of edits that is undone as one entry.  Transactions can
+        be nested, the entry is added by the outermost endTransaction.
+        """
+        if self.transactionDepth == 0:
+            self.commitPendingEdits()
+        self.transactionDepth += 1
+
+    def endTransaction(self):
+        """
+        Ends a group of edits started with beginTransaction.
+        """
+        self.transactionDepth -= 1
+        if self.transactionDepth == 0 and self.pendingEdits:
+            self.pendingEdits = False
+            self.storeHistory()
+
+    def journalOp(self, op):
+        """
+        Records an edit operation in the crash recovery journal.
+        """
+        if self.journal is not None and self.journalSuspended == 0:
+            self.journal.record(op)
+
+    def compactJournal(self):
+        """
+        Replaces the journal with a snapshot of the current table.  The last
+        history entry is the current table, so nothing needs to be read from
+        the grid.
+        """
+        self.commitPendingEdits()
+        if self.journal is not None and self.journal.entries > 0:
+            self.journal.compact(self.tableHistory[self.historyPos])
 
     def selectedCellRanges(self):
         """
@@ -159,13 +1126,51 @@ class LTC_Table(QTableWidget):
 
     def resizeTable(self, r, c):
         """
-        Resizes the table to r rows and c columns.
+        Resizes the table to r rows and c columns.  When the table shrinks the
+        table before the shrink is kept, so if it is grown again before any
+        other edit the cells that were cut off come back.
         """
+        self.commitPendingEdits()
+        oldRows = self.rowCount()
+        oldCols = self.columnCount()
+        stash = None
+        if self.shrinkStash is not None and self.shrinkStash[0] == self.revision:
+            stash = self.shrinkStash[1]
+        elif r < oldRows or c < oldCols:
+            stash = self.tableHistory[self.historyPos]
+
         self.blockSignals(True)
         self.setColumnCount(c)
         self.setRowCount(r)
+        self.journalOp(['resize', r, c])
+        if stash is not None and (r > oldRows or c > oldCols):
+            self.restoreStashedCells(stash, oldRows, oldCols)
+        self.setSpanIndex(self.spanIndex.clip(r, c))
+        self.setCellStyles(self.cellStyles.clip(r, c))
         self.addToHistory()
         self.blockSignals(False)
+        self.shrinkStash = (self.revision, stash) if stash is not None else None
+
+    def restoreStashedCells(self, stash, oldRows, oldCols):
+        """
+        Puts back the cells of the stashed table that lie outside the old
+        oldRows by oldCols table and inside the current one.
+        """
+        rows = min(self.rowCount(), len(stash))
+        cols = min(self.columnCount(), len(stash[0]))
+
+        # The new columns of the old rows, then the new rows.
+        blocks = [(0, min(oldRows, rows), oldCols, cols), (oldRows, rows, 0, cols)]
+        for top, bottom, left, right in blocks:
+            if top >= bottom or left >= right:
+                continue
+            block = [stash[i][left:right] for i in range(top, bottom)]
+            for i in range(top, bottom):
+                for j in range(left, right):
+                    text = stash[i][j]
+                    if text != '':
+                        self.setItem(i, j, QTableWidgetItem(text))
+            self.journalOp(['paste', top, left, block])
 
     def closeEditing(self):
         """
@@ -216,7 +1221,11 @@ class LTC_Table(QTableWidget):
         Pastes the list of row lists to the table, expanding the table size if
         necessary.
         """
+        self.commitPendingEdits()
         self.blockSignals(True)
+        inSync = self.columnStats is not None and self.columnStats.revision == self.revision
+        oldRows = self.rowCount()
+        oldCols = self.columnCount()
         rows = len(items)
         cols = 0
         for i in range(rows):
@@ -242,7 +1251,12 @@ class LTC_Table(QTableWidget):
                 for j in range(startcol, cols + startcol):
                     self.setItem(i, j, QTableWidgetItem(items[i - startrow][j - startcol]))
 
+            self.journalOp(['paste', startrow, startcol, items])
+
         self.addToHistory()
+        if inSync and self.rowCount() == oldRows and self.columnCount() == oldCols and len(rng) > 0:
+            self.columnStats.blockChanged(startrow, startcol, items)
+            self.columnStats.revision = self.revision
         self.blockSignals(False)
 
     def getUpperLeftSelectedCell(self):
@@ -269,48 +1283,68 @@ class LTC_Table(QTableWidget):
         """
         Adds a row above the selected cells.
         """
+        self.commitPendingEdits()
         start = self.getUpperLeftSelectedCell()
         if len(start) > 0:
             self.insertRow(start[0])
+            self.journalOp(['insertRow', start[0]])
+            self.setSpanIndex(self.spanIndex.insertRows(start[0], 1))
+            self.setCellStyles(self.cellStyles.insertRows(start[0], 1))
         self.addToHistory()
 
     def addRowBelow(self):
         """
         Adds a row below the selected cells.
         """
+        self.commitPendingEdits()
         start = self.getLowerRightSelectedCell()
         if len(start) > 0:
             self.insertRow(start[0] + 1)
+            self.journalOp(['insertRow', start[0] + 1])
+            self.setSpanIndex(self.spanIndex.insertRows(start[0] + 1, 1))
+            self.setCellStyles(self.cellStyles.insertRows(start[0] + 1, 1))
         self.addToHistory()
 
     def addColumnBefore(self):
         """
         Adds a column before the selected cells.
         """
+        self.commitPendingEdits()
         start = self.getUpperLeftSelectedCell()
         if len(start) > 0:
             self.insertColumn(start[1])
+            self.journalOp(['insertColumn', start[1]])
+            self.setSpanIndex(self.spanIndex.insertColumns(start[1], 1))
+            self.setCellStyles(self.cellStyles.insertColumns(start[1], 1))
         self.addToHistory()
 
     def addColumnAfter(self):
         """
         Adds a column after the selected cells.
         """
+        self.commitPendingEdits()
         start = self.getLowerRightSelectedCell()
         if len(start) > 0:
             self.insertColumn(start[1] + 1)
+            self.journalOp(['insertColumn', start[1] + 1])
+            self.setSpanIndex(self.spanIndex.insertColumns(start[1] + 1, 1))
+            self.setCellStyles(self.cellStyles.insertColumns(start[1] + 1, 1))
         self.addToHistory()
 
     def deleteRows(self):
         """
         Deletes the selected rows.
         """
+        self.commitPendingEdits()
         rng = self.selectedCellRanges()
         if len(rng) > 0:
             start = rng[0][0]
             end = rng[0][1]
             for i in range(end - start + 1):
                 self.removeRow(start)
+            self.journalOp(['removeRows', start, end - start + 1])
+            self.setSpanIndex(self.spanIndex.removeRows(start, end - start + 1))
+            self.setCellStyles(self.cellStyles.removeRows(start, end - start + 1))
         if self.rowCount() == 0:
             self.insertRow(0)
         self.addToHistory()
@@ -319,12 +1353,16 @@ class LTC_Table(QTableWidget):
         """
         Deletes the selected columns.
         """
+        self.commitPendingEdits()
         rng = self.selectedCellRanges()
         if len(rng) > 0:
             start = rng[1][0]
             end = rng[1][1]
             for i in range(end - start + 1):
                 self.removeColumn(start)
+            self.journalOp(['removeColumns', start, end - start + 1])
+            self.setSpanIndex(self.spanIndex.removeColumns(start, end - start + 1))
+            self.setCellStyles(self.cellStyles.removeColumns(start, end - start + 1))
         if self.columnCount() == 0:
             self.insertColumn(0)
         self.addToHistory()
@@ -333,6 +1371,7 @@ class LTC_Table(QTableWidget):
         """
         Deletes the selected rows and columns.
         """
+        self.commitPendingEdits()
         rng = self.selectedCellRanges()
         if len(rng) > 0:
             startr = rng[0][0]
@@ -341,103 +1380,173 @@ class LTC_Table(QTableWidget):
             endc = rng[1][1]
             for i in range(endr - startr + 1):
                 self.removeRow(startr)
+            self.journalOp(['removeRows', startr, endr - startr + 1])
+            spanIndex = self.spanIndex.removeRows(startr, endr - startr + 1)
+            cellStyles = self.cellStyles.removeRows(startr, endr - startr + 1)
 
             if self.rowCount() == 0:
                 self.insertRow(0)
 
             for i in range(endc - startc + 1):
                 self.removeColumn(startc)
+            self.journalOp(['removeColumns', startc, endc - startc + 1])
+            self.setSpanIndex(spanIndex.removeColumns(startc, endc - startc + 1))
+            self.setCellStyles(cellStyles.removeColumns(startc, endc - startc + 1))
 
             if self.columnCount() == 0:
                 self.insertColumn(0)
 
         self.addToHistory()
 
-    def transpose(self):
+    def clearTable(self):
         """
-        Transposes the grid.
+        Clears the table contents.
         """
-        self.blockSignals(True)
-
-        items = self.getTableContents()
-        rows = self.rowCount()
-        cols = self.columnCount()
+        self.commitPendingEdits()
+        self.clear()
+        self.journalOp(['clear'])
+        self.applySpans()
+        self.addToHistory()
 
-        tablelist = []
-        for j in range(cols):
-            collist = []
-            for i in range(rows):
-                item = items[i][j]
-                if item == None:
-                    collist.append('')
-                else:
-                    collist.append(item)
-            tablelist.append(collist)
+    def newtable(self):
+        """
+        Clears the table contents and resets the size to 3 X 3.
+        """
+        self.commitPendingEdits()
+        self.setRowCount(3)
+        self.setColumnCount(3)
+        self.clear()
+        self.setSpanIndex(LTCSpanIndex())
+        self.setCellStyles(LTCCellStyles())
+        self.setCurrentCell(0, 0)
+        self.journalOp(['resize', 3, 3])
+        self.journalOp(['clear'])
+        self.addToHistory()
 
+    def replaceTable(self, items):
+        """
+        Replaces the table with the list of row lists of items.
+        """
+        self.commitPendingEdits()
         self.setRowCount(1)
         self.setColumnCount(1)
+        self.setSpanIndex(LTCSpanIndex())
+        self.setCellStyles(LTCCellStyles())
         self.setCurrentCell(0, 0)
-        self.paste(tablelist)
-
-        self.setCurrentCell(0, 0)
+        self.journalOp(['resize', 1, 1])
+        self.paste(items)
+
+    def setTableItems(self, items, op, spanIndex=None, cellStyles=None):
+        """
+        Replaces the table with the list of row lists of items, the result of a
+        background task, as a single undoable edit.  The op is the journal entry
+        that reproduces the edit.  The merged cells and cell styles are kept
+        unless new ones are given.
+        """
+        self.commitPendingEdits()
+        if spanIndex is None:
+            spanIndex = self.spanIndex
+        if cellStyles is None:
+            cellStyles = self.cellStyles
+        self.loadItems(items)
+        self.setSpanIndex(spanIndex.clip(self.rowCount(), self.columnCount()))
+        self.setCellStyles(cellStyles.clip(self.rowCount(), self.columnCount()))
+        self.journalOp(op)
         self.addToHistory()
-        self.blockSignals(False)
 
-    def trimcells(self):
+    def getColumnStatistics(self):
         """
-        Trims the entries in each cell.
+        Returns the column statistics, rebuilt from the current history entry
+        if a structural change made them out of date.
         """
-        self.blockSignals(True)
-        for i in range(self.rowCount()):
-            for j in range(self.columnCount()):
-                item = self.item(i, j)
-
-                if item == None:
-                    item = ''
-                else:
-                    item = item.text()
-
-                item = item.lstrip()
-                item = item.rstrip()
-                self.setItem(i, j, QTableWidgetItem(item))
-
-        self.addToHistory()
-        self.blockSignals(False)
+        items = self.getSnapshot()
+        if self.columnStats is None or self.columnStats.revision != self.revision:
+            self.columnStats = LTCColumnStatistics(items, self.revision)
+        self.columnStats.refreshStale()
+        return self.columnStats
 
-    def fillcells(self, fill_text):
+    def columnRevisions(self):
         """
-        Fills the cells with the given text.
+        Returns the revision of each column, for caching results computed from
+        the columns.  Pending cell edits are counted without committing them.
         """
-        self.blockSignals(True)
-        for i in range(self.rowCount()):
-            for j in range(self.columnCount()):
-                self.setItem(i, j, QTableWidgetItem(fill_text))
+        if self.columnStats is None or self.columnStats.revision != self.revision:
+            self.columnStats = LTCColumnStatistics(self.currentItems(), self.revision)
+        return list(self.columnStats.columnRevision)
 
-        self.addToHistory()
-        self.blockSignals(False)
+    def getSnapshot(self):
+        """
+        Returns the current table for a background task.  The current history
+        entry is used, it is never modified so no copy is needed.
+        """
+        self.closeEditing()
+        self.commitPendingEdits()
+        return self.tableHistory[self.historyPos]
+
+    def currentItems(self):
+        """
+        Returns the current table without ending an edit in progress or the
+        pending cell edits, for the preview.  Only the rows with pending edits
+        are copied.
+        """
+        if self.transactionDepth > 0:
+            return self.getTableContents()
+        items = self.tableHistory[self.historyPos]
+        if len(self.pendingCells) == 0:
+            return items
+        items = list(items)
+        copied = set()
+        for (row, col), text in self.pendingCells.items():
+            if row < len(items) and col < len(items[row]):
+                if row not in copied:
+                    items[row] = list(items[row])
+                    copied.add(row)
+                items[row][col] = text
+        return items
+
+    @staticmethod
+    def transposeItems(items, task=None):
+        """
+        Returns the transpose of the list of row lists.
+        """
+        cols = len(items[0]) if len(items) > 0 else 0
+        tablelist = []
+        for j in range(cols):
+            if task is not None and j % 64 == 0:
+                task.setProgress(j, cols)
+            tablelist.append([row[j] for row in items])
+        return tablelist
 
-    def clearTable(self):
+    @staticmethod
+    def trimItems(items, task=None):
         """
-        Clears the table contents.
+        Returns the list of row lists with the whitespace trimmed from each item.
         """
-        self.clear()
-        self.addToHistory()
+        tablelist = []
+        for i, row in enumerate(items):
+            if task is not None and i % 256 == 0:
+                task.setProgress(i, len(items))
+            tablelist.append([item.strip() for item in row])
+        return tablelist
 
-    def newtable(self):
+    @staticmethod
+    def fillItems(rows, cols, fill_text, task=None):
         """
-        Clears the table contents and resets the size to 3 X 3.
+        Returns a rows by cols list of row lists of the fill text.
         """
-        self.setRowCount(3)
-        self.setColumnCount(3)
-        self.clear()
-        self.setCurrentCell(0, 0)
-        self.addToHistory()
+        tablelist = []
+        for i in range(rows):
+            if task is not None and i % 256 == 0:
+                task.setProgress(i, rows)
+            tablelist.append([fill_text] * cols)
+        return tablelist
 
     def loadItems(self, currentTable):
         """
         Loads the items (list of row lists) into the table.
         """
         self.blockSignals(True)
+        self.revision += 1
         rows = len(currentTable)
         cols = len(currentTable[0])
         self.setRowCount(rows)
@@ -447,33 +1556,716 @@ class LTC_Table(QTableWidget):
             for j in range(self.columnCount()):
                 self.setItem(i, j, QTableWidgetItem(currentTable[i][j]))
         self.blockSignals(False)
+        self.tableChanged.emit()
 
     def undo(self):
         """
         Processes an undo.
         """
+        self.commitPendingEdits()
         self.historyPos = self.historyPos - 1
         if self.historyPos < 0:
             self.historyPos = 0
 
         currentTable = self.tableHistory[self.historyPos]
         self.loadItems(currentTable)
+        self.setSpanIndex(self.spanHistory[self.historyPos])
+        self.setCellStyles(self.styleHistory[self.historyPos])
+        self.journalOp(['table', currentTable])
 
     def redo(self):
         """
         Processes a redo.
         """
+        self.commitPendingEdits()
         self.historyPos = self.historyPos + 1
         if self.historyPos >= len(self.tableHistory):
             self.historyPos = len(self.tableHistory) - 1
 
         currentTable = self.tableHistory[self.historyPos]
         self.loadItems(currentTable)
+        self.setSpanIndex(self.spanHistory[self.historyPos])
+        self.setCellStyles(self.styleHistory[self.historyPos])
+        self.journalOp(['table', currentTable])
+
+    def getSessionState(self):
+        """
+        Returns the undo history, merged cells, cell styles, font size and
+        column widths as a dictionary that can be stored as JSON.  History
+        entries share most of their rows, so each distinct row is stored once
+        and the entries list row numbers.
+        """
+        self.commitPendingEdits()
+        rows = []
+        rowIds = {}
+        history = []
+        for table in self.tableHistory:
+            entry = []
+            for row in table:
+                key = tuple(row)
+                rowId = rowIds.get(key)
+                if rowId is None:
+                    rowId = len(rows)
+                    rowIds[key] = rowId
+                    rows.append(row)
+                entry.append(rowId)
+            history.append(entry)
+
+        # Most history entries have the same styles, each distinct set is stored once.
+        styles = []
+        styleIds = {}
+        styleHistory = []
+        for cellStyles in self.styleHistory:
+            key = cellStyles.key()
+            styleId = styleIds.get(key)
+            if styleId is None:
+                styleId = len(styles)
+                styleIds[key] = styleId
+                styles.append(cellStyles.toList())
+            styleHistory.append(styleId)
+
+        header = self.horizontalHeader()
+        return {'Rows': rows, 'History': history, 'History Position': self.historyPos,
+                'Spans': [spanIndex.toList() for spanIndex in self.spanHistory], 'Styles': styles,
+                'Style History': styleHistory, 'Font Size': self.fontPointSize,
+                'Column Widths': [header.sectionSize(j) for j in range(self.columnCount())]}
+
+    def setSessionState(self, state):
+        """
+        Restores the state saved by getSessionState.  Signals are blocked and
+        the column widths are set from the saved values rather than measured.
+        """
+        rows = state['Rows']
+        history = [[list(rows[rowId]) for rowId in entry] for entry in state['History']]
+        pos = min(max(state['History Position'], 0), len(history) - 1)
+        spanHistory = [LTCSpanIndex(spans) for spans in state.get('Spans', [])][:len(history)]
+        spanHistory += [LTCSpanIndex()] * (len(history) - len(spanHistory))
+        styles = [LTCCellStyles.fromList(entries) for entries in state.get('Styles', [])]
+        styleHistory = [styles[styleId] for styleId in state.get('Style History', [])][:len(history)]
+        styleHistory += [LTCCellStyles()] * (len(history) - len(styleHistory))
+
+        self.coalesce_timer.stop()
+        self.pendingEdits = False
+        self.pendingCells = {}
+        self.setUpdatesEnabled(False)
+        self.adjustFontSize(state['Font Size'])
+        self.tableHistory = history
+        self.spanHistory = spanHistory
+        self.styleHistory = styleHistory
+        self.historyPos = pos
+        self.loadItems(history[pos])
+        self.setSpanIndex(spanHistory[pos])
+        self.setCellStyles(styleHistory[pos])
+
+        header = self.horizontalHeader()
+        header.blockSignals(True)
+        for j, width in enumerate(state['Column Widths'][:self.columnCount()]):
+            header.resizeSection(j, width)
+        header.blockSignals(False)
+        self.setUpdatesEnabled(True)
+        self.journalOp(['table', history[pos]])
+
+
+class LTCEditJournal:
+    """
+    Append-only journal of the edits made to one table, used to recover the
+    table after a crash.  Each edit is written as one short JSON line and
+    flushed, so a single cell edit costs one small sequential write.  The
+    journal is periodically compacted into a full snapshot.  Each snapshot has
+    a generation number that is also written at the top of the journal, so
+    a journal that was already folded into the snapshot is never replayed
+    twice.
+
+    The files live in the Recovery folder of the per-user application data
+    directory and are removed when the table is closed normally.  A QLockFile
+    marks the files as in use, so a running program's files are never offered
+    for recovery.
+    """
+
+    sessionCounter = 0
+
+    # The argument types of each operation, see apply.
+    opArguments = {'cell': (int, int, str), 'paste': (int, int, list), 'resize': (int, int),
+                   'insertRow': (int,), 'insertColumn': (int,), 'removeRows': (int, int),
+                   'removeColumns': (int, int), 'transpose': (), 'trim': (), 'unicode': (bool,),
+                   'fill': (str,), 'clear': (), 'table': (list,)}
+
+    def __init__(self, name=None):
+        if name is None:
+            LTCEditJournal.sessionCounter += 1
+            name = str(os.getpid()) + '-' + str(LTCEditJournal.sessionCounter)
+        self.name = name
+        self.lock = None
+        self.locked = False
+        self.file = None
+        self.generation = 0
+        self.entries = 0
+
+    def acquire(self):
+        """
+        Locks the journal files.  Done on the first edit rather than when the
+        table is created, so an unused table costs no file system access.
+        """
+        if self.lock is None:
+            try:
+                self.directory = LTCEditJournal.recoveryDirectory()
+            except OSError:
+                return False
+            self.snapshot_name = os.path.join(self.directory, self.name + '.snapshot')
+            self.journal_name = os.path.join(self.directory, self.name + '.journal')
+            self.lock = QLockFile(os.path.join(self.directory, self.name + '.lock'))
+            self.lock.setStaleLockTime(0)
+            self.locked = self.lock.tryLock(0)
+        return self.locked
+
+    @staticmethod
+    def recoveryDirectory():
+        directory = os.path.join(QStandardPaths.writableLocation(QStandardPaths.AppLocalDataLocation), 'Recovery')
+        os.makedirs(directory, exist_ok=True)
+        return directory
+
+    @classmethod
+    def recoverableSessions(cls):
+        """
+        Returns journals left behind by programs that did not exit normally.
+        The returned journals hold the lock on their files.
+        """
+        sessions = []
+        try:
+            directory = cls.recoveryDirectory()
+            names = set()
+            for file_name in os.listdir(directory):
+                base, ext = os.path.splitext(file_name)
+                if ext in ('.snapshot', '.journal'):
+                    names.add(base)
+        except OSError:
+            return sessions
+
+        for name in sorted(names):
+            journal = cls(name)
+            if journal.acquire():
+                sessions.append(journal)
+        return sessions
+
+    def record(self, op):
+        """
+        Appends one operation to the journal.
+        """
+        if not self.locked and (self.lock is not None or not self.acquire()):
+            return
+        try:
+            if self.file is None:
+                self.file = open(self.journal_name, 'a', encoding='utf-8')
+                self.file.write(json.dumps(['journal', self.generation]) + '\n')
+            self.file.write(json.dumps(op, ensure_ascii=False, separators=(',', ':')) + '\n')
+            self.file.flush()
+            self.entries += 1
+        except (OSError, TypeError, ValueError):
+            pass
+
+    def compact(self, table):
+        """
+        Writes a snapshot of the table and starts a new, empty journal.  The
+        snapshot is written to a temporary file and renamed into place, so a
+        crash during compaction leaves the old snapshot and journal intact.
+        """
+        if not self.locked:
+            return
+        try:
+            temp_name = self.snapshot_name + '.tmp'
+            with open(temp_name, 'w', encoding='utf-8') as f:
+                json.dump({'generation': self.generation + 1, 'table': table}, f,
+                          ensure_ascii=False, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_name, self.snapshot_name)
+            self.generation += 1
+
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+            if os.path.exists(self.journal_name):
+                os.remove(self.journal_name)
+            self.entries = 0
+        except OSError:
+            pass
+
+    def discard(self):
+        """
+        Removes the journal files, called when the table is closed normally.
+        """
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        if self.locked:
+            for file_name in (self.snapshot_name, self.journal_name):
+                try:
+                    os.remove(file_name)
+                except OSError:
+                    pass
+            self.lock.unlock()
+            self.locked = False
+
+    def recover(self):
+        """
+        Returns the table rebuilt from the snapshot and the journal.  Raises
+        ValueError if the snapshot is damaged or an operation cannot be
+        replayed.
+        """
+        table = [[''] * 3 for i in range(3)]
+        generation = 0
+        try:
+            with open(self.snapshot_name, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except OSError:
+            snapshot = None
+        if snapshot is not None:
+            if not isinstance(snapshot, dict) or not isinstance(snapshot.get('generation'), int):
+                raise ValueError('The snapshot ' + self.snapshot_name + ' is damaged.')
+            table = self.apply(table, ['table', snapshot.get('table')])
+            generation = snapshot['generation']
+
+        try:
+            with open(self.journal_name, 'r', encoding='utf-8') as f:
+                try:
+                    header = json.loads(f.readline())
+                except ValueError:
+                    # A partly written header, the journal has no edits.
+                    header = None
+                if header == ['journal', generation]:
+                    for line in f:
+                        try:
+                            op = json.loads(line)
+                        except ValueError:
+                            # A partly written last line.
+                            break
+                        table = self.apply(table, op)
+        except OSError:
+            pass
+
+        return table
+
+    @classmethod
+    def checkOp(cls, table, op):
+        """
+        Raises ValueError if the operation does not have the shape of a
+        recorded edit or does not fit the table.
+        """
+        if not isinstance(op, list) or len(op) == 0 or op[0] not in cls.opArguments:
+            raise ValueError('Unknown journal operation.')
+        types = cls.opArguments[op[0]]
+        if len(op) != len(types) + 1 or not all(isinstance(arg, t) for arg, t in zip(op[1:], types)):
+            raise ValueError('Bad arguments for the journal operation ' + op[0] + '.')
+
+        def isItems(items):
+            return (len(items) > 0 and all(isinstance(row, list) and len(row) == len(items[0]) for row in items)
+                    and all(isinstance(item, str) for row in items for item in row))
+
+        rows = len(table)
+        cols = len(table[0]) if rows > 0 else 0
+        kind = op[0]
+        if kind == 'cell':
+            valid = 0 <= op[1] < rows and 0 <= op[2] < cols
+        elif kind == 'paste':
+            valid = 0 <= op[1] < 10000 and 0 <= op[2] < 1000 and isItems(op[3])
+        elif kind == 'resize':
+            valid = 1 <= op[1] <= 10000 and 1 <= op[2] <= 1000
+        elif kind == 'insertRow':
+            valid = 0 <= op[1] <= rows
+        elif kind == 'insertColumn':
+            valid = 0 <= op[1] <= cols
+        elif kind == 'removeRows':
+            valid = 0 <= op[1] < rows and op[2] > 0
+        elif kind == 'removeColumns':
+            valid = 0 <= op[1] < cols and op[2] > 0
+        elif kind == 'table':
+            valid = isItems(op[1])
+        else:
+            valid = True
+        if not valid:
+            raise ValueError('The journal operation ' + op[0] + ' does not fit the table.')
+
+    @staticmethod
+    def apply(table, op):
+        """
+        Applies one journal operation to a list of row lists, mirroring what
+        the LTC_Table method that recorded it does to the grid.  Raises
+        ValueError for an operation that could not have been recorded.
+        """
+        LTCEditJournal.checkOp(table, op)
+        kind = op[0]
+        cols = len(table[0]) if len(table) > 0 else 0
+
+        if kind == 'cell':
+            table[op[1]][op[2]] = op[3]
+        elif kind == 'paste':
+            startrow, startcol, items = op[1], op[2], op[3]
+            rows = len(items)
+            pastecols = max((len(row) for row in items), default=0)
+            if rows + startrow > len(table):
+                if rows + startrow > 10000:
+                    rows = 10000 - startrow
+                table = LTCEditJournal.apply(table, ['resize', rows + startrow, cols])
+            if pastecols + startcol > cols:
+                if pastecols + startcol > 1000:
+                    pastecols = 1000 - startcol
+                table = LTCEditJournal.apply(table, ['resize', len(table), pastecols + startcol])
+            for i in range(rows):
+                for j in range(pastecols):
+                    table[startrow + i][startcol + j] = items[i][j]
+        elif kind == 'resize':
+            rows, cols = op[1], op[2]
+            table = [(row + [''] * (cols - len(row)))[:cols] for row in table[:rows]]
+            table.extend([[''] * cols for i in range(rows - len(table))])
+        elif kind == 'insertRow':
+            table.insert(op[1], [''] * cols)
+        elif kind == 'insertColumn':
+            for row in table:
+                row.insert(op[1], '')
+        elif kind == 'removeRows':
+            del table[op[1]:op[1] + op[2]]
+            if len(table) == 0:
+                table = [[''] * cols]
+        elif kind == 'removeColumns':
+            for row in table:
+                del row[op[1]:op[1] + op[2]]
+            if len(table[0]) == 0:
+                table = [[''] for row in table]
+        elif kind == 'transpose':
+            # The grid pastes the transpose, which limits its size.
+            table = [list(col[:1000]) for col in zip(*table)][:10000]
+        elif kind == 'trim':
+            table = [[item.strip() for item in row] for row in table]
+        elif kind == 'unicode':
+            table = LTCUnicodeConverter.convertItems(table, op[1])
+        elif kind == 'fill':
+            table = [[op[1]] * cols for row in table]
+        elif kind == 'clear':
+            table = [[''] * cols for row in table]
+        elif kind == 'table':
+            table = [list(row) for row in op[1]]
+        return table
+
+
+class LTCOptions(Mapping):
+    """
+    Immutable snapshot of the export options, read like the options
+    dictionary.  Snapshots are hashable, so exports and caches can key on
+    them, and carry the version of the model they were taken from.  The
+    values are held in a read-only mapping so the cached hash stays valid.
+    """
+
+    def __init__(self, values, version=0):
+        self.values = MappingProxyType(dict(values))
+        self.version = version
+        self.hashValue = None
+
+    def __getitem__(self, key):
+        return self.values[key]
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __hash__(self):
+        if self.hashValue is None:
+            self.hashValue = hash(frozenset(self.values.items()))
+        return self.hashValue
+
+    def __repr__(self):
+        return 'LTCOptions(' + repr(dict(self.values)) + ', ' + str(self.version) + ')'
+
+    def toJSON(self):
+        return json.dumps(dict(self.values), sort_keys=True, separators=(',', ':'))
+
+
+class LTCOptionsModel(QObject):
+    """
+    The export options of an editor window.  The options panel updates the
+    model from its widget signals and the model emits optionsChanged once for
+    each change.  The version is increased on every change and snapshot
+    returns the same LTCOptions object until the next change.
+    """
+
+    optionsChanged = Signal()
+    defaultOptions = {'Grid Type': 'longtable', 'Table Column Align': 'Left', 'Table Border': False,
+                      'Table Division First Row': False, 'Table Division All Rows': False,
+                      'Table Division First Column': False, 'Table Division All Columns': False,
+                      'Table Column Header': False, 'Table Column Header Align': 'Left',
+                      'Table Column Header Bold': False, 'Table Column Header Italic': False,
+                      'Table Column Header Underline': False, 'Table Column Header Rows': 1,
+                      'Table Row Header': False, 'Table Row Header Align': 'Left',
+                      'Table Row Header Bold': False, 'Table Row Header Italic': False,
+                      'Table Row Header Underline': False, 'Table Row Header Columns': 1,
+                      'Tabbing Column Width': 20, 'Tabbing Auto Width': False,
+                      'Array Column Align': 'Left', 'Array Border': False,
+                      'Array Division First Row': False, 'Array Division All Rows': False,
+                      'Array Division First Column': False, 'Array Division All Columns': False,
+                      'Array Decoration': 'None', 'Matrix Decoration': 'None',
+                      'Special Matrix Decoration': 'pmatrix', 'Math Mode': False, 'Array Stretch': False,
+                      'Escape Special Characters': False, 'Escape Columns': '', 'Convert Unicode': False,
+                      'Conditional Formats': '', 'Number Formats': ''}
+
+    alignChoices = ('Left', 'Center', 'Right')
+    decorationChoices = ('None', '()', '[]', '||')
+    optionChoices = {'Grid Type': ('longtable', 'tabular', 'tabbing', 'array', 'matrix', 'Special Matrix'),
+                     'Table Column Align': alignChoices, 'Table Column Header Align': alignChoices,
+                     'Table Row Header Align': alignChoices, 'Array Column Align': alignChoices,
+                     'Array Decoration': decorationChoices, 'Matrix Decoration': decorationChoices,
+                     'Special Matrix Decoration': ('pmatrix', 'bmatrix', 'vmatrix', 'Vmatrix')}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.values = dict(self.defaultOptions)
+        self.version = 0
+        self.current = None
+
+    def snapshot(self):
+        if self.current is None:
+            self.current = LTCOptions(self.values, self.version)
+        return self.current
+
+    def update(self, values):
+        """
+        Sets the options in the dictionary, the others are unchanged.  Unknown
+        keys and invalid choices are ignored and values are converted to the
+        type of the default.  Returns True if any option changed.
+        """
+        changed = False
+        for key, value in values.items():
+            if key not in self.defaultOptions:
+                continue
+            try:
+                value = type(self.defaultOptions[key])(value)
+            except (TypeError, ValueError):
+                continue
+            if key in self.optionChoices and value not in self.optionChoices[key]:
+                continue
+            if self.values[key] != value:
+                self.values[key] = value
+                changed = True
+
+        if changed:
+            self.version += 1
+            self.current = None
+            self.optionsChanged.emit()
+        return changed
+
+    def toJSON(self):
+        return self.snapshot().toJSON()
+
+    def loadJSON(self, text):
+        """
+        Sets the options from JSON made by toJSON, returns True if any changed.
+        """
+        values = json.loads(text)
+        if not isinstance(values, dict):
+            raise ValueError('The options must be a JSON object.')
+        return self.update(values)
+
+
+class LTCSettings:
+    """
+    Per-user settings, a versioned JSON file in the application configuration
+    directory.  The file is read when a setting is first used.  Changes are
+    made under a QLockFile: the file is read again, only the changed settings
+    are replaced and the result is written to a temporary file that is
+    renamed into place.  So windows and programs that save at the same time
+    do not undo each other's changes, and settings of a newer version of the
+    program are kept.
+    """
+
+    version = 1
+    fileName = 'settings.json'
+    maxRecentFiles = 10
+    schema = {'Theme': '', 'Font Size': 12, 'Presets': {}, 'Recent Files': [],
+              'Performance': {'Sync Cell Limit': 20000, 'Idle Release Seconds': 300, 'Preview Delay': 300,
+                              'Resize Delay': 300, 'Undo Coalesce Window': 1500, 'Text Width Cache Limit': 100000}}
+    settings = None
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self.values = None
+
+    @classmethod
+    def instance(cls):
+        """
+        The settings of this program, created when first used.
+        """
+        if cls.settings is None:
+            cls.settings = cls()
+        return cls.settings
+
+    def path(self):
+        if self.directory is None:
+            self.directory = QStandardPaths.writableLocation(QStandardPaths.AppConfigLocation)
+        return os.path.join(self.directory, self.fileName)
+
+    @classmethod
+    def validValue(cls, default, value):
+        """
+        Returns the value if it has the type of the default, otherwise the
+        default.  The performance settings are checked one by one.
+        """
+        if type(value) is not type(default):
+            return json.loads(json.dumps(default))
+        if isinstance(value, list):
+            return [item for item in value if isinstance(item, str)]
+        if isinstance(value, dict):
+            if len(default) == 0:
+                return {name: item for name, item in value.items() if isinstance(item, dict)}
+            return {key: cls.validValue(default[key], value.get(key)) for key in default}
+        return value
+
+    def readFile(self):
+        """
+        Returns the contents of the settings file, empty if there is none.
+        """
+        try:
+            with open(self.path(), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                return data
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def load(self):
+        if self.values is None:
+            data = self.readFile()
+            self.values = {key: self.validValue(default, data.get(key)) for key, default in self.schema.items()}
+
+    def get(self, key):
+        """
+        Returns a setting, the value must not be changed by the caller.
+        """
+        self.load()
+        return self.values[key]
+
+    def modify(self, function):
+        """
+        Calls function with the current settings dictionary, which it changes,
+        and saves the settings.  Returns True if they were saved.
+        """
+        file_name = self.path()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+        except OSError:
+            return False
+        lock = QLockFile(file_name + '.lock')
+        lock.setStaleLockTime(10000)
+        if not lock.tryLock(2000):
+            return False
+
+        try:
+            data = self.readFile()
+            values = {key: self.validValue(default, data.get(key)) for key, default in self.schema.items()}
+            function(values)
+            data.update(values)
+            if not isinstance(data.get('Version'), int) or data['Version'] < self.version:
+                data['Version'] = self.version
+
+            temp_name = file_name + '.' + str(os.getpid()) + '.tmp'
+            with open(temp_name, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=1, sort_keys=True)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_name, file_name)
+            self.values = values
+        except (OSError, TypeError, ValueError):
+            return False
+        finally:
+            lock.unlock()
+        return True
+
+    def update(self, changes):
+        """
+        Sets the settings in the dictionary and saves them.
+        """
+        return self.modify(lambda values: values.update(changes))
+
+    def addRecentFile(self, file_name):
+        """
+        Moves the file to the top of the recent files list.
+        """
+        file_name = os.path.abspath(file_name)
+
+        def add(values):
+            files = [name for name in values['Recent Files'] if name != file_name]
+            values['Recent Files'] = ([file_name] + files)[:self.maxRecentFiles]
+
+        return self.modify(add)
+
+    def applyPerformance(self):
+        """
+        Sets the delays and limits of the program from the performance settings.
+        """
+        knobs = self.get('Performance')
+        LTCTaskRunner.syncCellLimit = knobs['Sync Cell Limit']
+        LaTeXTableEditor.idleReleaseSeconds = knobs['Idle Release Seconds']
+        LTCPreviewPane.refreshDelay = knobs['Preview Delay']
+        LTCDocument.resizeDelay = knobs['Resize Delay']
+        LTC_Table.coalesceWindow = knobs['Undo Coalesce Window']
+        LTC_Table.textWidthCacheLimit = knobs['Text Width Cache Limit']
+
+
+class LTCUnknownPreset(Exception):
+    """
+    Raised when the options of a preset that is not saved are asked for.
+    """
+    pass
+
+
+class LTCPresets:
+    """
+    Named option presets, kept in the settings.  Each preset holds a full set
+    of options, so applying it gives the same output in the editor and from
+    the command line.
+    """
+
+    def __init__(self, settings=None):
+        self.settings = settings if settings is not None else LTCSettings.instance()
+
+    def names(self):
+        return sorted(self.settings.get('Presets'), key=str.lower)
+
+    def get(self, name):
+        return self.settings.get('Presets').get(name)
+
+    def set(self, name, options):
+        def store(values):
+            values['Presets'][name] = dict(options)
+
+        return self.settings.modify(store)
+
+    def remove(self, name):
+        def remove(values):
+            values['Presets'].pop(name, None)
+
+        return self.settings.modify(remove)
+
+    def options(self, name, base=None):
+        """
+        Returns an options snapshot of the preset, set over the base options
+        or the defaults.  Raises LTCUnknownPreset if there is no such preset.
+        """
+        preset = self.get(name)
+        if preset is None:
+            raise LTCUnknownPreset(name)
+        model = LTCOptionsModel()
+        if base is not None:
+            model.update(base)
+        model.update(preset)
+        return model.snapshot()
+
 
 class LTCOptionsEditorPane(QWidget):
 
-    def __init__(self):
+    def __init__(self, model=None):
         super().__init__()
+        self.model = model if model is not None else LTCOptionsModel(self)
         self.initializeUI()
 
     def initializeUI(self):
@@ -488,24 +2280,64 @@ class LTCOptionsEditorPane(QWidget):
         self.types_selector.addItems(types)
         self.types_selector.currentIndexChanged.connect(self.typeChanged)
 
-        # Create the separate option panels for each type.
-        self.createTableOptions()
-        self.createTabbingOptions()
-        self.createArrayOptions()
-        self.createMatrixOptions()
-        self.createSpecialMatrixOptions()
+        # The option panels for each type are created when first shown, the
+        # longtable/tabular panel is shown at startup.
+        self.panelBuilders = [self.createTableOptions, self.createTabbingOptions, self.createArrayOptions,
+                              self.createMatrixOptions, self.createSpecialMatrixOptions]
+        self.panelsBuilt = [False] * len(self.panelBuilders)
 
         # Make the Includes selections
         self.include_math_mode = QCheckBox("Math Mode")
         self.include_array_stretch = QCheckBox("Array Stretch")
+        self.escape_special = QCheckBox("Escape Special Characters")
+        self.escape_special.setToolTip("Escape & % $ # _ { } ~ ^ and \\ in text mode cells, math cells are "
+                                       "left unchanged.")
+        self.escape_columns = QLineEdit()
+        self.escape_columns.setPlaceholderText("All columns")
+        self.escape_columns.setToolTip("Columns to escape, for example 1, 3-5.")
+        self.escape_columns.setEnabled(False)
+        self.escape_special.toggled.connect(self.escape_columns.setEnabled)
+        self.convert_unicode = QCheckBox("Convert Unicode to LaTeX")
+        self.convert_unicode.setToolTip("Write Greek letters, math symbols, accented letters and typographic "
+                                        "quotes as LaTeX macros.")
 
         include_layout = QVBoxLayout()
         include_layout.addWidget(self.include_math_mode)
         include_layout.addWidget(self.include_array_stretch)
+        include_layout.addWidget(self.escape_special)
+        include_layout.addWidget(self.escape_columns)
+        include_layout.addWidget(self.convert_unicode)
 
         include_group = QGroupBox("Includes")
         include_group.setLayout(include_layout)
 
+        self.conditional_formats = QLineEdit()
+        self.conditional_formats.setPlaceholderText("max in 2-4: bold; < 0: cell=red!20")
+        self.conditional_formats.setToolTip("Rules separated by semicolons, each a condition, the columns and the "
+                                            "formats.\nConditions: max, min, < 5, <= 5, > 5, >= 5, = 5 or /regular "
+                                            "expression/.\nFormats: bold, italic, underline, color=red and "
+                                            "cell=red!20.\nUsed by the longtable, tabular and array environments.")
+
+        conditional_layout = QVBoxLayout()
+        conditional_layout.addWidget(self.conditional_formats)
+
+        conditional_group = QGroupBox("Conditional Formats")
+        conditional_group.setLayout(conditional_layout)
+
+        self.number_formats = QLineEdit()
+        self.number_formats.setPlaceholderText("2-4: ,.2f S; 5: .3e split")
+        self.number_formats.setToolTip("Number formats separated by semicolons, each the columns, all columns if "
+                                       "left out, and a format.\nFormats: .2f for two decimal places, ,.2f to "
+                                       "add thousands separators, .3e for scientific notation.\nS aligns the "
+                                       "decimal points with a siunitx S column, split with an r@{.}l column "
+                                       "pair, in the longtable and tabular environments.")
+
+        number_layout = QVBoxLayout()
+        number_layout.addWidget(self.number_formats)
+
+        number_group = QGroupBox("Number Formats")
+        number_group.setLayout(number_layout)
+
         grid_type_layout = QVBoxLayout()
         grid_type_layout.addWidget(self.types_selector)
 
@@ -520,30 +2352,34 @@ class LTCOptionsEditorPane(QWidget):
         #self.OptionsLabel.setStyleSheet("font-weight: bold;")
         self.OptionsLabel.setStyleSheet("text-decoration: underline;")
 
-        # Place specific type panels into a stacked widget.
+        # Place specific type panels into a stacked widget, with placeholders
+        # for the panels that are not yet built.
         self.options_stack = QStackedWidget()
-        self.options_stack.addWidget(self.table_options_widget)
-        self.options_stack.addWidget(self.tabbing_options_widget)
-        self.options_stack.addWidget(self.array_options_widget)
-        self.options_stack.addWidget(self.matrix_options_widget)
-        self.options_stack.addWidget(self.SpecialMatrix_options_widget)
+        for i in range(len(self.panelBuilders)):
+            self.options_stack.addWidget(QWidget())
+        self.ensurePanel(0)
 
         # Put the selection panes together into one widget.
         app_form_layout.addRow(self.OptionsLabel)
         app_form_layout.addRow(self.options_stack)
         app_form_layout.addRow(include_group)
+        app_form_layout.addRow(conditional_group)
+        app_form_layout.addRow(number_group)
 
         pane_layout = QVBoxLayout()
         pane_layout.addLayout(app_form_layout)
         pane_layout.addStretch(1)
 
         self.setLayout(pane_layout)
+        self.showOptions()
+        self.watchOptions(self)
 
     def typeChanged(self):
         """
         Process a type change when the user selects a different grid type.
         """
         gridtype = self.types_selector.currentText()
+        self.model.update({'Grid Type': gridtype})
 
         # types = ["longtable", "tabular", "tabbing", "array", "matrix", "Special Matrix"]
         index = 0
@@ -565,6 +2401,7 @@ class LTCOptionsEditorPane(QWidget):
             index = 4
             self.OptionsLabel.setText("Special Matrix Options")
 
+        self.ensurePanel(index)
         count = self.options_stack.count()
         for i in range(count):
             widget = self.options_stack.widget(i)
@@ -575,6 +2412,189 @@ class LTCOptionsEditorPane(QWidget):
         self.options_stack.adjustSize()
         self.adjustSize()
 
+    def ensurePanel(self, index):
+        """
+        Builds the option panel at the given stack index if it has not been
+        built yet, replacing its placeholder.
+        """
+        if self.panelsBuilt[index]:
+            return
+        self.panelsBuilt[index] = True
+        widget = self.panelBuilders[index]()
+        placeholder = self.options_stack.widget(index)
+        current = self.options_stack.currentIndex()
+        self.options_stack.insertWidget(index, widget)
+        self.options_stack.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.options_stack.setCurrentIndex(current)
+        if self.layout() is not None:
+            self.showOptions()
+            self.watchOptions(widget)
+
+    def watchOptions(self, widget):
+        """
+        Updates the model when any option in the widget is changed.
+        """
+        for box in widget.findChildren(QCheckBox) + widget.findChildren(QRadioButton):
+            box.toggled.connect(self.syncModel)
+        for group in widget.findChildren(QGroupBox):
+            if group.isCheckable():
+                group.toggled.connect(self.syncModel)
+        for spinner in widget.findChildren(QSpinBox):
+            spinner.valueChanged.connect(self.syncModel)
+        for selector in widget.findChildren(QComboBox):
+            selector.currentIndexChanged.connect(self.syncModel)
+        for line in widget.findChildren(QLineEdit):
+            line.textChanged.connect(self.syncModel)
+
+    def syncModel(self):
+        self.model.update(self.readOptions())
+
+    def applySuggestions(self, suggestions):
+        """
+        Sets the options in the suggestions dictionary, the others are unchanged.
+        """
+        self.setOptionsInfo(suggestions)
+
+    def setOptionsInfo(self, info):
+        """
+        Sets the options in the dictionary, missing keys are left unchanged,
+        and shows them in the panel.
+        """
+        self.model.update(info)
+        self.showOptions()
+
+    def getOptionsInfo(self):
+        """
+        Returns the options as an immutable LTCOptions snapshot.
+        """
+        return self.model.snapshot()
+
+    def optionWidgets(self):
+        """
+        Returns the widgets of the options in the panels that have been built,
+        as dictionaries of the check boxes, the spinners, the text fields and,
+        for the options set with radio buttons, dictionaries from each value to
+        its button.
+        """
+        checks = {'Math Mode': self.include_math_mode,
+                  'Array Stretch': self.include_array_stretch,
+                  'Escape Special Characters': self.escape_special,
+                  'Convert Unicode': self.convert_unicode}
+        spinners = {}
+        texts = {'Escape Columns': self.escape_columns, 'Conditional Formats': self.conditional_formats,
+                 'Number Formats': self.number_formats}
+        choices = {}
+
+        if self.panelsBuilt[0]:
+            checks.update({'Table Border': self.table_border,
+                           'Table Division First Row': self.first_row_division,
+                           'Table Division All Rows': self.all_row_division,
+                           'Table Division First Column': self.first_column_division,
+                           'Table Division All Columns': self.all_column_division,
+                           'Table Column Header': self.column_header_group,
+                           'Table Column Header Bold': self.column_header_bold,
+                           'Table Column Header Italic': self.column_header_italic,
+                           'Table Column Header Underline': self.column_header_underline,
+                           'Table Row Header': self.row_header_group,
+                           'Table Row Header Bold': self.row_header_bold,
+                           'Table Row Header Italic': self.row_header_italic,
+                           'Table Row Header Underline': self.row_header_underline})
+            spinners.update({'Table Column Header Rows': self.column_header_rows,
+                             'Table Row Header Columns': self.row_header_columns})
+            choices['Table Column Align'] = {'Left': self.column_align_left, 'Center': self.column_align_center,
+                                             'Right': self.column_align_right}
+            choices['Table Column Header Align'] = {'Left': self.column_header_left,
+                                                    'Center': self.column_header_center,
+                                                    'Right': self.column_header_right}
+            choices['Table Row Header Align'] = {'Left': self.row_header_left, 'Center': self.row_header_center,
+                                                 'Right': self.row_header_right}
+
+        if self.panelsBuilt[1]:
+            checks['Tabbing Auto Width'] = self.tabbing_auto_width
+            spinners['Tabbing Column Width'] = self.tabbibg_column_width
+
+        if self.panelsBuilt[2]:
+            checks.update({'Array Border': self.array_table_border,
+                           'Array Division First Row': self.array_first_row_division,
+                           'Array Division All Rows': self.array_all_row_division,
+                           'Array Division First Column': self.array_first_column_division,
+                           'Array Division All Columns': self.array_all_column_division})
+            choices['Array Column Align'] = {'Left': self.array_column_align_left,
+                                             'Center': self.array_column_align_center,
+                                             'Right': self.array_column_align_right}
+            choices['Array Decoration'] = {'None': self.array_Dec_None, '()': self.array_Dec_Paren,
+                                           '[]': self.array_Dec_Bracket, '||': self.array_Dec_Det}
+
+        if self.panelsBuilt[3]:
+            choices['Matrix Decoration'] = {'None': self.matrix_Dec_None, '()': self.matrix_Dec_Paren,
+                                            '[]': self.matrix_Dec_Bracket, '||': self.matrix_Dec_Det}
+
+        if self.panelsBuilt[4]:
+            choices['Special Matrix Decoration'] = {'pmatrix': self.SpecialMatrix_p, 'bmatrix': self.SpecialMatrix_b,
+                                                    'vmatrix': self.SpecialMatrix_v, 'Vmatrix': self.SpecialMatrix_V}
+
+        return checks, spinners, texts, choices
+
+    def readOptions(self):
+        """
+        Reads the options shown in the built panels into a dictionary.
+        """
+        checks, spinners, texts, choices = self.optionWidgets()
+        info = {'Grid Type': self.types_selector.currentText()}
+        for key, widget in checks.items():
+            info[key] = widget.isChecked()
+        for key, widget in spinners.items():
+            info[key] = widget.value()
+        for key, widget in texts.items():
+            info[key] = widget.text()
+        for key, buttons in choices.items():
+            for value, button in buttons.items():
+                if button.isChecked():
+                    info[key] = value
+        return info
+
+    def showOptions(self):
+        """
+        Sets the widgets of the built panels from the model.  Widget signals
+        are blocked while the values are set and the panel is updated once at
+        the end.
+        """
+        info = self.model.snapshot()
+        checks, spinners, texts, choices = self.optionWidgets()
+
+        widgets = [self.types_selector] + list(checks.values()) + list(spinners.values()) + \
+                  list(texts.values()) + self.findChildren(QRadioButton)
+        for widget in widgets:
+            widget.blockSignals(True)
+
+        self.types_selector.setCurrentText(info['Grid Type'])
+        for key, widget in checks.items():
+            widget.setChecked(info[key])
+        for key, widget in spinners.items():
+            widget.setValue(info[key])
+        for key, widget in texts.items():
+            if widget.text() != info[key]:
+                widget.setText(info[key])
+        for key, buttons in choices.items():
+            buttons[info[key]].setChecked(True)
+
+        for widget in widgets:
+            widget.blockSignals(False)
+        if self.panelsBuilt[1]:
+            self.tabbibg_column_width.setEnabled(not info['Tabbing Auto Width'])
+        self.escape_columns.setEnabled(info['Escape Special Characters'])
+        self.typeChanged()
+
+    def selectGridType(self, environment):
+        """
+        Selects the grid type that produces the given LaTeX environment.
+        """
+        if environment in LTCOptionsModel.optionChoices['Special Matrix Decoration']:
+            self.setOptionsInfo({'Grid Type': 'Special Matrix', 'Special Matrix Decoration': environment})
+        else:
+            self.setOptionsInfo({'Grid Type': environment})
+
     def createTabbingOptions(self):
         """
         Create the options GUI for the tabbing grid type.
@@ -585,8 +2605,14 @@ class LTCOptionsEditorPane(QWidget):
         self.tabbibg_column_width.setValue(20)
         self.tabbibg_column_width.setSuffix(" pt")
 
+        self.tabbing_auto_width = QCheckBox("Auto")
+        self.tabbing_auto_width.setToolTip("Set each column width from its widest entry.")
+        self.tabbing_auto_width.toggled.connect(
+            lambda checked: self.tabbibg_column_width.setEnabled(not checked))
+
         hbox = QHBoxLayout()
         hbox.addWidget(self.tabbibg_column_width)
+        hbox.addWidget(self.tabbing_auto_width)
 
         column_align_group = QGroupBox("Column Width")
         column_align_group.setLayout(hbox)
@@ -596,6 +2622,7 @@ class LTCOptionsEditorPane(QWidget):
         tabbing_options_widget_layout.addRow(column_align_group)
 
         self.tabbing_options_widget.setLayout(tabbing_options_widget_layout)
+        return self.tabbing_options_widget
 
     def createMatrixOptions(self):
         """
@@ -631,6 +2658,7 @@ class LTCOptionsEditorPane(QWidget):
         array_options_widget_layout.addRow(dec_group)
 
         self.matrix_options_widget.setLayout(array_options_widget_layout)
+        return self.matrix_options_widget
 
     def createSpecialMatrixOptions(self):
         """
@@ -666,6 +2694,7 @@ class LTCOptionsEditorPane(QWidget):
         SM_options_widget_layout.addRow(SM_group)
 
         self.SpecialMatrix_options_widget.setLayout(SM_options_widget_layout)
+        return self.SpecialMatrix_options_widget
 
     def createArrayOptions(self):
         """
@@ -741,6 +2770,7 @@ class LTCOptionsEditorPane(QWidget):
         array_options_widget_layout.addRow(dec_group)
 
         self.array_options_widget.setLayout(array_options_widget_layout)
+        return self.array_options_widget
 
     def createTableOptions(self):
         """
@@ -889,683 +2919,1743 @@ class LTCOptionsEditorPane(QWidget):
         table_options_widget_layout.addRow(self.row_header_group)
 
         self.table_options_widget.setLayout(table_options_widget_layout)
+        return self.table_options_widget
 
-    def getOptionsInfo(self):
-        """
-        Create a dictionary of all options from the options panel.
-        """
 
-        info = {}
-        info['Grid Type'] = self.types_selector.currentText()
+class LTCLaTeXParser:
+    """
+    Single pass parser that converts LaTeX table code into a list of row lists.
+    Understands brace nesting, escaped characters, comments, inline math,
+    environment delimiters, \\multicolumn and the rule and spacing commands
+    written by the exporters of this program.  If the text contains a table
+    environment only the first one is read, otherwise the text is taken to be
+    the body of a table.
+    """
 
-        # Longtable/Tabular Options
-        # Longtable/Tabular Alignment
-        key = 'Table Column Align'
-        if self.column_align_left.isChecked():
-            info[key] = 'Left'
-        elif self.column_align_center.isChecked():
-            info[key] = 'Center'
-        else:
-            info[key] = 'Right'
-
-        # Longtable/Tabular Border
-        info['Table Border'] = self.table_border.isChecked()
-        info['Table Division First Row'] = self.first_row_division.isChecked()
-        info['Table Division All Rows'] = self.all_row_division.isChecked()
-        info['Table Division First Column'] = self.first_column_division.isChecked()
-        info['Table Division All Columns'] = self.all_column_division.isChecked()
-
-        # Longtable/Tabular Column Headers
-        info['Table Column Header'] = self.column_header_group.isChecked()
-        key = 'Table Column Header Align'
-        if self.column_header_left.isChecked():
-            info[key] = 'Left'
-        elif self.column_header_center.isChecked():
-            info[key] = 'Center'
-        else:
-            info[key] = 'Right'
-
-        info['Table Column Header Bold'] = self.column_header_bold.isChecked()
-        info['Table Column Header Italic'] = self.column_header_italic.isChecked()
-        info['Table Column Header Underline'] = self.column_header_underline.isChecked()
-        info['Table Column Header Rows'] = self.column_header_rows.value()
-
-        # Longtable/Tabular Row Headers
-        info['Table Row Header'] = self.row_header_group.isChecked()
-        key = 'Table Row Header Align'
-        if self.row_header_left.isChecked():
-            info[key] = 'Left'
-        elif self.row_header_center.isChecked():
-            info[key] = 'Center'
-        else:
-            info[key] = 'Right'
-
-        info['Table Row Header Bold'] = self.row_header_bold.isChecked()
-        info['Table Row Header Italic'] = self.row_header_italic.isChecked()
-        info['Table Row Header Underline'] = self.row_header_underline.isChecked()
-        info['Table Row Header Columns'] = self.row_header_columns.value()
-
-        # Tabbing Options
-        # Tabbing Column Width
-        info['Tabbing Column Width'] = self.tabbibg_column_width.value()
-
-        # Array Options
-        # Array Alignment
-        key = 'Array Column Align'
-        if self.array_column_align_left.isChecked():
-            info[key] = 'Left'
-        elif self.array_column_align_center.isChecked():
-            info[key] = 'Center'
-        else:
-            info[key] = 'Right'
-
-        # Array Border
-        info['Array Border'] = self.array_table_border.isChecked()
-        info['Array Division First Row'] = self.array_first_row_division.isChecked()
-        info['Array Division All Rows'] = self.array_all_row_division.isChecked()
-        info['Array Division First Column'] = self.array_first_column_division.isChecked()
-        info['Array Division All Columns'] = self.array_all_column_division.isChecked()
-
-        # Array Decoration
-        key = 'Array Decoration'
-        if self.array_Dec_None.isChecked():
-            info[key] = 'None'
-        elif self.array_Dec_Paren.isChecked():
-            info[key] = '()'
-        elif self.array_Dec_Bracket.isChecked():
-            info[key] = '[]'
-        else:
-            info[key] = '||'
-
-        # Matrix Options
-        key = 'Matrix Decoration'
-        if self.matrix_Dec_None.isChecked():
-            info[key] = 'None'
-        elif self.matrix_Dec_Paren.isChecked():
-            info[key] = '()'
-        elif self.matrix_Dec_Bracket.isChecked():
-            info[key] = '[]'
-        else:
-            info[key] = '||'
-
-        # Special Matrix Options
-        key = 'Special Matrix Decoration'
-        if self.SpecialMatrix_p.isChecked():
-            info[key] = 'pmatrix'
-        elif self.SpecialMatrix_b.isChecked():
-            info[key] = 'bmatrix'
-        elif self.SpecialMatrix_v.isChecked():
-            info[key] = 'vmatrix'
-        else:
-            info[key] = 'Vmatrix'
+    # Plain text, together with simple balanced {...} and $...$ groups that
+    # cannot end a cell, is read as a single token.
+    tokenPattern = re.compile(r'(?:[^\\{}&$%]|\{[^\\{}%]*\}|\$[^\\$%]*\$)+|\\(?:[A-Za-z@]+|.)|[{}&$%]', re.S)
+    groupPattern = re.compile(r'\\.|[{}]', re.S)
+    beginPattern = re.compile(r'\\begin\s*\{(?:tabular\*?|tabularx|tabulary|longtable|array|tabbing|'
+                              r'[pbBvV]?matrix|smallmatrix)\}')
 
-        # General Options
-        info['Math Mode'] = self.include_math_mode.isChecked()
-        info['Array Stretch'] = self.include_array_stretch.isChecked()
+    # Table environments and the number of mandatory arguments before the body.
+    tableEnvironments = {'tabular': 1, 'tabular*': 2, 'tabularx': 2, 'tabulary': 2, 'longtable': 1,
+                         'array': 1, 'tabbing': 0, 'matrix': 0, 'pmatrix': 0, 'bmatrix': 0,
+                         'Bmatrix': 0, 'vmatrix': 0, 'Vmatrix': 0, 'smallmatrix': 0}
 
-        # return dictionary
-        return info
+    dropCommands = {'\\hline', '\\toprule', '\\midrule', '\\bottomrule', '\\endhead', '\\endfirsthead',
+                    '\\endfoot', '\\endlastfoot', '\\pagebreak', '\\newpage', '\\nopagebreak'}
 
+    ruleCommands = {'\\cline', '\\cmidrule', '\\hhline'}
 
-class LaTeXTableEditor(QMainWindow):
+    def __init__(self):
+        self.environment = ''
+        self.columnSpec = ''
+        self.spans = []
+
+    def parse(self, text):
+        """
+        Parses the text and returns a rectangular list of row lists.  The
+        environment name and column specification of the table, if any, are left
+        in self.environment and self.columnSpec, and the \\multicolumn cells in
+        self.spans as (row, column, column count) triples.
+        """
+        self.text = text
+        self.environment = ''
+        self.columnSpec = ''
+        self.spans = []
+
+        rows = []
+        row = []
+        cell = []
+        span = 1
+        depth = 0
+        baseDepth = 0
+        nested = 0
+        inMath = False
+        inTable = False
+        # Groups are read in one step inside a table, or anywhere if there is
+        # no table environment in the text.
+        readGroups = self.beginPattern.search(text) is None
+
+        tokenMatch = self.tokenPattern.match
+        pos = 0
+        end = len(text)
+        while pos < end:
+            m = tokenMatch(text, pos)
+            tok = m.group()
+            pos = m.end()
+            c = tok[0]
+
+            if tok == '&':
+                if depth == baseDepth and nested == 0 and not inMath:
+                    row.append(''.join(cell).replace('\n', ' ').strip())
+                    if span > 1:
+                        self.spans.append((len(rows), len(row) - 1, span))
+                        row.extend([''] * (span - 1))
+                    cell = []
+                    span = 1
+                else:
+                    cell.append(tok)
+            elif tok == '\\\\' or tok == '\\tabularnewline':
+                if depth == baseDepth and nested == 0:
+                    row.append(''.join(cell).replace('\n', ' ').strip())
+                    if span > 1:
+                        self.spans.append((len(rows), len(row) - 1, span))
+                        row.extend([''] * (span - 1))
+                    rows.append(row)
+                    row = []
+                    cell = []
+                    span = 1
+                    inMath = False
+                    pos = self.skipRowSpacing(pos)
+                else:
+                    cell.append(tok)
+            elif c != '\\' and (len(tok) > 1 or c not in '{}$%'):
+                cell.append(tok)
+            elif tok == '{':
+                if readGroups:
+                    # Nothing inside a group can end a cell, take it in one step.
+                    group, pos = self.readGroup(m.start())
+                    cell.append('{' + group + '}')
+                else:
+                    depth += 1
+                    cell.append(tok)
+            elif tok == '}':
+                depth -= 1
+                cell.append(tok)
+            elif tok == '$':
+                close = self.findMathEnd(pos) if readGroups and not inMath else -1
+                if close != -1:
+                    cell.append(text[m.start():close + 1])
+                    pos = close + 1
+                else:
+                    inMath = not inMath
+                    cell.append(tok)
+            elif tok == '%':
+                nl = text.find('\n', pos)
+                pos = end if nl == -1 else nl + 1
+            elif tok == '\\(' or tok == '\\)':
+                inMath = tok == '\\('
+                cell.append(tok)
+            elif tok in self.dropCommands:
+                pass
+            elif tok in self.ruleCommands:
+                pos = self.skipOptional(pos, '(', ')')
+                pos = self.skipOptional(pos, '[', ']')
+                arg, pos = self.readGroup(pos)
+            elif tok == '\\begin':
+                name, pos = self.readGroup(pos)
+                if not inTable and nested == 0 and name in self.tableEnvironments:
+                    # Anything before the table is preamble, discard it.
+                    rows = []
+                    row = []
+                    cell = []
+                    span = 1
+                    self.spans = []
+                    inMath = False
+                    inTable = True
+                    readGroups = True
+                    baseDepth = depth
+                    self.environment = name
+                    pos = self.skipOptional(pos, '[', ']')
+                    for i in range(self.tableEnvironments[name]):
+                        self.columnSpec, pos = self.readGroup(pos)
+                else:
+                    nested += 1
+                    cell.append('\\begin{' + name + '}')
+            elif tok == '\\end':
+                name, pos = self.readGroup(pos)
+                if nested > 0:
+                    nested -= 1
+                    cell.append('\\end{' + name + '}')
+                elif inTable and name == self.environment:
+                    break
+            elif tok == '\\multicolumn' and depth == baseDepth and nested == 0:
+                count, pos = self.readGroup(pos)
+                spec, pos = self.readGroup(pos)
+                content, pos = self.readGroup(pos)
+                cell.append(content)
+                try:
+                    span = max(1, int(count))
+                except ValueError:
+                    span = 1
+            elif self.environment == 'tabbing' and (tok == '\\>' or tok == '\\=') \
+                    and depth == baseDepth and nested == 0:
+                row.append(''.join(cell).strip())
+                cell = []
+            elif self.environment == 'tabbing' and tok == '\\kill':
+                # \kill ends the line and discards it.
+                row = []
+                cell = []
+                span = 1
+            else:
+                cell.append(tok)
+
+        # Last row if not terminated by \\, an empty tail is dropped.
+        row.append(''.join(cell).replace('\n', ' ').strip())
+        if span > 1:
+            self.spans.append((len(rows), len(row) - 1, span))
+            row.extend([''] * (span - 1))
+        if len(row) > 1 or row[0] != '':
+            rows.append(row)
+
+        self.text = ''
+        return self.finishTable(rows)
+
+    def finishTable(self, rows):
+        """
+        Pads the rows to the same length and removes the $...$ wrapping that the
+        Math Mode option puts around every cell of a text table.
+        """
+        cols = max((len(row) for row in rows), default=0)
+        for row in rows:
+            if len(row) < cols:
+                row.extend([''] * (cols - len(row)))
+
+        if self.environment in ('tabular', 'longtable', 'tabbing'):
+            wrapped = False
+            for row in rows:
+                for item in row:
+                    if item != '':
+                        if len(item) < 2 or item[0] != '$' or item[-1] != '$' or '$' in item[1:-1]:
+                            return rows
+                        wrapped = True
+            if wrapped:
+                for row in rows:
+                    for j in range(len(row)):
+                        if row[j] != '':
+                            row[j] = row[j][1:-1]
+
+        return rows
+
+    def findMathEnd(self, pos):
+        """
+        Returns the position of the $ closing the inline math that starts just
+        before pos, or -1 if it is not closed before the end of the row.
+        """
+        text = self.text
+        rowEnd = text.find('\\\\', pos)
+        close = text.find('$', pos)
+        while close != -1 and text[close - 1] == '\\':
+            close = text.find('$', close + 1)
+        if close == -1 or (rowEnd != -1 and close > rowEnd):
+            return -1
+        return close
+
+    def skipSpaces(self, pos, newlines=True):
+        text = self.text
+        while pos < len(text) and (text[pos] in ' \t' or (newlines and text[pos] in '\r\n')):
+            pos += 1
+        return pos
+
+    def skipRowSpacing(self, pos):
+        """
+        Skips the optional * and [length] after a \\\\ row end.  Line breaks are
+        not skipped so a cell that starts with [ on the next line is kept.
+        """
+        text = self.text
+        if pos < len(text) and text[pos] == '*':
+            pos += 1
+        return self.skipOptional(pos, '[', ']', newlines=False)
+
+    def skipOptional(self, pos, opening, closing, newlines=True):
+        """
+        Skips an optional argument delimited by opening and closing.
+        """
+        start = self.skipSpaces(pos, newlines)
+        if start < len(self.text) and self.text[start] == opening:
+            close = self.text.find(closing, start + 1)
+            if close != -1:
+                return close + 1
+        return pos
+
+    def readGroup(self, pos):
+        """
+        Reads a mandatory argument starting at pos.  Returns the contents of the
+        brace group, or the single token if the argument is not braced, and the
+        position after it.
+        """
+        text = self.text
+        pos = self.skipSpaces(pos)
+        if pos >= len(text):
+            return '', pos
+        if text[pos] != '{':
+            m = self.tokenPattern.match(text, pos)
+            return m.group(), m.end()
+
+        depth = 1
+        search = self.groupPattern.search
+        p = pos + 1
+        while depth > 0:
+            m = search(text, p)
+            if m is None:
+                return text[pos + 1:], len(text)
+            p = m.end()
+            if m.group() == '{':
+                depth += 1
+            elif m.group() == '}':
+                depth -= 1
+        return text[pos + 1:p - 1], p
+
+
+class LTCTexDocumentIndex:
+    """
+    Index of the table environments in a LaTeX document.  The document is
+    scanned once for the supported environments and each one is recorded with
+    its type, line range, estimated dimensions and column specification.  Only
+    the environments the user picks are parsed.  The indexes of the last few
+    documents are cached by path, modification time and size.  A cached index
+    keeps the environment offsets but not the text, which is read again when
+    environments are parsed.
+    """
 
-    def __init__(self, parent=None):
-        """
-        Initialize the program and set up the programList structure that
-        allows the creation of child applications.
+    indexCache = OrderedDict()
+    indexCacheSize = 8
+
+    environmentPattern = re.compile(r'\\(begin|end)\s*\{(tabular\*?|tabularx|tabulary|longtable|array|tabbing|'
+                                    r'[pbBvV]?matrix|smallmatrix)\}')
+    specGroupPattern = re.compile(r'[@!<>]\s*\{[^{}]*\}')
+    specRepeatPattern = re.compile(r'\*\s*\{(\d+)\}\s*\{([^{}]*)\}')
+    specWidthPattern = re.compile(r'\{[^{}]*\}')
+
+    def __init__(self, file_name, text):
+        self.file_name = file_name
+        self.text = text
+        self.key = None
+        self.environments = []
+        self.scan()
+
+    @staticmethod
+    def readText(file_name):
+        with open(file_name, 'r', encoding='utf-8', errors='replace') as f:
+            return f.read()
+
+    @classmethod
+    def load(cls, file_name):
+        """
+        Returns the index of the file, reusing a cached index if the file has
+        not changed since it was made.
+        """
+        stat = os.stat(file_name)
+        key = (os.path.abspath(file_name), stat.st_mtime_ns, stat.st_size)
+        index = cls.indexCache.get(key)
+        if index is not None:
+            cls.indexCache.move_to_end(key)
+            return index
+
+        index = cls(file_name, cls.readText(file_name))
+        index.text = None
+        index.key = key
+        cls.indexCache[key] = index
+        if len(cls.indexCache) > cls.indexCacheSize:
+            cls.indexCache.popitem(last=False)
+        return index
+
+    def scan(self):
+        """
+        Finds every supported environment in one pass over the document.
+        Environments in comments are ignored.
+        """
+        text = self.text
+        stack = []
+        line = 1
+        linePos = 0
+        for m in self.environmentPattern.finditer(text):
+            line += text.count('\n', linePos, m.start())
+            linePos = m.start()
+
+            lineStart = text.rfind('\n', 0, m.start()) + 1
+            if self.isCommented(text, lineStart, m.start()):
+                continue
+
+            name = m.group(2)
+            if m.group(1) == 'begin':
+                stack.append((name, m.start(), line))
+            else:
+                for k in range(len(stack) - 1, -1, -1):
+                    if stack[k][0] == name:
+                        begin = stack[k]
+                        del stack[k:]
+                        self.environments.append(self.makeEntry(name, begin[1], m.start(), m.end(), begin[2], line))
+                        break
+
+        self.environments.sort(key=lambda entry: entry['Start'])
+
+    def isCommented(self, text, lineStart, pos):
+        """
+        Returns True if there is an unescaped % between lineStart and pos.
+        """
+        p = text.find('%', lineStart, pos)
+        while p != -1:
+            backslashes = 0
+            while p - backslashes - 1 >= lineStart and text[p - backslashes - 1] == '\\':
+                backslashes += 1
+            if backslashes % 2 == 0:
+                return True
+            p = text.find('%', p + 1, pos)
+        return False
+
+    def makeEntry(self, name, start, bodyEnd, end, firstLine, lastLine):
+        """
+        Creates the index entry for one environment.  The dimensions are
+        estimated from the column specification and the row separators without
+        parsing the cells.
+        """
+        parser = LTCLaTeXParser()
+        parser.text = self.text
+        pos = self.text.find('}', start) + 1
+        pos = parser.skipOptional(pos, '[', ']')
+        spec = ''
+        for i in range(LTCLaTeXParser.tableEnvironments.get(name, 0)):
+            spec, pos = parser.readGroup(pos)
+        parser.text = ''
+
+        body = self.text[pos:bodyEnd]
+        separator = '\\>' if name == 'tabbing' else '&'
+        chunks = [chunk for chunk in body.split('\\\\') if chunk.strip() not in ('', '\\hline')]
+        rows = len(chunks)
+        if name == 'tabbing' and '\\kill' in body:
+            rows -= 1
+
+        cols = self.columnsInSpec(spec)
+        if cols == 0:
+            cols = max((chunk.count(separator) + 1 for chunk in chunks), default=0)
+
+        return {'Environment': name, 'Start': start, 'End': end, 'First Line': firstLine,
+                'Last Line': lastLine, 'Rows': max(rows, 0), 'Columns': cols, 'Column Spec': spec}
+
+    def columnsInSpec(self, spec):
+        """
+        Counts the columns in a column specification such as |l|*{3}{c}|p{2cm}|.
+        """
+        spec = self.specGroupPattern.sub('', spec)
+        while True:
+            expanded = self.specRepeatPattern.sub(lambda m: m.group(2) * int(m.group(1)), spec)
+            if expanded == spec:
+                break
+            spec = expanded
+        spec = self.specWidthPattern.sub('', spec)
+        return sum(1 for c in spec if c in 'lcrpmbXSLCRJ')
+
+    def describe(self, entry):
+        """
+        Returns a one line description of an entry for display.
+        """
+        desc = entry['Environment'] + '   lines ' + str(entry['First Line']) + '-' + str(entry['Last Line']) + \
+               '   ' + str(entry['Rows']) + ' x ' + str(entry['Columns'])
+        if entry['Column Spec'] != '':
+            desc += '   {' + entry['Column Spec'] + '}'
+        return desc
+
+    def parseEnvironments(self, entries):
+        """
+        Parses the cells of the indexed environments.  The text of a loaded
+        index is read again, raises ValueError if the file has changed since
+        it was indexed.
+        """
+        text = self.text
+        if text is None:
+            stat = os.stat(self.file_name)
+            if (stat.st_mtime_ns, stat.st_size) != self.key[1:]:
+                raise ValueError('The file ' + self.file_name + ' has changed since it was indexed.')
+            text = self.readText(self.file_name)
+        return [LTCLaTeXParser().parse(text[entry['Start']:entry['End']]) for entry in entries]
+
+    def parseEnvironment(self, entry):
         """
-        super().__init__()
-        self.Parent = parent
-        
-        self.authors = "Don Spickler"
-        self.version = "2.6.1"
-        self.program_title = "Latex Table Creator"
-        self.copyright = "2022 - 2025"
-        self.licence = "\nThis software is distributed under the GNU General Public License version 3.\n\n" + \
-        "This program is free software: you can redistribute it and/or modify it under the terms of the GNU " + \
-        "General Public License as published by the Free Software Foundation, either version 3 of the License, " + \
-        "or (at your option) any later version. This program is distributed in the hope that it will be useful, " + \
-        "but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A " + \
-        "PARTICULAR PURPOSE. See the GNU General Public License for more details http://www.gnu.org/licenses/."
+        Parses the cells of one indexed environment.
+        """
+        return self.parseEnvironments([entry])[0]
 
-        self.clipboard = QApplication.clipboard()
-        self.programList = []
-        self.setMinimumSize(800, 600)
-        self.setWindowTitle('LaTeX Table Creator')
-        icon = QIcon(self.resource_path("icons/ProgramIcon2.png"))
-        self.setWindowIcon(icon)
 
-        self.currentTheme = ''
-        self.Platform = platform.system()
-        styles = QStyleFactory.keys()
-        if "Fusion" in styles:
-            app.setStyle('Fusion')
-            self.currentTheme = 'Fusion'
-        else:
-            self.currentTheme = styles[0]
+class LTCTexImportDialog(QDialog):
+    """
+    Dialog listing the table environments of a document for selection.
+    """
 
-        try:
-            with open('LaTeXTableCreatorOptions.opt', 'rb') as f:
-                filecontents = pickle.load(f)
-                theme = filecontents[0]
-                self.Parent.setStyle(theme)
-                self.currentTheme = theme
-        except Exception as e:
-            pass
+    def __init__(self, index, parent=None):
+        super().__init__(parent)
+        self.index = index
+        self.setWindowTitle('Import from ' + os.path.basename(index.file_name))
+        self.setMinimumSize(500, 350)
 
-        self.createTablePane()
-        self.createMenu()
-        self.createToolBar()
-        self.createDockWidget()
-        self.show()
+        self.env_list = QListWidget()
+        self.env_list.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        for entry in index.environments:
+            self.env_list.addItem(index.describe(entry))
+        self.env_list.setCurrentRow(0)
+        self.env_list.itemDoubleClicked.connect(self.accept)
 
-    def resource_path(self, relative_path):
-        """
-        Creates a system path that is rlative to the position of the running application.
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
 
-        :param relative_path: The relative path of the file from the base position of the running appliction.
-        :return: The full OS path.
-        """
-        if hasattr(sys, '_MEIPASS'):
-            return os.path.join(sys._MEIPASS, relative_path)
-        return os.path.join(os.path.abspath("."), relative_path)
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel("Select the tables to load:"))
+        layout.addWidget(self.env_list)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
 
-    # def resource_path(self, relative_path):
-    #     if hasattr(sys, '_MEIPASS'):
-    #         return os.path.join(sys._MEIPASS, relative_path)
-    #     return os.path.join(os.path.abspath("LaTeXTableCreator"), relative_path)
+    def selectedEnvironments(self):
+        rows = sorted(self.env_list.row(item) for item in self.env_list.selectedItems())
+        return [self.index.environments[i] for i in rows]
 
-    def createTablePane(self):
-        """
-        Sets up the portion of the screen that contains the table and the
-        size selection spinners.
-        """
-        self.table_widget = LTC_Table()
 
-        row_label = QLabel("Rows")
-        self.rows = QSpinBox()
-        self.rows.setRange(1, 10000)
-        self.rows.setMinimumWidth(75)
-        self.rows.setValue(3)
-        self.rows.valueChanged.connect(self.resizeTableRows)
+class LTCHTMLTableParser(HTMLParser):
+    """
+    Incremental parser for the first <table> in an HTML fragment, such as the
+    text/html clipboard data from spreadsheets and web browsers.  Handles <tr>,
+    <td> and <th> with rowspan and colspan, cells covered by a span are left
+    empty.  Tables nested in a cell are skipped along with their text.
+    Entities are decoded by HTMLParser.  Completed rows are collected in
+    self.rows as the text is fed.
+    """
 
-        column_label = QLabel("Columns")
-        self.columns = QSpinBox()
-        self.columns.setRange(1, 1000)
-        self.columns.setMinimumWidth(75)
-        self.columns.setValue(3)
-        self.columns.valueChanged.connect(self.resizeTableColumns)
+    maxSpan = 1000
 
-        h_box_tablesize = QHBoxLayout()
-        h_box_tablesize.addWidget(row_label)
-        h_box_tablesize.addWidget(self.rows)
-        h_box_tablesize.addWidget(column_label)
-        h_box_tablesize.addWidget(self.columns)
-        h_box_tablesize.addStretch()
+    ignoredPattern = re.compile(r'<!--.*?-->|<(style|script)\b.*?</\1\s*>', re.S | re.I)
+    tagPattern = re.compile(r'<(/?)([A-Za-z][A-Za-z0-9]*)([^>]*)>')
+    spanPattern = re.compile(r'\b(rowspan|colspan)\s*=\s*["\']?(\d+)', re.I)
 
-        h_box_table = QHBoxLayout()
-        h_box_table.addWidget(self.table_widget)
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows = []
+        self.spans = []
+        self.rowCount = 0
+        self.row = None
+        self.cell = None
+        self.cellSpan = (1, 1)
+        self.pending = {}
+        self.depth = 0
+        self.done = False
+
+    @classmethod
+    def iterRows(cls, html, chunkSize=65536):
+        """
+        Generator that feeds the HTML in chunks and yields each row as soon as
+        it is complete.
+        """
+        parser = cls()
+        html = cls.simplify(html)
+        for start in range(0, len(html), chunkSize):
+            parser.feed(html[start:start + chunkSize])
+            rows = parser.rows
+            if len(rows) > 0:
+                parser.rows = []
+                yield from rows
+            if parser.done:
+                return
+        parser.close()
+        parser.endRow()
+        yield from parser.rows
+
+    @classmethod
+    def parseTable(cls, html):
+        """
+        Returns the first table in the HTML as a rectangular list of row lists,
+        or an empty list if there is no table.
+        """
+        items = list(cls.iterRows(html))
+        cols = max((len(row) for row in items), default=0)
+        for row in items:
+            if len(row) < cols:
+                row.extend([''] * (cols - len(row)))
+        return items
+
+    @classmethod
+    def simplify(cls, html):
+        """
+        Reduces the HTML to the tags the parser uses before parsing.  Comments,
+        styles and scripts are removed, formatting tags are dropped and
+        attributes other than rowspan and colspan are removed.  The cell, row
+        and table end tags are kept, so text between cells is not added to the
+        cell before it.  Spreadsheet HTML carries long style attributes on
+        every cell, so this leaves far less for HTMLParser to process.
+        """
+        return cls.tagPattern.sub(cls.simplifyTag, cls.ignoredPattern.sub('', html))
+
+    @classmethod
+    def simplifyTag(cls, m):
+        name = m.group(2).lower()
+        if m.group(1):
+            if name == 'th':
+                return '</td>'
+            return '</' + name + '>' if name in ('td', 'tr', 'table') else ''
+        if name == 'td' or name == 'th':
+            attrs = m.group(3)
+            if 'span' in attrs or 'SPAN' in attrs:
+                return '<td ' + ' '.join(a + '=' + v for a, v in cls.spanPattern.findall(attrs)) + '>'
+            return '<td>'
+        if name == 'tr' or name == 'table':
+            return '<' + name + '>'
+        if name == 'br' or name == 'p' or name == 'div':
+            return ' '
+        return ''
+
+    def spanValue(self, attrs, name):
+        for key, value in attrs:
+            if key == name:
+                try:
+                    return min(max(int(value), 1), self.maxSpan)
+                except (TypeError, ValueError):
+                    return 1
+        return 1
+
+    def fillPending(self):
+        """
+        Adds the cells covered by rowspans from rows above at the current position.
+        """
+        row = self.row
+        while len(row) in self.pending:
+            col = len(row)
+            count = self.pending[col]
+            row.append('')
+            if count <= 1:
+                del self.pending[col]
+            else:
+                self.pending[col] = count - 1
+
+    def startRow(self):
+        self.endRow()
+        self.row = []
+
+    def endRow(self):
+        self.endCell()
+        if self.row is not None:
+            # Rowspans from above that extend past the last cell of this row.
+            for col in sorted(c for c in self.pending if c >= len(self.row)):
+                self.row.extend([''] * (col - len(self.row)))
+                self.fillPending()
+            self.rows.append(self.row)
+            self.rowCount += 1
+            self.row = None
+
+    def endCell(self):
+        if self.cell is None:
+            return
+        text = ' '.join(''.join(self.cell).split())
+        rowspan, colspan = self.cellSpan
+        col = len(self.row)
+        self.row.append(text)
+        self.row.extend([''] * (colspan - 1))
+        if rowspan > 1:
+            for c in range(col, col + colspan):
+                self.pending[c] = rowspan - 1
+        if rowspan > 1 or colspan > 1:
+            self.spans.append((self.rowCount, col, rowspan, colspan))
+        self.cell = None
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == 'table':
+            self.depth += 1
+        elif self.depth > 1:
+            pass
+        elif tag == 'tr' and self.depth == 1:
+            self.startRow()
+        elif (tag == 'td' or tag == 'th') and self.depth == 1:
+            if self.row is None:
+                self.row = []
+            self.endCell()
+            self.fillPending()
+            self.cell = []
+            self.cellSpan = (self.spanValue(attrs, 'rowspan'), self.spanValue(attrs, 'colspan'))
+        elif tag == 'br' and self.cell is not None:
+            self.cell.append(' ')
+
+    def handle_endtag(self, tag):
+        if self.done:
+            return
+        if tag == 'table':
+            self.depth -= 1
+            if self.depth == 0:
+                self.endRow()
+                self.done = True
+        elif self.depth > 1:
+            pass
+        elif tag == 'tr':
+            self.endRow()
+        elif tag == 'td' or tag == 'th':
+            self.endCell()
 
-        v_box_tablepane = QVBoxLayout()
-        v_box_tablepane.setContentsMargins(5, 5, 0, 0)
-        v_box_tablepane.addLayout(h_box_tablesize)
-        v_box_tablepane.addLayout(h_box_table)
+    def handle_data(self, data):
+        if self.cell is not None and self.depth == 1:
+            self.cell.append(data.replace('\xa0', ' '))
+
+
+class LTCDelimitedFile:
+    """
+    Read-only access to a large CSV/TSV file.  The file is memory mapped and the
+    byte offset of the start of each record is recorded in one sequential pass.
+    The offsets are stored next to the file (file name + .ltcidx) so that the
+    index can be reused the next time the same file is opened.
+    """
+
+    indexMagic = b'LTCIDX02'
+    indexHeader = struct.Struct('<8sQQQ')
+    chunkSize = 1 << 24
 
-        centerPane = QWidget()
-        centerPane.setLayout(v_box_tablepane)
-        self.setCentralWidget(centerPane)
+    def __init__(self, file_name):
+        self.file_name = file_name
+        self.index_name = file_name + '.ltcidx'
+        self.file = open(file_name, 'rb')
+        stat = os.fstat(self.file.fileno())
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime_ns
+
+        if self.size > 0:
+            self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self.mm = b''
+
+        self.offsets = self.loadIndex()
+        if self.offsets is None:
+            self.offsets = self.buildIndex()
+            self.saveIndex()
+
+        self.delimiter = self.detectDelimiter()
+        self.rowCache = OrderedDict()
+        self.rowCacheSize = 4096
+        self.columns = self.detectColumnCount()
+
+    def close(self):
+        """
+        Releases the memory map and the file handle.
+        """
+        if isinstance(self.mm, mmap.mmap):
+            self.mm.close()
+        self.mm = b''
+        self.file.close()
+
+    def buildIndex(self, quotes=True):
+        """
+        Builds the record offset index in one pass over the file.  Each chunk
+        is split on newlines and the offsets are accumulated from the line
+        lengths, so the per-line work stays inside the C builtins.  Chunks with
+        double quotes are walked line by line, as a newline inside a quoted
+        field does not start a new record.  If the quotes do not balance, for
+        example with inch marks in unquoted fields, each line is a record.
+        """
+        offsets = array('Q', [0])
+        mm = self.mm
+        size = self.size
+        start = 0
+        quoted = False
+        while start < size:
+            end = min(start + self.chunkSize, size)
+            if end < size:
+                nl = mm.rfind(b'\n', start, end)
+                if nl == -1:
+                    nl = mm.find(b'\n', end)
+                    if nl == -1:
+                        nl = size - 1
+                end = nl + 1
+
+            chunk = mm[start:end]
+            parts = chunk.split(b'\n')
+            if not quotes or (not quoted and b'"' not in chunk):
+                positions = accumulate(map((1).__add__, map(len, parts[:-1])), initial=start)
+                next(positions)
+                offsets.extend(positions)
+            else:
+                position = start
+                for part in parts[:-1]:
+                    position += len(part) + 1
+                    if part.count(b'"') % 2 == 1:
+                        quoted = not quoted
+                    if not quoted:
+                        offsets.append(position)
+                if parts[-1].count(b'"') % 2 == 1:
+                    quoted = not quoted
+            start = end
+
+        if quoted:
+            return self.buildIndex(False)
+
+        if len(offsets) > 1 and offsets[-1] >= size:
+            offsets.pop()
+        if size == 0:
+            offsets = array('Q')
+        return offsets
+
+    def loadIndex(self):
+        """
+        Loads a saved index if it matches the current size and modification
+        time of the file, otherwise returns None.
+        """
+        try:
+            with open(self.index_name, 'rb') as f:
+                magic, size, mtime, count = self.indexHeader.unpack(f.read(self.indexHeader.size))
+                if magic != self.indexMagic or size != self.size or mtime != self.mtime:
+                    return None
+                offsets = array('Q')
+                offsets.fromfile(f, count)
+                return offsets
+        except Exception:
+            return None
 
-    def resizeTableRows(self):
+    def saveIndex(self):
         """
-        Resizes the table to the current spinner values.
+        Saves the index next to the file.  Failure to save, for example in a
+        read-only directory, is not an error, the index is just rebuilt next time.
         """
-        self.resizeTable()
-        self.rows.setFocus()
+        try:
+            with open(self.index_name, 'wb') as f:
+                f.write(self.indexHeader.pack(self.indexMagic, self.size, self.mtime, len(self.offsets)))
+                self.offsets.tofile(f)
+        except Exception:
+            pass
 
-    def resizeTableColumns(self):
+    def detectDelimiter(self):
         """
-        Resizes the table to the current spinner values.
+        Determines the field delimiter from the file extension or a sample of
+        the first lines.
         """
-        self.resizeTable()
-        self.columns.setFocus()
+        if self.file_name.lower().endswith(('.tsv', '.tab')):
+            return '\t'
 
-    def resizeTable(self):
+        sample = self.getLine(0) if self.rowCount() > 0 else ''
+        try:
+            return csv.Sniffer().sniff(sample, delimiters=',;\t|').delimiter
+        except csv.Error:
+            return '\t' if '\t' in sample else ','
+
+    def detectColumnCount(self):
         """
-        Resizes the table to the current spinner values.
+        Estimates the column count from the first few hundred rows.
         """
-        rows = self.rows.value()
-        cols = self.columns.value()
-        self.table_widget.resizeTable(rows, cols)
+        cols = 1
+        for i in range(min(200, self.rowCount())):
+            cols = max(cols, len(self.getRow(i)))
+        return cols
 
-    def createMenu(self):
+    def rowCount(self):
+        return len(self.offsets)
+
+    def columnCount(self):
+        return self.columns
+
+    def getLine(self, i):
         """
-        Set up the menu bar.
+        Returns the decoded text of record i, which holds the newlines of its
+        quoted fields.
         """
-        # Create file menu actions
-        self.file_new_act = QAction(QIcon(self.resource_path('icons/FileNew.png')), "New", self)
-        self.file_new_act.setShortcut('Ctrl+N')
-        self.file_new_act.setStatusTip('Start a new table.')
-        self.file_new_act.triggered.connect(self.newtable)
+        start = self.offsets[i]
+        if i + 1 < len(self.offsets):
+            end = self.offsets[i + 1]
+        else:
+            end = self.size
+        line = self.mm[start:end].decode('utf-8', errors='replace').rstrip('\r\n')
+        if i == 0:
+            line = line.lstrip('\ufeff')
+        return line
 
-        self.file_open_act = QAction(QIcon(self.resource_path('icons/FileOpen.png')), "Open...", self)
-        self.file_open_act.setShortcut('Ctrl+O')
-        self.file_open_act.setStatusTip('Open a table file.')
-        self.file_open_act.triggered.connect(self.openFile)
+    def getRow(self, i):
+        """
+        Returns the list of fields in row i.  Recently used rows are cached.
+        """
+        row = self.rowCache.get(i)
+        if row is not None:
+            self.rowCache.move_to_end(i)
+            return row
 
-        self.file_saveas_act = QAction(QIcon(self.resource_path('icons/FileSave.png')), "Save As...", self)
-        self.file_saveas_act.setShortcut('Ctrl+S')
-        self.file_saveas_act.setStatusTip('Save a table file.')
-        self.file_saveas_act.triggered.connect(self.saveFile)
+        row = next(csv.reader([self.getLine(i)], delimiter=self.delimiter), [])
+        self.rowCache[i] = row
+        if len(self.rowCache) > self.rowCacheSize:
+            self.rowCache.popitem(last=False)
+        return row
 
-        quit_act = QAction("Exit", self)
-        quit_act.setStatusTip('Exit the program.')
-        quit_act.triggered.connect(self.close)
+    def getRows(self, top, bottom, left, right):
+        """
+        Returns a list of row lists for the given block, parsing only the rows
+        inside the block.
+        """
+        tablelist = []
+        for i in range(top, bottom + 1):
+            row = next(csv.reader([self.getLine(i)], delimiter=self.delimiter), [])
+            rowlist = row[left:right + 1]
+            rowlist += [''] * (right - left + 1 - len(rowlist))
+            tablelist.append(rowlist)
+        return tablelist
 
-        # Create table menu actions
-        self.add_row_above_act = QAction("Add Row Above", self)
-        self.add_row_above_act.setShortcut('Ctrl+Up')
-        self.add_row_above_act.setStatusTip('Add a row above the current selection.')
-        self.add_row_above_act.triggered.connect(self.addRowAbove)
 
-        self.add_row_below_act = QAction("Add Row Below", self)
-        self.add_row_below_act.setShortcut('Ctrl+Down')
-        self.add_row_below_act.setStatusTip('Add a row below the current selection.')
-        self.add_row_below_act.triggered.connect(self.addRowBelow)
+class LTCDelimitedFileModel(QAbstractTableModel):
+    """
+    Table model that serves the cells of an LTCDelimitedFile on demand.
+    """
 
-        self.add_col_before_act = QAction("Add Column Before", self)
-        self.add_col_before_act.setShortcut('Ctrl+Left')
-        self.add_col_before_act.setStatusTip('Add a column before the current selection.')
-        self.add_col_before_act.triggered.connect(self.addColumnBefore)
+    def __init__(self, datafile, parent=None):
+        super().__init__(parent)
+        self.datafile = datafile
 
-        self.add_col_after_act = QAction("Add Column After", self)
-        self.add_col_after_act.setShortcut('Ctrl+Right')
-        self.add_col_after_act.setStatusTip('Add a column after the current selection.')
-        self.add_col_after_act.triggered.connect(self.addColumnAfter)
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self.datafile.rowCount()
 
-        self.delete_row_act = QAction("Delete Rows", self)
-        self.delete_row_act.setStatusTip('Delete selected rows.')
-        self.delete_row_act.triggered.connect(self.deleteRows)
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self.datafile.columnCount()
 
-        self.delete_col_act = QAction("Delete Columns", self)
-        self.delete_col_act.setStatusTip('Delete selected columns.')
-        self.delete_col_act.triggered.connect(self.deleteColumns)
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        row = self.datafile.getRow(index.row())
+        if index.column() < len(row):
+            return row[index.column()]
+        return ''
 
-        self.delete_row_col_act = QAction("Delete Rows and Columns", self)
-        self.delete_row_col_act.setStatusTip('Delete selected rows and columns.')
-        self.delete_row_col_act.triggered.connect(self.deleteRowsColumns)
 
-        self.clear_table_act = QAction("Clear All", self)
-        self.clear_table_act.setStatusTip('Delete the table contents.')
-        self.clear_table_act.triggered.connect(self.clearTable)
+class LTCReadOnlyViewer(QMainWindow):
+    """
+    Window showing a large delimited file as a read-only grid.  A selected block
+    can be copied as LaTeX with the options of the editor that opened it, or
+    sent to that editor's grid.
+    """
 
-        self.transpose_act = QAction("Transpose Table", self)
-        self.transpose_act.setStatusTip('Transposes the table contents.')
-        self.transpose_act.triggered.connect(self.transpose)
+    def __init__(self, editor, datafile):
+        super().__init__()
+        self.editor = editor
+        self.datafile = datafile
+        self.setMinimumSize(600, 400)
+        self.setWindowTitle('Read-Only View - ' + os.path.basename(datafile.file_name))
+        self.setWindowIcon(editor.windowIcon())
+
+        self.table_view = QTableView()
+        self.table_view.setSelectionMode(QAbstractItemView.ContiguousSelection)
+        self.table_view.setModel(LTCDelimitedFileModel(datafile, self))
+        self.setCentralWidget(self.table_view)
+
+        copy_selected_act = QAction("Copy Selected", self)
+        copy_selected_act.setShortcut('Ctrl+C')
+        copy_selected_act.setStatusTip('Copy the selection to the clipboard.')
+        copy_selected_act.triggered.connect(self.copySelected)
+
+        copy_latex_act = QAction("Copy Selected as LaTeX", self)
+        copy_latex_act.setShortcut('Ctrl+L')
+        copy_latex_act.setStatusTip('Copy the selection as LaTeX code with the editor options.')
+        copy_latex_act.triggered.connect(self.latexCopy)
+
+        send_act = QAction("Send Selection to Grid", self)
+        send_act.setStatusTip('Load the selection into the editor grid.')
+        send_act.triggered.connect(self.sendToGrid)
+
+        close_act = QAction("Close", self)
+        close_act.triggered.connect(self.close)
+
+        file_menu = self.menuBar().addMenu('File')
+        file_menu.addAction(close_act)
+        edit_menu = self.menuBar().addMenu('Edit')
+        edit_menu.addAction(copy_selected_act)
+        edit_menu.addAction(copy_latex_act)
+        edit_menu.addAction(send_act)
+
+        self.statusBar().showMessage(str(datafile.rowCount()) + ' rows, ' +
+                                     str(datafile.columnCount()) + ' columns')
 
-        self.trim_act = QAction("Trim Cells", self)
-        self.trim_act.setStatusTip('Trim each of the cells.')
-        self.trim_act.triggered.connect(self.trim)
+    def selectedCellRanges(self):
+        """
+        Returns the row and column ranges of the selection, in the same form as
+        LTC_Table.selectedCellRanges.  Uses the selection ranges rather than the
+        selected indexes, which would enumerate every selected cell.
+        """
+        ranges = self.table_view.selectionModel().selection()
+        returnList = []
+        if len(ranges) > 0:
+            minrow = min(r.top() for r in ranges)
+            maxrow = max(r.bottom() for r in ranges)
+            mincol = min(r.left() for r in ranges)
+            maxcol = max(r.right() for r in ranges)
+            returnList.append([minrow, maxrow])
+            returnList.append([mincol, maxcol])
+        return returnList
 
-        self.fill_cells_act = QAction("Fill Cells with Text...", self)
-        self.fill_cells_act.setStatusTip('Fill each cell with the same value.')
-        self.fill_cells_act.triggered.connect(self.filltext)
+    def getSelectedTableContents(self):
+        """
+        Returns a list of row lists of the selected block.  Only the selected
+        rows are parsed.
+        """
+        rng = self.selectedCellRanges()
+        if len(rng) > 0:
+            return self.datafile.getRows(rng[0][0], rng[0][1], rng[1][0], rng[1][1])
+        return []
 
-        self.adjust_widths_act = QAction(QIcon(self.resource_path('icons/AdjCol.png')), "Adjust Column Widths", self)
-        self.adjust_widths_act.setStatusTip('Adjust the column widths to fit the contents.')
-        self.adjust_widths_act.triggered.connect(self.adjustWidths)
+    def copySelected(self):
+        items = self.getSelectedTableContents()
+        if len(items) > 0:
+            self.editor.clipboard.setText(LTCExporter().itemsToTabString(items))
 
-        self.adjust_heights_act = QAction(QIcon(self.resource_path('icons/AdjRow.png')), "Adjust Row Heights", self)
-        self.adjust_heights_act.setStatusTip('Adjust the row heights to fit the contents.')
-        self.adjust_heights_act.triggered.connect(self.adjustHeights)
+    def latexCopy(self):
+        items = self.getSelectedTableContents()
+        if len(items) > 0:
+            self.editor.clipboard.setText(self.editor.createLaTeXCode(items))
 
-        self.adjust_width_height_act = QAction(QIcon(self.resource_path('icons/AdjRowCol.png')), "Adjust Row and Column Sizes", self)
-        self.adjust_width_height_act.setShortcut('Ctrl+R')
-        self.adjust_width_height_act.setStatusTip('Adjust the row and column sizes to fit the contents.')
-        self.adjust_width_height_act.triggered.connect(self.adjustWidthHeight)
+    def sendToGrid(self):
+        items = self.getSelectedTableContents()
+        if len(items) > 0:
+            self.editor.loadTable(items)
+            self.editor.activateWindow()
 
-        # Create edit menu actions
-        self.copy_selected_act = QAction(QIcon(self.resource_path('icons/Cascade.png')), "Copy Selected", self)
-        self.copy_selected_act.setShortcut('Ctrl+C')
-        self.copy_selected_act.setStatusTip('Copy table selection to the clipboard.')
-        self.copy_selected_act.triggered.connect(self.copySelected)
+    def closeEvent(self, event):
+        self.table_view.setModel(None)
+        self.datafile.close()
+        if self in self.editor.programList:
+            self.editor.programList.remove(self)
+        super().closeEvent(event)
 
-        self.copy_all_act = QAction(QIcon(self.resource_path('icons/copy.png')), "Copy All", self)
-        self.copy_all_act.setShortcut('Shift+Ctrl+C')
-        self.copy_all_act.setStatusTip('Copy entire table to the clipboard.')
-        self.copy_all_act.triggered.connect(self.copyAll)
 
-        self.paste_act = QAction(QIcon(self.resource_path('icons/paste.png')), "Paste", self)
-        self.paste_act.setShortcut('Ctrl+V')
-        self.paste_act.setStatusTip('Paste clipboard to table.')
-        self.paste_act.triggered.connect(self.paste)
+class LTCTabbingWidths:
+    """
+    Estimates the typeset width of table items in Computer Modern Roman at
+    10pt, the LaTeX default font, from the character widths of cmr10.  Latin
+    Modern has the same metrics.  Control words such as \\alpha count as one
+    average character and braces and dollar signs are not counted.  Widths of
+    items are cached, so repeated items are only measured once, and the cache
+    is cleared when it reaches widthCacheLimit items.
+    """
 
-        self.copy_latex_act = QAction(QIcon(self.resource_path('icons/latexicon2.png')), "Copy as LaTeX", self)
-        self.copy_latex_act.setShortcut('Ctrl+L')
-        self.copy_latex_act.setStatusTip('Copy table to LaTeX code with selected options.')
-        self.copy_latex_act.triggered.connect(self.latexCopy)
+    # Character widths of cmr10 in points.
+    characterWidths = {' ': 3.333, '!': 2.778, '"': 5.0, '#': 8.333, '%': 8.333, '&': 7.778, "'": 2.778,
+                       '(': 3.889, ')': 3.889, '*': 5.0, '+': 7.778, ',': 2.778, '-': 3.333, '.': 2.778,
+                       '/': 5.0, ':': 2.778, ';': 2.778, '<': 7.778, '=': 7.778, '>': 7.778, '?': 4.722,
+                       '@': 7.778, '[': 2.778, ']': 2.778, '^': 5.0, '_': 5.0, '`': 2.778, '|': 2.778,
+                       '~': 5.0,
+                       'A': 7.5, 'B': 7.083, 'C': 7.222, 'D': 7.639, 'E': 6.806, 'F': 6.528, 'G': 7.847,
+                       'H': 7.5, 'I': 3.611, 'J': 5.139, 'K': 7.778, 'L': 6.25, 'M': 9.167, 'N': 7.5,
+                       'O': 7.778, 'P': 6.806, 'Q': 7.778, 'R': 7.361, 'S': 5.556, 'T': 7.222, 'U': 7.5,
+                       'V': 7.5, 'W': 10.278, 'X': 7.5, 'Y': 7.5, 'Z': 6.111,
+                       'a': 5.0, 'b': 5.556, 'c': 4.444, 'd': 5.556, 'e': 4.444, 'f': 3.056, 'g': 5.0,
+                       'h': 5.556, 'i': 2.778, 'j': 3.056, 'k': 5.278, 'l': 2.778, 'm': 8.333, 'n': 5.556,
+                       'o': 5.0, 'p': 5.556, 'q': 5.278, 'r': 3.917, 's': 3.944, 't': 3.889, 'u': 5.556,
+                       'v': 5.278, 'w': 7.222, 'x': 5.278, 'y': 5.278, 'z': 4.444}
+    characterWidths.update({digit: 5.0 for digit in '0123456789'})
+    defaultWidth = 5.0
+    ignoredCharacters = '{}$'
+    commandPattern = re.compile(r'\\[A-Za-z]+ ?|\\.')
+    widthCache = {}
+    widthCacheLimit = 100000
+
+    @classmethod
+    def textWidth(cls, text):
+        """
+        Returns the estimated width of the text in points.
+        """
+        width = cls.widthCache.get(text)
+        if width is None:
+            widths = cls.characterWidths
+            plain = cls.commandPattern.sub('m', text) if '\\' in text else text
+            width = sum(widths.get(c, cls.defaultWidth) for c in plain if c not in cls.ignoredCharacters)
+            if len(cls.widthCache) >= cls.widthCacheLimit:
+                cls.widthCache.clear()
+            cls.widthCache[text] = width
+        return width
+
+    @classmethod
+    def columnWidths(cls, textable, gap=10.0):
+        """
+        Returns the width of each column in points, the widest item plus the
+        gap, in one pass over each column.
+        """
+        cols = len(textable[0]) if len(textable) > 0 else 0
+        widths = []
+        for j in range(cols):
+            widest = max(cls.textWidth(row[j]) for row in textable)
+            widths.append(round(widest + gap, 1))
+        return widths
 
-        self.paste_from_latex_act = QAction("Paste from LaTeX", self)
-        self.paste_from_latex_act.setShortcut('Shift+Ctrl+L')
-        self.paste_from_latex_act.setStatusTip('Paste from LaTeX code to table.')
-        self.paste_from_latex_act.triggered.connect(self.pasteLatex)
 
-        self.copy_maxima_act = QAction(QIcon(self.resource_path('icons/wxmaximaicon002.png')),"Copy as Maxima", self)
-        self.copy_maxima_act.setStatusTip('Copy matrix to Maxima code.')
-        self.copy_maxima_act.triggered.connect(self.copyMaxima)
+class LTCEscaper:
+    """
+    Escapes the LaTeX special characters of text mode cells in one pass per
+    cell, using a translation table made once.  Cells that are already math,
+    written as $...$, \\(...\\) or \\[...\\], are left unchanged.
+    """
 
-        self.copy_sage_act = QAction(QIcon(self.resource_path('icons/sagemath.png')),"Copy as SageMath", self)
-        self.copy_sage_act.setStatusTip('Copy matrix to SageMath code.')
-        self.copy_sage_act.triggered.connect(self.copySage)
+    escapeTable = str.maketrans({'\\': '\\textbackslash{}', '&': '\\&', '%': '\\%', '$': '\\$', '#': '\\#',
+                                 '_': '\\_', '{': '\\{', '}': '\\}', '~': '\\textasciitilde{}',
+                                 '^': '\\textasciicircum{}'})
+    mathDelimiters = (('$', '$'), ('\\(', '\\)'), ('\\[', '\\]'))
+
+    @classmethod
+    def isMath(cls, text):
+        text = text.strip()
+        for left, right in cls.mathDelimiters:
+            if len(text) >= len(left) + len(right) and text.startswith(left) and text.endswith(right):
+                return True
+        return False
+
+    @classmethod
+    def escape(cls, text):
+        if cls.isMath(text):
+            return text
+        return text.translate(cls.escapeTable)
+
+    @staticmethod
+    def parseColumns(spec):
+        """
+        Converts a column list such as "1, 3-5" to a set of zero based column
+        indices.  An empty list means all columns and gives None, parts that
+        are not numbers or ranges are ignored.
+        """
+        columns = set()
+        for part in spec.split(','):
+            bounds = part.split('-')
+            try:
+                if len(bounds) == 1 and bounds[0].strip() != '':
+                    columns.add(int(bounds[0]) - 1)
+                elif len(bounds) == 2:
+                    columns.update(range(int(bounds[0]) - 1, int(bounds[1])))
+            except ValueError:
+                pass
+        if len(columns) == 0 and spec.strip() == '':
+            return None
+        return columns
+
+
+class LTCUnicodeTable(dict):
+    """
+    Translation table from code points to LaTeX for str.translate.  Code
+    points that are not in the table are converted by the fallback function
+    when first seen and the result is kept, so each character is looked up
+    only once.
+    """
 
-        self.copy_geogebra_act = QAction(QIcon(self.resource_path('icons/Geogebra002.png')),"Copy as GeoGebra", self)
-        self.copy_geogebra_act.setStatusTip('Copy matrix to Mathematica code.')
-        self.copy_geogebra_act.triggered.connect(self.copyGeoGebra)
+    def __init__(self, entries, fallback):
+        super().__init__(entries)
+        self.fallback = fallback
 
-        self.copy_bracket_act = QAction("Copy [...] Delimited", self)
-        self.copy_bracket_act.setStatusTip('Copy matrix in [...] delimited form.')
-        self.copy_bracket_act.triggered.connect(self.copyBracket)
+    def __missing__(self, code):
+        value = self.fallback(chr(code))
+        self[code] = value
+        return value
 
-        self.copy_curleybracket_act = QAction("Copy {...} Delimited", self)
-        self.copy_curleybracket_act.setStatusTip('Copy matrix in {...} delimited form.')
-        self.copy_curleybracket_act.triggered.connect(self.copyGeoGebra)
 
-        self.copy_angle_bracket_act = QAction("Copy <...> Delimited", self)
-        self.copy_angle_bracket_act.setStatusTip('Copy matrix in <...> delimited form.')
-        self.copy_angle_bracket_act.triggered.connect(self.copyAngleBracket)
+class LTCUnicodeConverter:
+    """
+    Converts Unicode characters to LaTeX macros that work under pdflatex
+    without extra packages, for example α to \\alpha and ≤ to \\leq.  There is
+    one table for math and one for text; in text, math symbols are written
+    as $\\alpha$ and in math, text characters are put in an \\mbox.  Accented
+    letters that are not in the tables are decomposed (NFD) into a letter and
+    combining accents.  Pure ASCII text is returned right away.
+    """
 
-        self.copy_html_act = QAction("Copy as HTML", self)
-        self.copy_html_act.setStatusTip('Copy table to HTML.')
-        self.copy_html_act.triggered.connect(self.copyHTML)
+    mathSymbols = {
+        'α': r'\alpha', 'β': r'\beta', 'γ': r'\gamma', 'δ': r'\delta', 'ε': r'\varepsilon', 'ϵ': r'\epsilon',
+        'ζ': r'\zeta', 'η': r'\eta', 'θ': r'\theta', 'ϑ': r'\vartheta', 'ι': r'\iota', 'κ': r'\kappa',
+        'λ': r'\lambda', 'μ': r'\mu', 'µ': r'\mu', 'ν': r'\nu', 'ξ': r'\xi', 'π': r'\pi', 'ϖ': r'\varpi',
+        'ρ': r'\rho', 'ϱ': r'\varrho', 'σ': r'\sigma', 'ς': r'\varsigma', 'τ': r'\tau', 'υ': r'\upsilon',
+        'φ': r'\varphi', 'ϕ': r'\phi', 'χ': r'\chi', 'ψ': r'\psi', 'ω': r'\omega',
+        'Γ': r'\Gamma', 'Δ': r'\Delta', 'Θ': r'\Theta', 'Λ': r'\Lambda', 'Ξ': r'\Xi', 'Π': r'\Pi',
+        'Σ': r'\Sigma', 'Υ': r'\Upsilon', 'Φ': r'\Phi', 'Ψ': r'\Psi', 'Ω': r'\Omega', 'Ω': r'\Omega',
+        '≤': r'\leq', '≥': r'\geq', '≠': r'\neq', '±': r'\pm', '∓': r'\mp', '×': r'\times', '÷': r'\div',
+        '·': r'\cdot', '⋅': r'\cdot', '√': r'\surd', '∞': r'\infty', '≈': r'\approx', '≡': r'\equiv',
+        '∼': r'\sim', '≅': r'\cong', '∝': r'\propto', '≪': r'\ll', '≫': r'\gg', '∈': r'\in',
+        '∉': r'\notin', '∋': r'\ni', '⊂': r'\subset', '⊆': r'\subseteq', '⊃': r'\supset',
+        '⊇': r'\supseteq', '∪': r'\cup', '∩': r'\cap', '∖': r'\setminus', '∅': r'\emptyset',
+        '∀': r'\forall', '∃': r'\exists', '¬': r'\neg', '∧': r'\wedge', '∨': r'\vee', '⊕': r'\oplus',
+        '⊗': r'\otimes', '∂': r'\partial', '∇': r'\nabla', '∑': r'\sum', '∏': r'\prod', '∫': r'\int',
+        '∮': r'\oint', '→': r'\to', '←': r'\leftarrow', '↔': r'\leftrightarrow', '⇒': r'\Rightarrow',
+        '⇐': r'\Leftarrow', '⇔': r'\Leftrightarrow', '↦': r'\mapsto', '↑': r'\uparrow',
+        '↓': r'\downarrow', '∘': r'\circ', '°': r'^\circ', '′': r'\prime', '″': r'\prime\prime',
+        '∗': r'\ast', '⊥': r'\perp', '∥': r'\parallel', '∣': r'\mid', 'ℓ': r'\ell', 'ℏ': r'\hbar',
+        '℘': r'\wp', 'ℜ': r'\Re', 'ℑ': r'\Im', 'ℵ': r'\aleph', '⟨': r'\langle', '⟩': r'\rangle',
+        '⌊': r'\lfloor', '⌋': r'\rfloor', '⌈': r'\lceil', '⌉': r'\rceil', '−': '-', '¹': '^{1}',
+        '²': '^{2}', '³': '^{3}', '¼': r'\frac{1}{4}', '½': r'\frac{1}{2}', '¾': r'\frac{3}{4}'}
+
+    textSymbols = {
+        '“': '``', '”': "''", '‘': '`', '’': "'", '„': ',,', '‚': ',', '–': '--', '—': '---',
+        '…': r'\ldots', ' ': '~', '§': r'\S', '¶': r'\P', '©': r'\copyright',
+        '®': r'\textregistered', '™': r'\texttrademark', '€': r'\texteuro', '£': r'\pounds',
+        '†': r'\dag', '‡': r'\ddag', '•': r'\textbullet', 'ß': r'\ss', 'æ': r'\ae', 'Æ': r'\AE',
+        'œ': r'\oe', 'Œ': r'\OE', 'ø': r'\o', 'Ø': r'\O', 'å': r'\aa', 'Å': r'\AA', 'ł': r'\l',
+        'Ł': r'\L', 'ı': r'\i', '¿': '?`', '¡': '!`'}
+
+    # Combining accents as (text accent, math accent), None if there is no
+    # math accent.
+    accents = {'̀': ('\\`', r'\grave'), '́': ("\\'", r'\acute'), '̂': ('\\^', r'\hat'),
+               '̃': ('\\~', r'\tilde'), '̄': ('\\=', r'\bar'), '̆': (r'\u', r'\breve'),
+               '̇': ('\\.', r'\dot'), '̈': ('\\"', r'\ddot'), '̊': (r'\r', r'\mathring'),
+               '̋': (r'\H', None), '̌': (r'\v', r'\check'), '̧': (r'\c', None),
+               '̨': (r'\k', None)}
+
+    @staticmethod
+    def terminate(macro, end):
+        """
+        Ends a macro that ends in a letter, so a following letter is not read
+        as part of its name.
+        """
+        return macro + end if macro[-1].isalpha() else macro
+
+    @classmethod
+    def decompose(cls, character, math):
+        """
+        Converts an accented letter through its NFD decomposition, characters
+        that cannot be converted are returned unchanged.
+        """
+        decomposed = unicodedata.normalize('NFD', character)
+        base = decomposed[0]
+        if len(decomposed) < 2 or not base.isascii():
+            return character
+        code = base
+        for mark in decomposed[1:]:
+            if mark not in cls.accents:
+                return character
+            textAccent, mathAccent = cls.accents[mark]
+            if math:
+                if mathAccent is None:
+                    return '\\mbox{' + cls.decompose(character, False) + '}'
+                code = mathAccent + '{' + code + '}'
+            else:
+                code = textAccent + '{' + code + '}'
+        return code
+
+    @classmethod
+    def makeTable(cls, math):
+        entries = {}
+        for character, macro in cls.mathSymbols.items():
+            entries[ord(character)] = cls.terminate(macro, ' ') if math else '$' + macro + '$'
+        for character, macro in cls.textSymbols.items():
+            text = cls.terminate(macro, '{}')
+            entries[ord(character)] = '\\mbox{' + text + '}' if math else text
+        return LTCUnicodeTable(entries, lambda character: cls.decompose(character, math))
+
+    @classmethod
+    def convert(cls, text, math=False):
+        """
+        Converts the text for math or text mode.  In text mode a cell that is
+        already math, such as $...$, is converted for math.
+        """
+        if text.isascii():
+            return text
+        if not math and LTCEscaper.isMath(text):
+            math = True
+        return text.translate(cls.mathTable if math else cls.textTable)
+
+    @classmethod
+    def convertMath(cls, text):
+        return cls.convert(text, True)
+
+    @classmethod
+    def convertItems(cls, items, math=False, task=None):
+        """
+        Returns the list of row lists with each item converted.
+        """
+        tablelist = []
+        for i, row in enumerate(items):
+            if task is not None and i % 256 == 0:
+                task.setProgress(i, len(items))
+            tablelist.append([cls.convert(item, math) for item in row])
+        return tablelist
 
-        self.select_all_act = QAction("Select All", self)
-        self.select_all_act.setShortcut('Ctrl+A')
-        self.select_all_act.setStatusTip('Select all cells.')
-        self.select_all_act.triggered.connect(self.selectall)
 
-        self.Undo_act = QAction(QIcon(self.resource_path('icons/Undo.png')), "Undo", self)
-        self.Undo_act.setShortcut('Ctrl+Z')
-        self.Undo_act.setStatusTip('Undo the last edit.')
-        self.Undo_act.triggered.connect(self.undo)
+LTCUnicodeConverter.textTable = LTCUnicodeConverter.makeTable(False)
+LTCUnicodeConverter.mathTable = LTCUnicodeConverter.makeTable(True)
 
-        self.Redo_act = QAction(QIcon(self.resource_path('icons/Redo.png')), "Redo", self)
-        self.Redo_act.setShortcut('Shift+Ctrl+Z')
-        self.Redo_act.setStatusTip('Redo the last edit.')
-        self.Redo_act.triggered.connect(self.redo)
 
-        self.view_increase_font_size_act = QAction(QIcon(self.resource_path('icons/zoomin.png')), "Increase Font Size", self)
-        self.view_increase_font_size_act.setStatusTip('Increase the font size in the workspace.')
-        self.view_increase_font_size_act.triggered.connect(self.increaseWorksheetFontSize)
+class LTCConditionalFormats:
+    """
+    Conditional format rules from the Conditional Formats option, written as
+    rules separated by semicolons such as "max in 2-4: bold; < 0:
+    cell=red!20; /^n\\/a$/: italic color=gray".  Each rule is a condition, the
+    columns it applies to, all columns if left out, and the formats.  The
+    conditions are the column maximum or minimum, a comparison with a number
+    and a regular expression search.  The formats are bold, italic,
+    underline, a text color and a cell color.
+
+    Each rule is evaluated over a whole column at once, with NumPy when it is
+    installed.  The numbers of a column and the rows each rule matches are
+    cached by the column revision, so an export only evaluates the columns
+    that changed.  The stored cell text is never changed.
+    """
 
-        self.view_decrease_font_size_act = QAction(QIcon(self.resource_path('icons/zoomout.png')), "Decrease Font Size", self)
-        self.view_decrease_font_size_act.setStatusTip('Decrease the font size in the workspace.')
-        self.view_decrease_font_size_act.triggered.connect(self.decreaseWorksheetFontSize)
+    rulePattern = re.compile(r'\s*(?:(max|min)|(<=|>=|<|>|=)\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)'
+                             r'|/((?:[^/\\]|\\.)*)/)\s*(?:in\s+([\d,\s-]*?))?\s*:([^;]*)(?:;|$)', re.IGNORECASE)
+    colorPattern = re.compile(r'[A-Za-z][A-Za-z0-9!.]*$')
+    comparisons = {'<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge, '=': operator.eq}
+    parseCache = {}
+    cache = {}
+    cacheLimit = 2000
+
+    def __init__(self, rules):
+        self.rules = rules
+
+    def __len__(self):
+        return len(self.rules)
+
+    @classmethod
+    def parse(cls, text):
+        """
+        Returns the rules written in the text.  Rules that can not be read are
+        left out, as are unknown formats.
+        """
+        formats = cls.parseCache.get(text)
+        if formats is not None:
+            return formats
+
+        rules = []
+        pos = 0
+        while pos < len(text):
+            match = cls.rulePattern.match(text, pos)
+            if match is None:
+                end = text.find(';', pos)
+                pos = len(text) if end < 0 else end + 1
+                continue
+            pos = match.end()
+
+            extreme, comparison, number, pattern, columns, formatList = match.groups()
+            if extreme is not None:
+                condition = (extreme.lower(), None)
+            elif comparison is not None:
+                condition = (comparison, float(number))
+            else:
+                try:
+                    re.compile(pattern)
+                except re.error:
+                    continue
+                condition = ('regex', pattern)
+
+            setMask = 0
+            clearMask = 0
+            cellColor = None
+            for word in formatList.split():
+                name, sep, value = word.partition('=')
+                name = name.lower()
+                if name in ('bold', 'italic', 'underline') and sep == '':
+                    setMask |= getattr(LTCCellStyles, name)
+                elif name == 'color':
+                    numbers = [k for k, color in enumerate(LTCCellStyles.colors) if color[0] == value.lower()]
+                    if len(numbers) > 0:
+                        setMask = (setMask & ~LTCCellStyles.colorMask) | (numbers[0] << LTCCellStyles.colorShift)
+                        clearMask |= LTCCellStyles.colorMask
+                elif name == 'cell' and cls.colorPattern.match(value):
+                    cellColor = value
+            if setMask == 0 and clearMask == 0 and cellColor is None:
+                continue
+
+            columnSet = None
+            if columns is not None and columns.strip() != '':
+                columnSet = frozenset(LTCEscaper.parseColumns(columns))
+            rules.append((condition, columnSet, setMask, clearMask, cellColor))
+
+        if len(cls.parseCache) > 100:
+            cls.parseCache.clear()
+        formats = cls(rules)
+        cls.parseCache[text] = formats
+        return formats
+
+    @staticmethod
+    def toNumber(text):
+        """
+        Returns the item as a float, NaN if it is not a number.  Math mode
+        dollars and thousands separators are allowed.
+        """
+        text = text.strip()
+        if len(text) > 1 and text[0] == '$' and text[-1] == '$':
+            text = text[1:-1].strip()
+        if LTCColumnStatistics.numberPattern.match(text) is None:
+            return math.nan
+        return float(text.replace(',', ''))
+
+    @classmethod
+    def cached(cls, key, function, *args):
+        """
+        Returns the cached result for the key, or computes and keeps it.
+        Nothing is cached without a key.
+        """
+        if key is None:
+            return function(*args)
+        result = cls.cache.get(key)
+        if result is None:
+            if len(cls.cache) > cls.cacheLimit:
+                cls.cache.clear()
+            result = function(*args)
+            cls.cache[key] = result
+        return result
+
+    @classmethod
+    def columnValues(cls, column):
+        """
+        Returns the numbers of a column, as an array when NumPy is installed.
+        """
+        values = [cls.toNumber(text) for text in column]
+        if numpy is not None:
+            return numpy.array(values, dtype=float)
+        return values
+
+    @classmethod
+    def matchRows(cls, condition, column, values):
+        """
+        Returns the rows of the column that meet the condition.  Values are the
+        numbers of the column, a function returning them, as they are only
+        needed for numeric conditions.
+        """
+        kind, argument = condition
+        if kind == 'regex':
+            search = re.compile(argument).search
+            return [i for i, text in enumerate(column) if search(text)]
+
+        values = values()
+        if numpy is not None:
+            if kind in ('max', 'min'):
+                numbers = values[~numpy.isnan(values)]
+                if len(numbers) == 0:
+                    return []
+                argument = numbers.max() if kind == 'max' else numbers.min()
+                hits = values == argument
+            else:
+                hits = cls.comparisons[kind](values, argument)
+            return numpy.flatnonzero(hits).tolist()
+
+        if kind in ('max', 'min'):
+            numbers = [value for value in values if value == value]
+            if len(numbers) == 0:
+                return []
+            argument = max(numbers) if kind == 'max' else min(numbers)
+            kind = '='
+        compare = cls.comparisons[kind]
+        return [i for i, value in enumerate(values) if compare(value, argument)]
+
+    def apply(self, items, styles, revisions=None, task=None):
+        """
+        Returns the cell styles with the rule formats added and a dictionary
+        from each row to a dictionary from column to cell color.  Later rules
+        win where rules set the same format.  Revisions are the column
+        revisions of the items, results are only cached if they are given.
+        """
+        rows = len(items)
+        cols = len(items[0]) if rows > 0 else 0
+        marks = []
+        cellColors = {}
+        for j in range(cols):
+            if task is not None:
+                task.setProgress(j, cols)
+            rules = [rule for rule in self.rules if rule[1] is None or j in rule[1]]
+            if len(rules) == 0:
+                continue
+
+            column = [row[j] for row in items]
+            revision = revisions[j] if revisions is not None and j < len(revisions) else None
+            valuesKey = None if revision is None else ('values', revision)
+
+            def values():
+                return self.cached(valuesKey, self.columnValues, column)
+
+            for condition, columnSet, setMask, clearMask, cellColor in rules:
+                key = None if revision is None else (revision, condition)
+                for i in self.cached(key, self.matchRows, condition, column, values):
+                    if setMask != 0 or clearMask != 0:
+                        marks.append((i, j, setMask, clearMask))
+                    if cellColor is not None:
+                        cellColors.setdefault(i, {})[j] = cellColor
+        return styles.applyMarks(marks, cols), cellColors
+
+
+class LTCNumberFormats:
+    """
+    Per column number formats from the Number Formats option, written as
+    formats separated by semicolons such as "2-4: ,.2f S; 5: .3e split".
+    Each is the columns, all columns if left out, a Python format
+    specification for floats and a decimal alignment, S for a siunitx S
+    column or split for an r@{.}l column pair.  Later formats win for a
+    column.  Items that are not numbers are left unchanged.
+
+    The numbers of a column are read once and shared with the conditional
+    formats cache, and the formatted columns are cached by the column
+    revision and format.  Fixed and scientific formats without thousands
+    separators are written with NumPy when it is installed.
+    """
 
-        self.view_reset_font_size_act = QAction(QIcon(self.resource_path('icons/Tile.png')), "Reset Font Size", self)
-        self.view_reset_font_size_act.setStatusTip('Reset the font size in the workspace to the defaults.')
-        self.view_reset_font_size_act.triggered.connect(self.resetWorksheetFontSize)
+    specPattern = re.compile(r'([,_]?)(?:\.(\d{1,2}))?([feEg%]?)$')
+    alignments = {'s': 'S', 'siunitx': 'S', 'split': 'split'}
+    parseCache = {}
+
+    def __init__(self, formats):
+        self.formats = formats
+
+    def __len__(self):
+        return len(self.formats)
+
+    @classmethod
+    def parse(cls, text):
+        """
+        Returns the formats written in the text, parts that can not be read
+        are left out.
+        """
+        numberFormats = cls.parseCache.get(text)
+        if numberFormats is not None:
+            return numberFormats
+
+        formats = []
+        for part in text.split(';'):
+            columns, sep, words = part.rpartition(':')
+            spec = ''
+            alignment = ''
+            for word in words.split():
+                match = cls.specPattern.match(word)
+                if word.lower() in cls.alignments:
+                    alignment = cls.alignments[word.lower()]
+                elif match is not None:
+                    grouping, places, kind = match.groups()
+                    if places is not None and kind == '':
+                        kind = 'f'
+                    spec = grouping + ('' if places is None else '.' + places) + kind
+            if spec == '' and alignment == '':
+                continue
+            columnSet = None
+            if columns.strip() != '':
+                columnSet = frozenset(LTCEscaper.parseColumns(columns))
+            formats.append((columnSet, spec, alignment))
+
+        if len(cls.parseCache) > 100:
+            cls.parseCache.clear()
+        numberFormats = cls(formats)
+        cls.parseCache[text] = numberFormats
+        return numberFormats
+
+    @staticmethod
+    def formatColumn(column, spec, values):
+        """
+        Returns the column with its finite numbers written in the format, the
+        other items, including numbers too large for a float, are unchanged.
+        """
+        kind = spec[-1:]
+        if numpy is not None and kind in ('f', 'e', 'E', 'g') and spec[0] not in ',_':
+            finite = numpy.isfinite(values).tolist()
+            texts = numpy.char.mod('%' + spec, values).tolist()
+            return [text if number else item for text, number, item in zip(texts, finite, column)]
+        isfinite = math.isfinite
+        return [format(value, spec) if isfinite(value) else item for value, item in zip(values, column)]
+
+    def apply(self, items, revisions=None, task=None):
+        """
+        Returns the items with the numbers formatted and the decimal alignment
+        of each column, '' for none.  Results are only cached if the column
+        revisions of the items are given.
+        """
+        rows = len(items)
+        cols = len(items[0]) if rows > 0 else 0
+        specs = [''] * cols
+        alignments = [''] * cols
+        for columnSet, spec, alignment in self.formats:
+            for j in range(cols):
+                if columnSet is None or j in columnSet:
+                    if spec != '':
+                        specs[j] = spec
+                    if alignment != '':
+                        alignments[j] = alignment
 
-        self.SelectTheme_act = QAction("Select Theme...", self)
-        self.SelectTheme_act.triggered.connect(self.SelectTheme)
-        self.SelectTheme_act.setStatusTip('Select from the current supported system themes.')
+        formatted = {}
+        for j in range(cols):
+            spec = specs[j]
+            if spec == '':
+                continue
+            # siunitx reads a comma as a decimal mark and groups the digits itself.
+            if alignments[j] == 'S':
+                spec = spec.lstrip(',_')
+            if task is not None:
+                task.setProgress(j, cols)
+
+            column = [row[j] for row in items]
+            revision = revisions[j] if revisions is not None and j < len(revisions) else None
+            values = LTCConditionalFormats.cached(None if revision is None else ('values', revision),
+                                                  LTCConditionalFormats.columnValues, column)
+            formatted[j] = LTCConditionalFormats.cached(None if revision is None else ('format', revision, spec),
+                                                        self.formatColumn, column, spec, values)
+
+        if len(formatted) > 0:
+            items = [list(row) for row in items]
+            for j, column in formatted.items():
+                for i in range(rows):
+                    items[i][j] = column[i]
+        return items, alignments
+
+
+class LTCExporter:
+    """
+    Converts a list of row lists of table items to LaTeX and the other export
+    formats.  Only the items and the options dictionary are used, so exports
+    can run on a worker thread.  If a task is given, progress is reported to
+    it and the export stops when the task is cancelled.
+    """
 
-        # Create help menu actions
-        self.help_about_act = QAction(QIcon(self.resource_path('icons/About.png')), "About...", self)
-        self.help_about_act.setStatusTip('About the LaTeX Table Creator')
-        self.help_about_act.triggered.connect(self.aboutDialog)
+    def __init__(self, task=None, fragments=None):
+        self.task = task
+        self.fragments = fragments
 
-        self.help_help_act = QAction(QIcon(self.resource_path('icons/Help2.png')), "Help...", self)
-        self.help_help_act.setStatusTip('Help with ' + self.program_title + " Version " + self.version + "...")
-        self.help_help_act.triggered.connect(self.onHelp)
+    def rowProgress(self, row, rows):
+        """
+        Reports progress to the task every 256 rows.
+        """
+        if self.task is not None and row % 256 == 0:
+            self.task.setProgress(row, rows)
 
-        # Create the menu bar
-        menu_bar = self.menuBar()
-        menu_bar.setNativeMenuBar(False)
+    def cachedRow(self, key):
+        """
+        Returns the code of a row made earlier with the same key, or None.
+        Rows are only reused when a fragments dictionary was given.
+        """
+        if self.fragments is None:
+            return None
+        return self.fragments.get(key)
 
-        # Create file menu and add actions
-        file_menu = menu_bar.addMenu('File')
-        file_menu.addAction(self.file_new_act)
-        file_menu.addAction(self.file_open_act)
-        file_menu.addSeparator()
-        file_menu.addAction(self.file_saveas_act)
-        file_menu.addSeparator()
-        file_menu.addAction(quit_act)
+    def storeRow(self, key, rowCode):
+        """
+        Keeps the code of a row for later exports with the same fragments.
+        """
+        if self.fragments is not None:
+            self.fragments[key] = rowCode
 
-        # Create Edit menu and add actions
-        edit_menu = menu_bar.addMenu('Edit')
-        edit_menu.addAction(self.copy_selected_act)
-        edit_menu.addAction(self.copy_all_act)
-        edit_menu.addAction(self.select_all_act)
-        edit_menu.addAction(self.paste_act)
-        edit_menu.addSeparator()
-        edit_menu.addAction(self.copy_latex_act)
-        edit_menu.addAction(self.paste_from_latex_act)
-        edit_menu.addSeparator()
-        edit_menu.addAction(self.copy_geogebra_act)
-        edit_menu.addAction(self.copy_maxima_act)
-        edit_menu.addAction(self.copy_sage_act)
-        edit_menu.addSeparator()
-        edit_menu.addAction(self.copy_bracket_act)
-        edit_menu.addAction(self.copy_curleybracket_act)
-        edit_menu.addAction(self.copy_angle_bracket_act)
-        edit_menu.addAction(self.copy_html_act)
-        edit_menu.addSeparator()
-        edit_menu.addAction(self.SelectTheme_act)
-        edit_menu.addSeparator()
-        edit_menu.addAction(self.Undo_act)
-        edit_menu.addAction(self.Redo_act)
-
-        # Create table menu and add actions
-        table_menu = menu_bar.addMenu('Table')
-        table_menu.addAction(self.add_row_above_act)
-        table_menu.addAction(self.add_row_below_act)
-        table_menu.addSeparator()
-        table_menu.addAction(self.add_col_before_act)
-        table_menu.addAction(self.add_col_after_act)
-        table_menu.addSeparator()
-        table_menu.addAction(self.delete_row_act)
-        table_menu.addAction(self.delete_col_act)
-        table_menu.addAction(self.delete_row_col_act)
-        table_menu.addSeparator()
-        table_menu.addAction(self.transpose_act)
-        table_menu.addAction(self.trim_act)
-        table_menu.addAction(self.fill_cells_act)
-        table_menu.addSeparator()
-        table_menu.addAction(self.clear_table_act)
-
-        view_menu = menu_bar.addMenu('View')
-        view_menu.addAction(self.adjust_widths_act)
-        view_menu.addAction(self.adjust_heights_act)
-        view_menu.addAction(self.adjust_width_height_act)
-        view_menu.addSeparator()
-        view_menu.addAction(self.view_increase_font_size_act)
-        view_menu.addAction(self.view_decrease_font_size_act)
-        view_menu.addAction(self.view_reset_font_size_act)
-
-        # Create help menu and add actions
-        help_menu = menu_bar.addMenu('Help')
-        help_menu.addAction(self.help_help_act)
-        help_menu.addAction(self.help_about_act)
-
-    def createToolBar(self):
+    def cellStages(self, options):
         """
-        Create toolbar for GUI
+        Returns the stages applied to the cell text before the LaTeX code is
+        made, as (function, columns) pairs.  Columns is a set of column indices
+        or None for all columns.
         """
-        # Set up toolbar
-        tool_bar = QToolBar("Main Toolbar")
-        tool_bar.setIconSize(QSize(18, 18))
-        tool_bar.setMovable(False)
-        self.addToolBar(tool_bar)
-
-        # Add actions to toolbar
-        tool_bar.addAction(self.file_new_act)
-        tool_bar.addAction(self.file_open_act)
-        tool_bar.addAction(self.file_saveas_act)
-        tool_bar.addSeparator()
-        tool_bar.addAction(self.copy_selected_act)
-        tool_bar.addAction(self.copy_all_act)
-        tool_bar.addAction(self.paste_act)
-        tool_bar.addSeparator()
-        tool_bar.addAction(self.copy_latex_act)
-        tool_bar.addSeparator()
-        tool_bar.addAction(self.adjust_widths_act)
-        tool_bar.addAction(self.adjust_heights_act)
-        tool_bar.addAction(self.adjust_width_height_act)
-        tool_bar.addSeparator()
-        tool_bar.addAction(self.view_increase_font_size_act)
-        tool_bar.addAction(self.view_decrease_font_size_act)
-        tool_bar.addAction(self.view_reset_font_size_act)
-        tool_bar.addSeparator()
-        tool_bar.addAction(self.Undo_act)
-        tool_bar.addAction(self.Redo_act)
-        tool_bar.addSeparator()
-        tool_bar.addAction(self.help_help_act)
-        tool_bar.addAction(self.help_about_act)
-
-    def increaseWorksheetFontSize(self):
-        self.table_widget.increaseFontSize()
-
-    def decreaseWorksheetFontSize(self):
-        self.table_widget.decreaseFontSize()
+        stages = []
+        textMode = options['Grid Type'] in ('longtable', 'tabular', 'tabbing') and not options['Math Mode']
+        if textMode and options['Escape Special Characters']:
+            stages.append((LTCEscaper.escape, LTCEscaper.parseColumns(options['Escape Columns'])))
 
-    def resetWorksheetFontSize(self):
-        self.table_widget.resetFontSize()
-
-    def SelectTheme(self):
-        items = QStyleFactory.keys()
-        if len(items) <= 1:
-            return
+        # Unicode is converted after escaping, so the macros it writes are not escaped.
+        if options['Convert Unicode']:
+            stages.append((LTCUnicodeConverter.convert if textMode else LTCUnicodeConverter.convertMath, None))
+        return stages
 
-        items.sort()
-        item, ok = QInputDialog.getItem(self, "Select Theme", "Available Themes", items, 0, False)
+    def applyCellStages(self, textable, options):
+        """
+        Runs the cell stages over the items, returns the items unchanged if
+        there are no stages.
+        """
+        stages = self.cellStages(options)
+        if len(stages) == 0:
+            return textable
 
-        if ok:
-            self.Parent.setStyle(item)
-            self.currentTheme = item
-            optlist = [self.currentTheme]
-            with open('LaTeXTableCreatorOptions.opt', 'wb') as f:
-                try:
-                    pickle.dump(optlist, f)
-                except:
-                    QMessageBox.warning(self, "File Not Saved", "The options file could not be saved.",
-                                        QMessageBox.Ok)
-            # self.saveOptions()
+        rows = len(textable)
+        cols = len(textable[0]) if rows > 0 else 0
+        stageColumns = [(function, [j for j in range(cols) if columns is None or j in columns])
+                        for function, columns in stages]
+        result = []
+        for i in range(rows):
+            self.rowProgress(i, rows)
+            row = list(textable[i])
+            for function, columns in stageColumns:
+                for j in columns:
+                    row[j] = function(row[j])
+            result.append(row)
+        return result
 
-    def createDockWidget(self):
+    def createHeaderLine(self, item, align, bold, italic, underline, divLeft, divRight, width=1, height=1,
+                         cellColor=None):
         """
-        Create dock widget which will hold the options panes.
+        Creates the LaTeX around an item if it is in the row or column header
+        area.  Used in conjunction with longtable and tabular environments.
+        Width and height are the size of a merged header cell.
         """
-        # Set up dock widget
-        self.dock_widget = QDockWidget()
-        self.dock_widget.setWindowTitle("LaTeX Options")
+        itemcode = item
 
-        # Set dock attributes
-        self.dock_widget.setAllowedAreas(Qt.LeftDockWidgetArea | Qt.RightDockWidgetArea)
+        if underline:
+            itemcode = '\\underline{' + itemcode + '}'
 
-        self.dock_widget.setFeatures(QDockWidget.DockWidgetFloatable |
-                                     QDockWidget.DockWidgetMovable)
-        self.options_pane = LTCOptionsEditorPane()
+        if italic:
+            itemcode = '\\textit{' + itemcode + '}'
 
-        # Create a scroll area for the options panels.
-        scroll_area = QScrollArea()
-        scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setWidget(self.options_pane)
+        if bold:
+            itemcode = '\\textbf{' + itemcode + '}'
 
-        # Add and place the dock.
-        self.dock_widget.setWidget(scroll_area)
-        self.addDockWidget(Qt.RightDockWidgetArea, self.dock_widget)
+        return self.createSpanLine(itemcode, align, divLeft, divRight, width, height, True, cellColor)
 
-    def aboutDialog(self):
-        """
-        Display information about program dialog box
-        """
-        QMessageBox.about(self, self.program_title + "  Version " + self.version,
-                          self.authors + "\nVersion " + self.version +
-                          "\nCopyright " + self.copyright +
-                          "\nDeveloped in Python using the PySide6 GUI toolset.\n" + self.licence)
+    @staticmethod
+    def isNumber(text):
+        return LTCColumnStatistics.numberPattern.match(text) is not None
 
-    def onHelp(self):
+    def styleItem(self, item, style, math=False):
         """
-        Display information about program dialog box
+        Wraps an item in the font and color commands of its cell style, the
+        math mode commands are used for math cells.
         """
-        self.url_home_string = "file://" + self.resource_path("Help/index.html")
-        webbrowser.open(self.url_home_string)
+        itemcode = item
 
-    def openFile(self):
-        """
-        Open a binary file containing a table item data and load it into the table.
-        """
-        file_name, _ = QFileDialog.getOpenFileName(self, "Open File",
-                                                   "", "Table Data Files (*.dat);;All Files (*.*)")
+        if style & LTCCellStyles.underline:
+            itemcode = '\\underline{' + itemcode + '}'
 
-        if file_name:
-            with open(file_name, 'rb') as f:
-                try:
-                    items = pickle.load(f)
-                    self.table_widget.setRowCount(1)
-                    self.table_widget.setColumnCount(1)
-                    self.table_widget.setCurrentCell(0, 0)
-                    self.table_widget.paste(items)
-                    self.setSizeSpinnersToTableSize()
-                except:
-                    QMessageBox.warning(self, "File Not Loaded", "The file " + file_name + " could not be loaded.",
-                                        QMessageBox.Ok)
+        if style & LTCCellStyles.italic:
+            itemcode = ('\\mathit{' if math else '\\textit{') + itemcode + '}'
 
-    def saveFile(self):
-        """
-        Save the table to a binary file.
-        """
-        dialog = QFileDialog()
-        dialog.setFilter(dialog.filter() | QDir.Hidden)
-        dialog.setDefaultSuffix('dat')
-        dialog.setAcceptMode(QFileDialog.AcceptSave)
-        dialog.setNameFilters(['Table Data Files (*.dat)'])
-        dialog.setWindowTitle('Save As')
+        if style & LTCCellStyles.bold:
+            itemcode = ('\\mathbf{' if math else '\\textbf{') + itemcode + '}'
 
-        if dialog.exec() == QDialog.Accepted:
-            filelist = dialog.selectedFiles()
-            if len(filelist) > 0:
-                file_name = filelist[0]
-                items = self.table_widget.getTableContents()
-                with open(file_name, 'wb') as f:
-                    try:
-                        pickle.dump(items, f)
-                    except:
-                        QMessageBox.warning(self, "File Not Saved", "The file " + file_name + " could not be saved.",
-                                            QMessageBox.Ok)
+        name, value = LTCCellStyles.color(style)
+        if name is not None:
+            itemcode = '\\textcolor{' + name + '}{' + itemcode + '}'
 
-    def createHeaderLine(self, item, align, bold, italic, underline, divLeft, divRight):
+        return itemcode
+
+    def createSpanLine(self, item, align, divLeft, divRight, width, height, multicolumn=False, cellColor=None):
         """
-        Creates the LaTeX around an item if it is in the row or column header
-        area.  Used in conjunction with longtable and tabular environments.
+        Creates the LaTeX for the first cell of a block of merged cells.  The
+        \\multirow is left out for a single row and the \\multicolumn for a
+        single column, unless it is asked for to set the alignment.  A cell
+        color goes outside the \\multirow, which can not hold it.
         """
         itemcode = item
 
-        if underline:
-            itemcode = '\\underline{' + itemcode + '}'
-
-        if italic:
-            itemcode = '\\textit{' + itemcode + '}'
+        if height > 1:
+            itemcode = '\\multirow{' + str(height) + '}{*}{' + itemcode + '}'
 
-        if bold:
-            itemcode = '\\textbf{' + itemcode + '}'
+        if cellColor is not None:
+            itemcode = '\\cellcolor{' + cellColor + '}' + itemcode
 
-        itemalign = align
-        if divLeft:
-            itemalign = '|' + itemalign
+        if multicolumn or width > 1:
+            itemalign = align
+            if divLeft:
+                itemalign = '|' + itemalign
 
-        if divRight:
-            itemalign = itemalign + '|'
+            if divRight:
+                itemalign = itemalign + '|'
 
-        itemcode = '\\multicolumn{1}{' + itemalign + '}{' + itemcode + '}'
+            itemcode = '\\multicolumn{' + str(width) + '}{' + itemalign + '}{' + itemcode + '}'
 
         return itemcode
 
-    def createLongtable(self, textable, options):
+    def createRowRule(self, rowSpans, row, texStarts):
+        """
+        Returns the rule under a row, an \\hline or \\cline segments that skip
+        the merged cells that go on to the next row.  texStarts holds the
+        first LaTeX column of each table column, and the column count last.
+        """
+        crossing = [(span[1], span[1] + span[3]) for span in rowSpans if span[0] + span[2] - 1 > row]
+        if len(crossing) == 0:
+            return ' \\hline '
+
+        cols = len(texStarts) - 1
+        ruleCode = ' '
+        start = 0
+        for left, right in crossing:
+            if left > start:
+                ruleCode += '\\cline{' + str(texStarts[start] + 1) + '-' + str(texStarts[left]) + '} '
+            start = right
+        if start < cols:
+            ruleCode += '\\cline{' + str(texStarts[start] + 1) + '-' + str(texStarts[cols]) + '} '
+        return ruleCode
+
+    @staticmethod
+    def spanKey(rowSpans, row):
+        """
+        Returns the spans covering a row relative to the row, for the row
+        fragment keys.
+        """
+        return tuple((span[0] - row,) + span[1:] for span in rowSpans)
+
+    def createLongtable(self, textable, options, spans, styles, cellColors, decimalAlign):
         """
         Creates the LaTeX code for either a longtable and tabular environment given
-        the options.
+        the options, merged cells, cell styles, cell colors and the decimal
+        alignment of each column.
         """
         texCode = ''
 
@@ -1602,6 +4692,16 @@ class LaTeXTableEditor(QMainWindow):
         if (gridtype == 'longtable'):
             texCode += '% Package: \\usepackage{longtable} \n\n'
 
+        if spans.hasMultirow():
+            texCode += '% Package: \\usepackage{multirow} \n\n'
+
+        if 'S' in decimalAlign:
+            texCode += '% Package: \\usepackage{siunitx} \n\n'
+
+        # Decimal aligned columns are an S column or an r@{.}l column pair.
+        columnSpecs = [{'': align, 'S': 'S', 'split': 'r@{.}l'}[alignment] for alignment in decimalAlign]
+        texStarts = [0] + list(accumulate(2 if alignment == 'split' else 1 for alignment in decimalAlign))
+
         # Add arraystretch if selected.
         if stretch:
             texCode += '{ \n'
@@ -1618,7 +4718,7 @@ class LaTeXTableEditor(QMainWindow):
             texCode += '|'
 
         for i in range(cols):
-            texCode += align
+            texCode += columnSpecs[i]
             if (i == 0) and (firstcol or allcols):
                 texCode += '|'
             elif (i > 0) and allcols:
@@ -1633,59 +4733,106 @@ class LaTeXTableEditor(QMainWindow):
 
         texCode += '\n'
 
+        if columnHeaderRows > rows:
+            columnHeaderRows = rows
+
         # Load table contents.
         for i in range(rows):
-            for j in range(cols):
-                if mathMode:
-                    itemCode = '$' + textable[i][j] + '$'
-                else:
-                    itemCode = textable[i][j]
-
-                divLeft = False
-                divRight = False
-                if (j == 0) and (border or allcols):
-                    divLeft = True
-
-                if (j == 0) and (firstcol or allcols):
-                    divRight = True
-                elif (j > 0) and allcols:
-                    divRight = True
-                elif (j == cols - 1) and (border or allcols):
-                    divRight = True
-
-                if includeColumnHeader and (i < columnHeaderRows):
-                    itemCode = self.createHeaderLine(itemCode, columnHeaderAlign, columnHeaderBold,
-                                                     columnHeaderItalic, columnHeaderUnderline,
-                                                     divLeft, divRight)
-                elif includeRowHeader and (j < rowHeaderColumns):
-                    itemCode = self.createHeaderLine(itemCode, rowHeaderAlign, rowHeaderBold,
-                                                     rowHeaderItalic, rowHeaderUnderline,
-                                                     divLeft, divRight)
-
-                texCode += itemCode
-
-                if j < cols - 1:
-                    texCode += ' & '
-                else:
-                    texCode += ' \\\\ '
-
-            if (i == 0) and (firstrow or allrows):
-                texCode += ' \\hline '
-            elif (i == rows - 1) and border:
-                texCode += ' \\hline '
-            elif allrows:
-                texCode += ' \\hline '
-
-            texCode += '\n'
-
-            if columnHeaderRows > rows:
-                columnHeaderRows = rows
-
-            if (gridtype == 'longtable'):
-                if includeColumnHeader and (i == columnHeaderRows - 1):
-                    texCode += '\\endhead \n'
-                    texCode += '\\endfoot \n'
-                    texCode += '\\endlastfoot \n'
+            self.rowProgress(i, rows)
+            rowSpans = spans.spansInRow(i)
+            styleKey = styles.rowKey(i)
+            rowColors = cellColors.get(i)
+            key = ('longtable', tuple(textable[i]), i == 0, i == rows - 1, i < columnHeaderRows,
+                   i == columnHeaderRows - 1, self.spanKey(rowSpans, i), styleKey,
+                   None if rowColors is None else tuple(sorted(rowColors.items())))
+            rowCode = self.cachedRow(key)
+            if rowCode is None:
+                rowCode = ''
+                j = 0
+                while j < cols:
+                    span = spans.find(i, j) if len(rowSpans) > 0 else None
+                    width = 1 if span is None else span[3]
+                    height = 1 if span is None else span[2]
+                    last = j + width - 1
+                    texWidth = texStarts[j + width] - texStarts[j]
+                    style = styles.get(i, j) if styleKey is not None else 0
+                    cellAlign = LTCCellStyles.alignment(style)
+                    header = (includeColumnHeader and (i < columnHeaderRows)) or \
+                             (includeRowHeader and (j < rowHeaderColumns))
+
+                    # Numbers in an r@{.}l pair are split at the decimal point.
+                    parts = [textable[i][j]]
+                    if decimalAlign[j] == 'split' and span is None and cellAlign == '' and not header and \
+                            self.isNumber(textable[i][j]):
+                        parts = list(textable[i][j].partition('.')[::2])
+                        texWidth = 1
+
+                    # siunitx reads the items of an S column as numbers, other items are braced.
+                    plainNumber = decimalAlign[j] == 'S' and style == 0 and self.isNumber(textable[i][j])
+                    for k in range(len(parts)):
+                        if style != 0:
+                            parts[k] = self.styleItem(parts[k], style, mathMode)
+                        if mathMode and not plainNumber:
+                            parts[k] = '$' + parts[k] + '$'
+                    itemCode = ' & '.join(parts)
+
+                    if decimalAlign[j] == 'S' and textable[i][j] != '' and not plainNumber:
+                        itemCode = '{' + itemCode + '}'
+
+                    divLeft = False
+                    divRight = False
+                    if (j == 0) and (border or allcols):
+                        divLeft = True
+
+                    if (last == 0) and (firstcol or allcols):
+                        divRight = True
+                    elif (last > 0) and allcols:
+                        divRight = True
+                    elif (last == cols - 1) and (border or allcols):
+                        divRight = True
+
+                    cellColor = None if rowColors is None else rowColors.get(j)
+                    if span is not None and span[0] < i:
+                        # The text is in the top row of the span, only the column rules are kept.
+                        itemCode = self.createSpanLine('', align, divLeft, divRight, texWidth, 1)
+                    elif includeColumnHeader and (i < columnHeaderRows):
+                        itemCode = self.createHeaderLine(itemCode, cellAlign or columnHeaderAlign, columnHeaderBold,
+                                                         columnHeaderItalic, columnHeaderUnderline,
+                                                         divLeft, divRight, texWidth, height, cellColor)
+                    elif includeRowHeader and (j < rowHeaderColumns):
+                        itemCode = self.createHeaderLine(itemCode, cellAlign or rowHeaderAlign, rowHeaderBold,
+                                                         rowHeaderItalic, rowHeaderUnderline,
+                                                         divLeft, divRight, texWidth, height, cellColor)
+                    elif span is not None or cellAlign != '' or texWidth > 1:
+                        itemCode = self.createSpanLine(itemCode, cellAlign or align, divLeft, divRight, texWidth,
+                                                       height, cellAlign != '', cellColor)
+                    elif cellColor is not None:
+                        itemCode = ' & '.join('\\cellcolor{' + cellColor + '}' + part for part in parts)
+
+                    rowCode += itemCode
+
+                    if last < cols - 1:
+                        rowCode += ' & '
+                    else:
+                        rowCode += ' \\\\ '
+                    j += width
+
+                if (i == 0) and (firstrow or allrows):
+                    rowCode += self.createRowRule(rowSpans, i, texStarts)
+                elif (i == rows - 1) and border:
+                    rowCode += ' \\hline '
+                elif allrows:
+                    rowCode += self.createRowRule(rowSpans, i, texStarts)
+
+                rowCode += '\n'
+
+                if (gridtype == 'longtable'):
+                    if includeColumnHeader and (i == columnHeaderRows - 1):
+                        rowCode += '\\endhead \n'
+                        rowCode += '\\endfoot \n'
+                        rowCode += '\\endlastfoot \n'
+                self.storeRow(key, rowCode)
+            texCode += rowCode
 
         texCode += '\\end{' + gridtype + '} \n'
 
@@ -1695,9 +4842,10 @@ class LaTeXTableEditor(QMainWindow):
 
         return texCode
 
-    def createTabbing(self, textable, options):
+    def createTabbing(self, textable, options, styles):
         """
-        Creates the LaTeX code for the tabbing environment given the options.
+        Creates the LaTeX code for the tabbing environment given the options and
+        cell styles.
         """
         texCode = ''
 
@@ -1706,35 +4854,51 @@ class LaTeXTableEditor(QMainWindow):
 
         width = options['Tabbing Column Width']
         mathMode = options['Math Mode']
+        if options['Tabbing Auto Width']:
+            widths = LTCTabbingWidths.columnWidths(textable)
+        else:
+            widths = [width] * cols
 
         texCode += '\\begin{tabbing} \n'
 
         # Set column widths.
         for i in range(cols):
-            texCode += '\\hspace{' + str(width) + 'pt}\\='
+            texCode += '\\hspace{' + str(widths[i]) + 'pt}\\='
 
         texCode += '\\kill \n'
 
         # Load table contents.
         for i in range(rows):
-            for j in range(cols):
-                if mathMode:
-                    texCode += '$' + textable[i][j] + '$'
-                else:
-                    texCode += textable[i][j]
+            self.rowProgress(i, rows)
+            styleKey = styles.rowKey(i)
+            key = ('tabbing', tuple(textable[i]), styleKey)
+            rowCode = self.cachedRow(key)
+            if rowCode is None:
+                rowCode = ''
+                for j in range(cols):
+                    itemCode = textable[i][j]
+                    if styleKey is not None:
+                        itemCode = self.styleItem(itemCode, styles.get(i, j), mathMode)
+                    if mathMode:
+                        rowCode += '$' + itemCode + '$'
+                    else:
+                        rowCode += itemCode
 
-                if j < cols - 1:
-                    texCode += ' \\> '
-                else:
-                    texCode += ' \\\\ \n'
+                    if j < cols - 1:
+                        rowCode += ' \\> '
+                    else:
+                        rowCode += ' \\\\ \n'
+                self.storeRow(key, rowCode)
+            texCode += rowCode
 
         texCode += '\\end{tabbing} \n'
 
         return texCode
 
-    def createArray(self, textable, options):
+    def createArray(self, textable, options, spans, styles, cellColors):
         """
-        Creates the LaTeX code for the array environment given the options.
+        Creates the LaTeX code for the array environment given the options,
+        merged cells, cell styles and cell colors.
         """
         texCode = ''
 
@@ -1758,6 +4922,9 @@ class LaTeXTableEditor(QMainWindow):
             decorationLeft = dectype[0]
             decorationRight = dectype[1]
 
+        if spans.hasMultirow():
+            texCode += '% Package: \\usepackage{multirow} \n\n'
+
         # Process arraystretch
         if stretch:
             texCode += '{ \n'
@@ -1794,22 +4961,64 @@ class LaTeXTableEditor(QMainWindow):
 
         # Load table contents.
         for i in range(rows):
-            for j in range(cols):
-                texCode += textable[i][j]
+            self.rowProgress(i, rows)
+            rowSpans = spans.spansInRow(i)
+            styleKey = styles.rowKey(i)
+            rowColors = cellColors.get(i)
+            key = ('array', tuple(textable[i]), i == 0, i == rows - 1, self.spanKey(rowSpans, i), styleKey,
+                   None if rowColors is None else tuple(sorted(rowColors.items())))
+            rowCode = self.cachedRow(key)
+            if rowCode is None:
+                rowCode = ''
+                j = 0
+                while j < cols:
+                    span = spans.find(i, j) if len(rowSpans) > 0 else None
+                    style = styles.get(i, j) if styleKey is not None else 0
+                    cellAlign = LTCCellStyles.alignment(style)
 
-                if j < cols - 1:
-                    texCode += ' & '
-                else:
-                    texCode += ' \\\\ '
+                    itemCode = textable[i][j]
+                    if style != 0:
+                        itemCode = self.styleItem(itemCode, style, True)
+
+                    cellColor = None if rowColors is None else rowColors.get(j)
+
+                    if span is None and cellAlign == '':
+                        if cellColor is not None:
+                            itemCode = '\\cellcolor{' + cellColor + '}' + itemCode
+                        rowCode += itemCode
+                        last = j
+                    else:
+                        width = 1 if span is None else span[3]
+                        height = 1 if span is None else span[2]
+                        last = j + width - 1
+                        divLeft = (j == 0) and (border or allcols)
+                        divRight = (((last == 0) and (firstcol or allcols)) or ((last > 0) and allcols)
+                                    or ((last == cols - 1) and (border or allcols)))
+                        if span is not None and span[0] < i:
+                            rowCode += self.createSpanLine('', align, divLeft, divRight, width, 1)
+                        else:
+                            # \multirow sets its text in text mode.
+                            if height > 1:
+                                itemCode = '$' + itemCode + '$'
+                            rowCode += self.createSpanLine(itemCode, cellAlign or align, divLeft, divRight, width,
+                                                           height, cellAlign != '', cellColor)
+
+                    if last < cols - 1:
+                        rowCode += ' & '
+                    else:
+                        rowCode += ' \\\\ '
+                    j = last + 1
 
-            if (i == 0) and (firstrow or allrows):
-                texCode += ' \\hline '
-            elif (i == rows - 1) and border:
-                texCode += ' \\hline '
-            elif allrows:
-                texCode += ' \\hline '
+                if (i == 0) and (firstrow or allrows):
+                    rowCode += self.createRowRule(rowSpans, i, range(cols + 1))
+                elif (i == rows - 1) and border:
+                    rowCode += ' \\hline '
+                elif allrows:
+                    rowCode += self.createRowRule(rowSpans, i, range(cols + 1))
 
-            texCode += '\n'
+                rowCode += '\n'
+                self.storeRow(key, rowCode)
+            texCode += rowCode
 
         texCode += '\\end{array} \n'
 
@@ -1825,9 +5034,10 @@ class LaTeXTableEditor(QMainWindow):
 
         return texCode
 
-    def createMatrix(self, textable, options):
+    def createMatrix(self, textable, options, styles):
         """
-        Creates the LaTeX code for the matrix environment given the options.
+        Creates the LaTeX code for the matrix environment given the options and
+        cell styles.
         """
         texCode = ''
 
@@ -1863,199 +5073,1864 @@ class LaTeXTableEditor(QMainWindow):
 
         # Load table contents.
         for i in range(rows):
-            for j in range(cols):
-                texCode += textable[i][j]
+            self.rowProgress(i, rows)
+            styleKey = styles.rowKey(i)
+            key = ('matrix', tuple(textable[i]), styleKey)
+            rowCode = self.cachedRow(key)
+            if rowCode is None:
+                rowCode = ''
+                for j in range(cols):
+                    if styleKey is not None:
+                        rowCode += self.styleItem(textable[i][j], styles.get(i, j), True)
+                    else:
+                        rowCode += textable[i][j]
 
-                if j < cols - 1:
-                    texCode += ' & '
-                else:
-                    texCode += ' \\\\ '
+                    if j < cols - 1:
+                        rowCode += ' & '
+                    else:
+                        rowCode += ' \\\\ '
 
-            texCode += '\n'
+                rowCode += '\n'
+                self.storeRow(key, rowCode)
+            texCode += rowCode
 
         texCode += '\\end{matrix} \n'
 
-        if dectype != 'None':
-            texCode += '\\right' + decorationRight + '\n'
+        if dectype != 'None':
+            texCode += '\\right' + decorationRight + '\n'
+
+        # Close math mode and stretch.
+        if mathMode:
+            texCode += '\\] \n'
+
+        if stretch:
+            texCode += '} \n'
+
+        return texCode
+
+    def createSpecialMatrix(self, textable, options, styles):
+        """
+        Creates the LaTeX code for sprcial matrix types with the cell styles.
+        """
+        texCode = ''
+
+        rows = len(textable)
+        cols = len(textable[0])
+
+        mathMode = options['Math Mode']
+        stretch = options['Array Stretch']
+
+        mattype = options['Special Matrix Decoration']
+
+        # Include package hint.
+        texCode += '% Package: \\usepackage{amsmath} \n\n'
+
+        # Processs arraystretch and math mode.
+        if stretch:
+            texCode += '{ \n'
+            texCode += '\\renewcommand{\\arraystretch}{1.0}\n\n'
+
+        if mathMode:
+            texCode += '\\[ \n'
+
+        texCode += '\\begin{' + mattype + '} \n'
+
+        # Load matrix contents.
+        for i in range(rows):
+            self.rowProgress(i, rows)
+            styleKey = styles.rowKey(i)
+            key = ('matrix', tuple(textable[i]), styleKey)
+            rowCode = self.cachedRow(key)
+            if rowCode is None:
+                rowCode = ''
+                for j in range(cols):
+                    if styleKey is not None:
+                        rowCode += self.styleItem(textable[i][j], styles.get(i, j), True)
+                    else:
+                        rowCode += textable[i][j]
+
+                    if j < cols - 1:
+                        rowCode += ' & '
+                    else:
+                        rowCode += ' \\\\ '
+
+                rowCode += '\n'
+                self.storeRow(key, rowCode)
+            texCode += rowCode
+
+        texCode += '\\end{' + mattype + '} \n'
+
+        # Close arraystretch and math mode.
+        if mathMode:
+            texCode += '\\] \n'
+
+        if stretch:
+            texCode += '} \n'
+
+        return texCode
+
+    def createLaTeXCode(self, currentTable, options, spans=None, styles=None, revisions=None):
+        """
+        Entry point for the LaTeX code creation code.  Farms out the code
+        by the type of structure tht is requested.  The merged cells in the
+        span index and the conditional formats are used by the longtable,
+        tabular and array environments, the cell styles by all of them.  The
+        column revisions of the table, if given, let the conditional format and
+        number format results be cached.  Raises ValueError for an unknown grid
+        type.
+        """
+        texCode = ''
+        gridtype = options['Grid Type']
+        if styles is None:
+            styles = LTCCellStyles()
+
+        # The rules are evaluated on the stored text, before the cell stages.
+        cellColors = {}
+        if gridtype in ('longtable', 'tabular', 'array'):
+            formats = LTCConditionalFormats.parse(options['Conditional Formats'])
+            if len(formats) > 0:
+                styles, cellColors = formats.apply(currentTable, styles, revisions, self.task)
+
+        # Numbers are formatted before the cell stages, which may escape them.
+        decimalAlign = [''] * (len(currentTable[0]) if len(currentTable) > 0 else 0)
+        numberFormats = LTCNumberFormats.parse(options['Number Formats'])
+        if len(numberFormats) > 0:
+            currentTable, decimalAlign = numberFormats.apply(currentTable, revisions, self.task)
+
+        currentTable = self.applyCellStages(currentTable, options)
+        if spans is None:
+            spans = LTCSpanIndex()
+        elif len(currentTable) > 0:
+            spans = spans.clip(len(currentTable), len(currentTable[0]))
+        if (gridtype == 'longtable') or (gridtype == 'tabular'):
+            texCode = self.createLongtable(currentTable, options, spans, styles, cellColors, decimalAlign)
+        elif gridtype == 'tabbing':
+            texCode = self.createTabbing(currentTable, options, styles)
+        elif gridtype == 'array':
+            texCode = self.createArray(currentTable, options, spans, styles, cellColors)
+        elif gridtype == 'matrix':
+            texCode = self.createMatrix(currentTable, options, styles)
+        elif gridtype == 'Special Matrix':
+            texCode = self.createSpecialMatrix(currentTable, options, styles)
+        else:
+            raise ValueError('Unknown grid type ' + str(gridtype) + '.')
+
+        if len(cellColors) > 0:
+            texCode = '% Package: \\usepackage[table]{xcolor} \n\n' + texCode
+        elif styles.hasColor():
+            texCode = '% Package: \\usepackage{xcolor} \n\n' + texCode
+
+        return texCode
+
+    def createMaxima(self, items):
+        """
+        Converts the items to Maxima matrix code.
+        """
+        retstr = 'matrix('
+        for i in range(len(items)):
+            self.rowProgress(i, len(items))
+            row = items[i]
+            retstr = retstr + '['
+            for j in range(len(row)):
+                retstr = retstr + row[j]
+                if (j < len(row) - 1):
+                    retstr = retstr + ','
+
+            retstr = retstr + ']'
+
+            if (i < len(items) - 1):
+                retstr = retstr + ','
+
+        retstr = retstr + ')'
+        return retstr
+
+    def createSage(self, items):
+        """
+        Converts the items to SageMath matrix code.
+        """
+        retstr = 'matrix(QQ, ['
+        for i in range(len(items)):
+            self.rowProgress(i, len(items))
+            row = items[i]
+            retstr = retstr + '['
+            for j in range(len(row)):
+                retstr = retstr + row[j]
+                if (j < len(row) - 1):
+                    retstr = retstr + ','
+
+            retstr = retstr + ']'
+
+            if (i < len(items) - 1):
+                retstr = retstr + ','
+
+        retstr = retstr + '])'
+        return retstr
+
+    def createHTML(self, items, styles=None):
+        """
+        Converts the items to an HTML table, with the cell styles if given.
+        """
+        retstr = '<TABLE BORDER=1 CELLPADDING=1 CELLSPACING=0>\n'
+        for i in range(len(items)):
+            self.rowProgress(i, len(items))
+            row = items[i]
+            styled = styles is not None and styles.rowKey(i) is not None
+            retstr = retstr + '<TR>\n'
+            for j in range(len(row)):
+                if styled:
+                    retstr = retstr + self.createHTMLCell(row[j], styles.get(i, j))
+                else:
+                    retstr = retstr + '<TD>' + row[j] + '</TD>'
+
+            retstr = retstr + '\n</TR>\n'
+
+        retstr = retstr + '</TABLE>'
+        return retstr
+
+    def createHTMLCell(self, item, style):
+        """
+        Creates an HTML table cell with the tags of its cell style.
+        """
+        itemcode = item
+
+        if style & LTCCellStyles.underline:
+            itemcode = '<U>' + itemcode + '</U>'
+
+        if style & LTCCellStyles.italic:
+            itemcode = '<I>' + itemcode + '</I>'
+
+        if style & LTCCellStyles.bold:
+            itemcode = '<B>' + itemcode + '</B>'
+
+        name, value = LTCCellStyles.color(style)
+        if value is not None:
+            itemcode = '<FONT COLOR="' + value + '">' + itemcode + '</FONT>'
+
+        alignment = LTCCellStyles.alignment(style)
+        if alignment != '':
+            return '<TD ALIGN=' + {'l': 'LEFT', 'c': 'CENTER', 'r': 'RIGHT'}[alignment] + '>' + itemcode + '</TD>'
+        return '<TD>' + itemcode + '</TD>'
+
+    def itemsToDelimitedString(self, items, ld, rd):
+        """
+        Converts a list of row lists of table elements to a string delimited by ld and rd
+        characters.
+        """
+        retstr = ld
+        for i in range(len(items)):
+            self.rowProgress(i, len(items))
+            row = items[i]
+            retstr = retstr + ld
+            for j in range(len(row)):
+                retstr = retstr + row[j]
+                if (j < len(row) - 1):
+                    retstr = retstr + ','
+
+            retstr = retstr + rd
+
+            if (i < len(items) - 1):
+                retstr = retstr + ','
+
+        retstr = retstr + rd
+        return retstr
+
+    def itemsToTabString(self, items):
+        """
+        Converts a list of row lists of table elements to a tab delimited string.
+        """
+        retstr = ''
+        for i in range(len(items)):
+            self.rowProgress(i, len(items))
+            row = items[i]
+            for j in range(len(row)):
+                retstr = retstr + row[j]
+                if (j == len(row) - 1):
+                    retstr = retstr + '\n'
+                else:
+                    retstr = retstr + '\t'
+        return retstr
+
+
+class LTCTaskCancelled(Exception):
+    """
+    Raised in a worker thread when its task has been cancelled.
+    """
+    pass
+
+
+class LTCTaskSignals(QObject):
+    """
+    Signals of an LTCTask.  The object lives in the GUI thread, so the signals
+    emitted by the worker are delivered there.
+    """
+    progress = Signal(int)
+    finished = Signal(object)
+    failed = Signal(object)
+
+
+class LTCTask(QRunnable):
+    """
+    Runs function(*args, task=task) on a QThreadPool thread.  The function
+    must only use its arguments, normally a snapshot of the table, and may
+    call setProgress, which also stops the task once it is cancelled.  The
+    result or the error message is stored on the task and the finished or
+    failed signal is emitted with the task.
+    """
+
+    def __init__(self, title, function, args):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.title = title
+        self.function = function
+        self.args = args
+        self.signals = LTCTaskSignals()
+        self.cancelled = False
+        self.percent = -1
+        self.result = None
+        self.error = ''
+        self.document = None
+        self.revision = None
+        self.onFinished = None
+        self.dialog = None
+
+    def cancel(self):
+        self.cancelled = True
+
+    def setProgress(self, done, total):
+        """
+        Reports the fraction done, raises LTCTaskCancelled if the task was cancelled.
+        """
+        if self.cancelled:
+            raise LTCTaskCancelled()
+        percent = 100 * done // total if total > 0 else 100
+        if percent != self.percent:
+            self.percent = percent
+            self.signals.progress.emit(percent)
+
+    def execute(self):
+        """
+        Runs the function, returns True if it completed.
+        """
+        try:
+            self.result = self.function(*self.args, task=self)
+        except LTCTaskCancelled:
+            return False
+        except Exception as e:
+            self.error = str(e)
+            self.signals.failed.emit(self)
+            return False
+        self.signals.finished.emit(self)
+        return True
+
+    def run(self):
+        self.execute()
+
+
+class LTCTaskRunner(QObject):
+    """
+    Runs the long grid and export operations of an editor window on the global
+    QThreadPool.  Small tables are processed right away on the GUI thread.
+
+    The worker gets a snapshot of the table, the current undo history entry,
+    which is never modified.  A progress dialog with a cancel button is shown
+    for operations that take more than half a second.  The result is passed to
+    the finished callback on the GUI thread, which applies it as one edit.  If
+    the table was edited while the task was running, the table revision will
+    have changed and the user is asked before the result is applied.
+    """
+
+    syncCellLimit = 20000
+
+    def __init__(self, editor):
+        super().__init__(editor)
+        self.editor = editor
+        self.tasks = []
+
+    def isBusy(self, document):
+        return any(task.document is document for task in self.tasks)
+
+    def start(self, title, function, args, onFinished, document=None, cells=0):
+        """
+        Starts the task.  If a document is given, the result is only applied to
+        it and conflicting edits are checked against the document's table.
+        """
+        task = LTCTask(title, function, args)
+        task.onFinished = onFinished
+        task.document = document
+        if document is not None:
+            task.revision = document.table_widget.revision
+        task.signals.finished.connect(self.taskFinished)
+        task.signals.failed.connect(self.taskFailed)
+        self.tasks.append(task)
+
+        if cells < self.syncCellLimit:
+            task.execute()
+            return task
+
+        task.dialog = QProgressDialog(title + "...", "Cancel", 0, 100, self.editor)
+        task.dialog.setWindowTitle(title)
+        task.dialog.setMinimumDuration(500)
+        task.dialog.setAutoClose(False)
+        task.dialog.setAutoReset(False)
+        task.dialog.canceled.connect(task.cancel)
+        task.dialog.canceled.connect(lambda: self.removeTask(task))
+        task.signals.progress.connect(task.dialog.setValue)
+        QThreadPool.globalInstance().start(task)
+        return task
+
+    def removeTask(self, task):
+        if task in self.tasks:
+            self.tasks.remove(task)
+        if task.dialog is not None:
+            # Closing the dialog would emit canceled.
+            task.dialog.blockSignals(True)
+            task.dialog.close()
+            task.dialog.deleteLater()
+            task.dialog = None
+
+    def taskFinished(self, task):
+        """
+        Applies the result of a task on the GUI thread, in the tab of its document.
+        """
+        if task not in self.tasks:
+            return
+        self.removeTask(task)
+        if task.cancelled:
+            return
+
+        document = task.document
+        if document is not None:
+            if document not in self.editor.documents():
+                return
+            self.editor.document_tabs.setCurrentWidget(document)
+            document.restoreView()
+            if document.table_widget.revision != task.revision:
+                answer = QMessageBox.question(self.editor, "Table Changed",
+                                              "The table was edited while the " + task.title.lower() +
+                                              " was running.  Do you want to apply the result anyway?",
+                                              QMessageBox.Yes | QMessageBox.No)
+                if answer != QMessageBox.Yes:
+                    return
+        task.onFinished(task.result)
+
+    def taskFailed(self, task):
+        self.removeTask(task)
+        QMessageBox.warning(self.editor, task.title, task.title + " could not be completed.\n" + task.error,
+                            QMessageBox.Ok)
+
+    def cancelAll(self):
+        for task in list(self.tasks):
+            task.cancel()
+            self.removeTask(task)
+
+
+class LTCPreviewPane(QWidget):
+    """
+    Read-only preview of the current table in one of the export formats.
+    Changes to the table and the options are collected for a short delay and
+    the code is then made on a QThreadPool thread from a snapshot of the
+    table, so typing in the grid is never held up.  For LaTeX the code of each
+    row is kept and reused for the rows that have not changed.  Only the
+    start of very long code is shown, the copy actions give the whole code.
+    """
+
+    refreshDelay = 300
+    lineLimit = 2000
+    charLimit = 200000
+    formats = ['LaTeX', 'Maxima', 'SageMath', 'HTML', 'GeoGebra { }', 'Delimited [ ]', 'Delimited < >',
+               'Tab Delimited']
+
+    def __init__(self, editor):
+        super().__init__()
+        self.editor = editor
+        self.task = None
+        self.pending = False
+        self.fragments = {}
+        self.fragmentsKey = None
+
+        self.format_selector = QComboBox()
+        self.format_selector.addItems(self.formats)
+        self.format_selector.currentIndexChanged.connect(self.schedule)
+
+        self.code_view = QPlainTextEdit()
+        self.code_view.setReadOnly(True)
+        self.code_view.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.code_view.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+
+        format_layout = QHBoxLayout()
+        format_layout.addWidget(QLabel("Format"))
+        format_layout.addWidget(self.format_selector)
+        format_layout.addStretch(1)
+
+        pane_layout = QVBoxLayout()
+        pane_layout.setContentsMargins(0, 0, 0, 0)
+        pane_layout.addLayout(format_layout)
+        pane_layout.addWidget(self.code_view)
+        self.setLayout(pane_layout)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(self.refreshDelay)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def schedule(self):
+        """
+        Refreshes the preview once the changes stop for the refresh delay.
+        While the preview is hidden the refresh waits until it is shown.
+        """
+        if self.isVisible():
+            self.refresh_timer.start()
+        else:
+            self.pending = True
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.pending:
+            self.pending = False
+            self.refresh_timer.start()
+
+    def refresh(self):
+        """
+        Starts making the preview code, a preview still being made is cancelled.
+        """
+        document = self.editor.currentDocument()
+        if document is None or document.table_widget is None:
+            return
+        items = document.table_widget.currentItems()
+        spans = document.table_widget.spanIndex
+        styles = document.table_widget.cellStyles
+        options = self.editor.options_pane.getOptionsInfo()
+        revisions = self.editor.columnRevisions(options)
+        format_name = self.format_selector.currentText()
+
+        key = (format_name, options)
+        if key != self.fragmentsKey or len(self.fragments) > 2 * len(items) + 1000:
+            self.fragments = {}
+            self.fragmentsKey = key
+
+        if self.task is not None:
+            self.task.cancel()
+        self.task = LTCTask("Preview", self.render, (items, options, format_name, self.fragments, spans,
+                                                     styles, revisions))
+        self.task.signals.finished.connect(self.showCode)
+        self.task.signals.failed.connect(self.showCode)
+        QThreadPool.globalInstance().start(self.task)
+
+    @classmethod
+    def render(cls, items, options, format_name, fragments, spans=None, styles=None, revisions=None, task=None):
+        """
+        Makes the code in the format and cuts it to the shown length.
+        """
+        exporter = LTCExporter(task, fragments)
+        if format_name == 'LaTeX':
+            code = exporter.createLaTeXCode(items, options, spans, styles, revisions)
+        elif format_name == 'Maxima':
+            code = exporter.createMaxima(items)
+        elif format_name == 'SageMath':
+            code = exporter.createSage(items)
+        elif format_name == 'HTML':
+            code = exporter.createHTML(items, styles)
+        elif format_name == 'GeoGebra { }':
+            code = exporter.itemsToDelimitedString(items, '{', '}')
+        elif format_name == 'Delimited [ ]':
+            code = exporter.itemsToDelimitedString(items, '[', ']')
+        elif format_name == 'Delimited < >':
+            code = exporter.itemsToDelimitedString(items, '<', '>')
+        else:
+            code = exporter.itemsToTabString(items)
+
+        end = -1
+        for i in range(cls.lineLimit):
+            end = code.find('\n', end + 1, cls.charLimit)
+            if end < 0:
+                break
+        if end < 0 and len(code) > cls.charLimit:
+            end = cls.charLimit
+        if end >= 0 and end < len(code) - 1:
+            code = code[:end + 1] + '\n... The rest of the code is not shown, use the copy actions to get all of it.\n'
+        return code
+
+    def showCode(self, task):
+        """
+        Shows the code of the latest preview task and keeps the scroll position.
+        """
+        if task is not self.task:
+            return
+        self.task = None
+        scroll = self.code_view.verticalScrollBar().value()
+        if task.error != '':
+            self.code_view.setPlainText(task.error)
+        else:
+            self.code_view.setPlainText(task.result)
+        self.code_view.verticalScrollBar().setValue(scroll)
+
+    def cancel(self):
+        self.refresh_timer.stop()
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+
+class LTCDocument(QWidget):
+    """
+    One table document in the editor's tabs, the size spinners and the table
+    with its undo history and edit journal.  The menus, toolbar, options dock
+    and icons belong to the editor and are shared by all of its documents.
+
+    A document in a background tab can release its view.  The table widget is
+    deleted and the history is kept as compressed session data, which is
+    loaded into a new table widget when the document is shown again.
+    """
+
+    resizeDelay = 300
+
+    def __init__(self, editor, title):
+        super().__init__()
+        self.editor = editor
+        self.title = title
+        self.journal = LTCEditJournal()
+        self.releasedState = None
+        self.lastActive = time.monotonic()
+
+        self.table_widget = LTC_Table()
+        self.table_widget.journal = self.journal
+        self.table_widget.autoFit = editor.autoFitColumns
+        self.table_widget.tableChanged.connect(editor.schedulePreview)
+        self.table_widget.adjustFontSize(editor.settings.get('Font Size'))
+
+        row_label = QLabel("Rows")
+        self.rows = QSpinBox()
+        self.rows.setRange(1, 10000)
+        self.rows.setMinimumWidth(75)
+        self.rows.setValue(3)
+        self.rows.setKeyboardTracking(False)
+        self.rows.valueChanged.connect(self.scheduleResize)
+
+        column_label = QLabel("Columns")
+        self.columns = QSpinBox()
+        self.columns.setRange(1, 1000)
+        self.columns.setMinimumWidth(75)
+        self.columns.setValue(3)
+        self.columns.setKeyboardTracking(False)
+        self.columns.valueChanged.connect(self.scheduleResize)
+
+        # Spinner changes are applied once the value has settled, typed values
+        # only when editing is finished.
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(self.resizeDelay)
+        self.resize_timer.timeout.connect(self.applyResize)
+
+        h_box_tablesize = QHBoxLayout()
+        h_box_tablesize.addWidget(row_label)
+        h_box_tablesize.addWidget(self.rows)
+        h_box_tablesize.addWidget(column_label)
+        h_box_tablesize.addWidget(self.columns)
+        h_box_tablesize.addStretch()
+
+        self.h_box_table = QHBoxLayout()
+        self.h_box_table.addWidget(self.table_widget)
+
+        v_box_tablepane = QVBoxLayout()
+        v_box_tablepane.setContentsMargins(5, 5, 0, 0)
+        v_box_tablepane.addLayout(h_box_tablesize)
+        v_box_tablepane.addLayout(self.h_box_table)
+        self.setLayout(v_box_tablepane)
+
+    def isReleased(self):
+        return self.releasedState is not None
+
+    def scheduleResize(self):
+        """
+        Restarts the resize timer, so holding down an arrow key resizes the
+        table once.
+        """
+        self.resize_timer.start()
+
+    def applyResize(self):
+        """
+        Resizes the table to the spinner values as one edit.
+        """
+        self.resize_timer.stop()
+        if self.table_widget is None:
+            return
+        rows = self.rows.value()
+        cols = self.columns.value()
+        if rows == self.table_widget.rowCount() and cols == self.table_widget.columnCount():
+            return
+        focus = QApplication.focusWidget()
+        self.table_widget.resizeTable(rows, cols)
+        if focus is self.rows or focus is self.columns:
+            focus.setFocus()
+
+    def releaseView(self):
+        """
+        Delete the table widget, keeping its session state compressed.  The
+        journal is compacted first so recovery does not need the widget.
+        """
+        if self.isReleased():
+            return
+        self.applyResize()
+        self.table_widget.closeEditing()
+        self.table_widget.compactJournal()
+        state = self.table_widget.getSessionState()
+        self.releasedState = zlib.compress(json.dumps(state, separators=(',', ':')).encode('utf-8'))
+        self.table_widget.journal = None
+        self.h_box_table.removeWidget(self.table_widget)
+        self.table_widget.deleteLater()
+        self.table_widget = None
+
+    def restoreView(self):
+        """
+        Rebuild the table widget from the state kept by releaseView.
+        """
+        if not self.isReleased():
+            return
+        state = json.loads(zlib.decompress(self.releasedState).decode('utf-8'))
+        self.table_widget = LTC_Table()
+        self.table_widget.setSessionState(state)
+        self.table_widget.journal = self.journal
+        self.table_widget.autoFit = self.editor.autoFitColumns
+        self.table_widget.tableChanged.connect(self.editor.schedulePreview)
+        self.h_box_table.addWidget(self.table_widget)
+        self.releasedState = None
+
+    def discardJournal(self):
+        """
+        Remove the recovery journal, done when the document is closed normally.
+        """
+        if self.journal is not None:
+            self.journal.discard()
+            self.journal = None
+        if self.table_widget is not None:
+            self.table_widget.journal = None
+
+
+class LaTeXTableEditor(QMainWindow):
+
+    recoveryChecked = False
+    sessionMagic = b'LTCSESSION1\n'
+    iconCache = {}
+    idleReleaseSeconds = 300
+
+    def __init__(self, parent=None):
+        """
+        Initialize the program and set up the programList structure that
+        keeps the read-only viewer windows open.
+        """
+        super().__init__()
+        self.Parent = parent
+        
+        self.authors = "Don Spickler"
+        self.version = "2.6.1"
+        self.program_title = "Latex Table Creator"
+        self.copyright = "2022 - 2025"
+        self.licence = "\nThis software is distributed under the GNU General Public License version 3.\n\n" + \
+        "This program is free software: you can redistribute it and/or modify it under the terms of the GNU " + \
+        "General Public License as published by the Free Software Foundation, either version 3 of the License, " + \
+        "or (at your option) any later version. This program is distributed in the hope that it will be useful, " + \
+        "but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A " + \
+        "PARTICULAR PURPOSE. See the GNU General Public License for more details http://www.gnu.org/licenses/."
+
+        self.clipboard = QApplication.clipboard()
+        self.autoFitColumns = False
+        self.preview_pane = None
+        self.programList = []
+        self.task_runner = LTCTaskRunner(self)
+        self.setMinimumSize(800, 600)
+        self.setWindowTitle('LaTeX Table Creator')
+        icon = self.getIcon("icons/ProgramIcon2.png")
+        self.setWindowIcon(icon)
+
+        self.currentTheme = ''
+        self.Platform = platform.system()
+        styles = QStyleFactory.keys()
+        if "Fusion" in styles:
+            app.setStyle('Fusion')
+            self.currentTheme = 'Fusion'
+        else:
+            self.currentTheme = styles[0]
+        LTCStartupProfiler.mark("Application")
+
+        self.settings = LTCSettings.instance()
+        theme = self.settings.get('Theme')
+        if theme in styles:
+            QApplication.instance().setStyle(theme)
+            self.currentTheme = theme
+        LTCStartupProfiler.mark("Theme")
+
+        self.createTablePane()
+        LTCStartupProfiler.mark("Table pane")
+        self.createMenu()
+        LTCStartupProfiler.mark("Menus")
+        self.createToolBar()
+        LTCStartupProfiler.mark("Toolbar")
+        self.createDockWidget()
+        LTCStartupProfiler.mark("Options dock")
+        self.show()
+        LTCStartupProfiler.mark("Show")
+
+        # Autosave, the edit journals are compacted into snapshots every minute
+        # and documents left in background tabs release their views.
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.setInterval(60000)
+        self.autosave_timer.timeout.connect(self.autosave)
+        self.autosave_timer.start()
+
+        if not LaTeXTableEditor.recoveryChecked:
+            LaTeXTableEditor.recoveryChecked = True
+            QTimer.singleShot(0, self.checkRecovery)
+
+    def closeEvent(self, event):
+        """
+        Removes the recovery journals when the window is closed normally.
+        """
+        self.task_runner.cancelAll()
+        self.preview_pane.cancel()
+        for document in self.documents():
+            document.discardJournal()
+        super().closeEvent(event)
+
+    def autosave(self):
+        """
+        Compacts the edit journals and releases the views of idle background documents.
+        """
+        current = self.currentDocument()
+        now = time.monotonic()
+        for document in self.documents():
+            if document.isReleased():
+                continue
+            if document is not current and now - document.lastActive > self.idleReleaseSeconds and \
+                    not self.task_runner.isBusy(document):
+                document.releaseView()
+            else:
+                document.table_widget.compactJournal()
+
+    def checkRecovery(self):
+        """
+        Offers to recover tables left by a previous run that did not exit
+        normally.  The first table is loaded into the current tab and any
+        others into new tabs.
+        """
+        sessions = LTCEditJournal.recoverableSessions()
+        if len(sessions) == 0:
+            return
+
+        answer = QMessageBox.question(self, "Recover Tables",
+                                      str(len(sessions)) + " unsaved table(s) from a previous session were found.  " +
+                                      "Do you want to recover them?", QMessageBox.Yes | QMessageBox.No)
+
+        first = True
+        for session in sessions:
+            if answer == QMessageBox.Yes:
+                try:
+                    items = session.recover()
+                except Exception:
+                    QMessageBox.warning(self, "Table Not Recovered", "A table from a previous session is damaged "
+                                        "and could not be recovered.", QMessageBox.Ok)
+                else:
+                    if not first:
+                        self.newDocument()
+                    self.loadTable(items)
+                    first = False
+            session.discard()
+
+    def resource_path(self, relative_path):
+        """
+        Creates a system path that is rlative to the position of the running application.
+
+        :param relative_path: The relative path of the file from the base position of the running appliction.
+        :return: The full OS path.
+        """
+        if hasattr(sys, '_MEIPASS'):
+            return os.path.join(sys._MEIPASS, relative_path)
+        return os.path.join(os.path.abspath("."), relative_path)
+
+    def getIcon(self, relative_path):
+        """
+        Returns the icon for the relative path.  Icons are cached and shared by
+        all editor windows.
+        """
+        icon = LaTeXTableEditor.iconCache.get(relative_path)
+        if icon is None:
+            icon = QIcon(self.icon_path(relative_path))
+            LaTeXTableEditor.iconCache[relative_path] = icon
+        return icon
+
+    def icon_path(self, relative_path):
+        """
+        Path of an icon, from the compiled resource bundle when it is available
+        and from the file system otherwise.
+
+        :param relative_path: The relative path of the icon, as listed in LTCResources.qrc.
+        :return: A :/ resource path or the full OS path.
+        """
+        if hasResourceBundle:
+            return ":/" + relative_path
+        return self.resource_path(relative_path)
+
+    # def resource_path(self, relative_path):
+    #     if hasattr(sys, '_MEIPASS'):
+    #         return os.path.join(sys._MEIPASS, relative_path)
+    #     return os.path.join(os.path.abspath("LaTeXTableCreator"), relative_path)
+
+    def createTablePane(self):
+        """
+        Sets up the document tabs, each tab holds a table and its size
+        selection spinners.
+        """
+        self.documentCounter = 0
+        self.activeDocument = None
+        self.document_tabs = QTabWidget()
+        self.document_tabs.setDocumentMode(True)
+        self.document_tabs.setTabsClosable(True)
+        self.document_tabs.setMovable(True)
+        self.document_tabs.currentChanged.connect(self.documentChanged)
+        self.document_tabs.tabCloseRequested.connect(self.closeDocument)
+        self.setCentralWidget(self.document_tabs)
+        self.newDocument()
+
+    @property
+    def table_widget(self):
+        return self.currentDocument().table_widget
+
+    @property
+    def rows(self):
+        return self.currentDocument().rows
+
+    @property
+    def columns(self):
+        return self.currentDocument().columns
+
+    def currentDocument(self):
+        return self.document_tabs.currentWidget()
+
+    def documents(self):
+        return [self.document_tabs.widget(i) for i in range(self.document_tabs.count())]
+
+    def newDocument(self):
+        """
+        Adds a new table document in a new tab and makes it the current tab.
+        """
+        self.documentCounter += 1
+        document = LTCDocument(self, "Table " + str(self.documentCounter))
+        index = self.document_tabs.addTab(document, document.title)
+        self.document_tabs.setCurrentIndex(index)
+        return document
+
+    def setDocumentTitle(self, title):
+        """
+        Sets the tab title of the current document.
+        """
+        document = self.currentDocument()
+        document.title = title
+        self.document_tabs.setTabText(self.document_tabs.indexOf(document), title)
+
+    def documentChanged(self, index):
+        """
+        Rebuilds the view of a released document when its tab is selected and
+        notes when the previous document was last used.
+        """
+        if self.activeDocument is not None:
+            self.activeDocument.applyResize()
+            self.activeDocument.lastActive = time.monotonic()
+        self.activeDocument = self.document_tabs.widget(index)
+        if self.activeDocument is not None:
+            self.activeDocument.restoreView()
+        self.schedulePreview()
+
+    def schedulePreview(self):
+        """
+        Marks the preview out of date after a table, option or tab change.
+        """
+        if self.preview_pane is not None:
+            self.preview_pane.schedule()
+
+    def closeDocument(self, index):
+        """
+        Closes the document in the tab, a new empty document is opened when
+        the last one is closed.
+        """
+        document = self.document_tabs.widget(index)
+        for task in list(self.task_runner.tasks):
+            if task.document is document:
+                task.cancel()
+                self.task_runner.removeTask(task)
+        document.discardJournal()
+        if document is self.activeDocument:
+            self.activeDocument = None
+        self.document_tabs.removeTab(index)
+        document.deleteLater()
+        if self.document_tabs.count() == 0:
+            self.newDocument()
+
+    def createMenu(self):
+        """
+        Set up the menu bar.
+        """
+        # Create file menu actions
+        self.file_new_act = QAction(self.getIcon('icons/FileNew.png'), "New", self)
+        self.file_new_act.setShortcut('Ctrl+N')
+        self.file_new_act.setStatusTip('Start a new table in a new tab.')
+        self.file_new_act.triggered.connect(self.newDocument)
+
+        self.file_close_act = QAction("Close Tab", self)
+        self.file_close_act.setShortcut('Ctrl+W')
+        self.file_close_act.setStatusTip('Close the current table.')
+        self.file_close_act.triggered.connect(lambda: self.closeDocument(self.document_tabs.currentIndex()))
+
+        self.file_open_act = QAction(self.getIcon('icons/FileOpen.png'), "Open...", self)
+        self.file_open_act.setShortcut('Ctrl+O')
+        self.file_open_act.setStatusTip('Open a table file.')
+        self.file_open_act.triggered.connect(self.openFile)
+
+        self.file_saveas_act = QAction(self.getIcon('icons/FileSave.png'), "Save As...", self)
+        self.file_saveas_act.setShortcut('Ctrl+S')
+        self.file_saveas_act.setStatusTip('Save a table file.')
+        self.file_saveas_act.triggered.connect(self.saveFile)
+
+        self.file_save_session_act = QAction("Save Session As...", self)
+        self.file_save_session_act.setStatusTip('Save the table, options, undo history and view settings.')
+        self.file_save_session_act.triggered.connect(self.saveSession)
+
+        self.file_view_act = QAction("Open as Read-Only View...", self)
+        self.file_view_act.setStatusTip('View a large CSV or TSV file without loading it into the grid.')
+        self.file_view_act.triggered.connect(self.openReadOnlyView)
+
+        self.file_import_tex_act = QAction("Import from LaTeX Document...", self)
+        self.file_import_tex_act.setStatusTip('Load tables from the environments of a LaTeX document.')
+        self.file_import_tex_act.triggered.connect(self.importTexDocument)
+
+        quit_act = QAction("Exit", self)
+        quit_act.setStatusTip('Exit the program.')
+        quit_act.triggered.connect(self.close)
+
+        # Create table menu actions
+        self.add_row_above_act = QAction("Add Row Above", self)
+        self.add_row_above_act.setShortcut('Ctrl+Up')
+        self.add_row_above_act.setStatusTip('Add a row above the current selection.')
+        self.add_row_above_act.triggered.connect(self.addRowAbove)
+
+        self.add_row_below_act = QAction("Add Row Below", self)
+        self.add_row_below_act.setShortcut('Ctrl+Down')
+        self.add_row_below_act.setStatusTip('Add a row below the current selection.')
+        self.add_row_below_act.triggered.connect(self.addRowBelow)
+
+        self.add_col_before_act = QAction("Add Column Before", self)
+        self.add_col_before_act.setShortcut('Ctrl+Left')
+        self.add_col_before_act.setStatusTip('Add a column before the current selection.')
+        self.add_col_before_act.triggered.connect(self.addColumnBefore)
+
+        self.add_col_after_act = QAction("Add Column After", self)
+        self.add_col_after_act.setShortcut('Ctrl+Right')
+        self.add_col_after_act.setStatusTip('Add a column after the current selection.')
+        self.add_col_after_act.triggered.connect(self.addColumnAfter)
+
+        self.delete_row_act = QAction("Delete Rows", self)
+        self.delete_row_act.setStatusTip('Delete selected rows.')
+        self.delete_row_act.triggered.connect(self.deleteRows)
+
+        self.delete_col_act = QAction("Delete Columns", self)
+        self.delete_col_act.setStatusTip('Delete selected columns.')
+        self.delete_col_act.triggered.connect(self.deleteColumns)
+
+        self.delete_row_col_act = QAction("Delete Rows and Columns", self)
+        self.delete_row_col_act.setStatusTip('Delete selected rows and columns.')
+        self.delete_row_col_act.triggered.connect(self.deleteRowsColumns)
+
+        self.merge_cells_act = QAction("Merge Cells", self)
+        self.merge_cells_act.setShortcut('Ctrl+M')
+        self.merge_cells_act.setStatusTip('Merge the selected cells into one cell.')
+        self.merge_cells_act.triggered.connect(self.mergeCells)
+
+        self.unmerge_cells_act = QAction("Unmerge Cells", self)
+        self.unmerge_cells_act.setShortcut('Ctrl+Shift+M')
+        self.unmerge_cells_act.setStatusTip('Split the merged cells in the selection.')
+        self.unmerge_cells_act.triggered.connect(self.unmergeCells)
+
+        self.bold_act = QAction("Bold", self)
+        self.bold_act.setShortcut('Ctrl+B')
+        self.bold_act.setStatusTip('Make the selected cells bold, or plain if they are all bold.')
+        self.bold_act.triggered.connect(self.boldCells)
+
+        self.italic_act = QAction("Italic", self)
+        self.italic_act.setShortcut('Ctrl+I')
+        self.italic_act.setStatusTip('Make the selected cells italic, or upright if they are all italic.')
+        self.italic_act.triggered.connect(self.italicCells)
+
+        self.underline_act = QAction("Underline", self)
+        self.underline_act.setShortcut('Ctrl+U')
+        self.underline_act.setStatusTip('Underline the selected cells, or remove the underline if they all have one.')
+        self.underline_act.triggered.connect(self.underlineCells)
+
+        self.clear_styles_act = QAction("Clear Formatting", self)
+        self.clear_styles_act.setStatusTip('Remove the styles of the selected cells.')
+        self.clear_styles_act.triggered.connect(self.clearCellStyles)
+
+        self.clear_table_act = QAction("Clear All", self)
+        self.clear_table_act.setStatusTip('Delete the table contents.')
+        self.clear_table_act.triggered.connect(self.clearTable)
+
+        self.transpose_act = QAction("Transpose Table", self)
+        self.transpose_act.setStatusTip('Transposes the table contents.')
+        self.transpose_act.triggered.connect(self.transpose)
+
+        self.trim_act = QAction("Trim Cells", self)
+        self.trim_act.setStatusTip('Trim each of the cells.')
+        self.trim_act.triggered.connect(self.trim)
+
+        self.convert_unicode_act = QAction("Convert Unicode to LaTeX", self)
+        self.convert_unicode_act.setStatusTip('Replace Greek letters, symbols and accented letters in the cells '
+                                              'with LaTeX macros.')
+        self.convert_unicode_act.triggered.connect(self.convertUnicode)
+
+        self.fill_cells_act = QAction("Fill Cells with Text...", self)
+        self.fill_cells_act.setStatusTip('Fill each cell with the same value.')
+        self.fill_cells_act.triggered.connect(self.filltext)
+
+        self.suggest_options_act = QAction("Suggest Options from Data", self)
+        self.suggest_options_act.setStatusTip('Set the column alignment and tabbing width from the table contents.')
+        self.suggest_options_act.triggered.connect(self.suggestOptions)
+
+        self.save_preset_act = QAction("Save Options as Preset...", self)
+        self.save_preset_act.setStatusTip('Save the current options as a named preset.')
+        self.save_preset_act.triggered.connect(self.savePreset)
+
+        self.delete_preset_act = QAction("Delete Preset...", self)
+        self.delete_preset_act.setStatusTip('Delete a named options preset.')
+        self.delete_preset_act.triggered.connect(self.deletePreset)
+
+        self.adjust_widths_act = QAction(self.getIcon('icons/AdjCol.png'), "Adjust Column Widths", self)
+        self.adjust_widths_act.setStatusTip('Adjust the column widths to fit the contents.')
+        self.adjust_widths_act.triggered.connect(self.adjustWidths)
+
+        self.adjust_heights_act = QAction(self.getIcon('icons/AdjRow.png'), "Adjust Row Heights", self)
+        self.adjust_heights_act.setStatusTip('Adjust the row heights to fit the contents.')
+        self.adjust_heights_act.triggered.connect(self.adjustHeights)
+
+        self.adjust_width_height_act = QAction(self.getIcon('icons/AdjRowCol.png'), "Adjust Row and Column Sizes", self)
+        self.adjust_width_height_act.setShortcut('Ctrl+R')
+        self.adjust_width_height_act.setStatusTip('Adjust the row and column sizes to fit the contents.')
+        self.adjust_width_height_act.triggered.connect(self.adjustWidthHeight)
+
+        self.auto_fit_act = QAction("Auto-fit Column Widths", self)
+        self.auto_fit_act.setCheckable(True)
+        self.auto_fit_act.setStatusTip('Widen columns as cells are edited and refit them when the font size changes.')
+        self.auto_fit_act.toggled.connect(self.setAutoFit)
+
+        # Create edit menu actions
+        self.copy_selected_act = QAction(self.getIcon('icons/Cascade.png'), "Copy Selected", self)
+        self.copy_selected_act.setShortcut('Ctrl+C')
+        self.copy_selected_act.setStatusTip('Copy table selection to the clipboard.')
+        self.copy_selected_act.triggered.connect(self.copySelected)
+
+        self.copy_all_act = QAction(self.getIcon('icons/copy.png'), "Copy All", self)
+        self.copy_all_act.setShortcut('Shift+Ctrl+C')
+        self.copy_all_act.setStatusTip('Copy entire table to the clipboard.')
+        self.copy_all_act.triggered.connect(self.copyAll)
+
+        self.paste_act = QAction(self.getIcon('icons/paste.png'), "Paste", self)
+        self.paste_act.setShortcut('Ctrl+V')
+        self.paste_act.setStatusTip('Paste clipboard to table.')
+        self.paste_act.triggered.connect(self.paste)
+
+        self.copy_latex_act = QAction(self.getIcon('icons/latexicon2.png'), "Copy as LaTeX", self)
+        self.copy_latex_act.setShortcut('Ctrl+L')
+        self.copy_latex_act.setStatusTip('Copy table to LaTeX code with selected options.')
+        self.copy_latex_act.triggered.connect(self.latexCopy)
+
+        self.paste_from_latex_act = QAction("Paste from LaTeX", self)
+        self.paste_from_latex_act.setShortcut('Shift+Ctrl+L')
+        self.paste_from_latex_act.setStatusTip('Paste from LaTeX code to table.')
+        self.paste_from_latex_act.triggered.connect(self.pasteLatex)
+
+        # Icons for actions that only appear in the Edit menu are loaded the
+        # first time the menu is shown.
+        self.deferredIcons = []
+
+        self.copy_maxima_act = QAction("Copy as Maxima", self)
+        self.deferredIcons.append((self.copy_maxima_act, 'icons/wxmaximaicon002.png'))
+        self.copy_maxima_act.setStatusTip('Copy matrix to Maxima code.')
+        self.copy_maxima_act.triggered.connect(self.copyMaxima)
+
+        self.copy_sage_act = QAction("Copy as SageMath", self)
+        self.deferredIcons.append((self.copy_sage_act, 'icons/sagemath.png'))
+        self.copy_sage_act.setStatusTip('Copy matrix to SageMath code.')
+        self.copy_sage_act.triggered.connect(self.copySage)
+
+        self.copy_geogebra_act = QAction("Copy as GeoGebra", self)
+        self.deferredIcons.append((self.copy_geogebra_act, 'icons/Geogebra002.png'))
+        self.copy_geogebra_act.setStatusTip('Copy matrix to Mathematica code.')
+        self.copy_geogebra_act.triggered.connect(self.copyGeoGebra)
+
+        self.copy_bracket_act = QAction("Copy [...] Delimited", self)
+        self.copy_bracket_act.setStatusTip('Copy matrix in [...] delimited form.')
+        self.copy_bracket_act.triggered.connect(self.copyBracket)
+
+        self.copy_curleybracket_act = QAction("Copy {...} Delimited", self)
+        self.copy_curleybracket_act.setStatusTip('Copy matrix in {...} delimited form.')
+        self.copy_curleybracket_act.triggered.connect(self.copyGeoGebra)
+
+        self.copy_angle_bracket_act = QAction("Copy <...> Delimited", self)
+        self.copy_angle_bracket_act.setStatusTip('Copy matrix in <...> delimited form.')
+        self.copy_angle_bracket_act.triggered.connect(self.copyAngleBracket)
+
+        self.copy_html_act = QAction("Copy as HTML", self)
+        self.copy_html_act.setStatusTip('Copy table to HTML.')
+        self.copy_html_act.triggered.connect(self.copyHTML)
+
+        self.select_all_act = QAction("Select All", self)
+        self.select_all_act.setShortcut('Ctrl+A')
+        self.select_all_act.setStatusTip('Select all cells.')
+        self.select_all_act.triggered.connect(self.selectall)
+
+        self.Undo_act = QAction(self.getIcon('icons/Undo.png'), "Undo", self)
+        self.Undo_act.setShortcut('Ctrl+Z')
+        self.Undo_act.setStatusTip('Undo the last edit.')
+        self.Undo_act.triggered.connect(self.undo)
+
+        self.Redo_act = QAction(self.getIcon('icons/Redo.png'), "Redo", self)
+        self.Redo_act.setShortcut('Shift+Ctrl+Z')
+        self.Redo_act.setStatusTip('Redo the last edit.')
+        self.Redo_act.triggered.connect(self.redo)
+
+        self.view_increase_font_size_act = QAction(self.getIcon('icons/zoomin.png'), "Increase Font Size", self)
+        self.view_increase_font_size_act.setStatusTip('Increase the font size in the workspace.')
+        self.view_increase_font_size_act.triggered.connect(self.increaseWorksheetFontSize)
+
+        self.view_decrease_font_size_act = QAction(self.getIcon('icons/zoomout.png'), "Decrease Font Size", self)
+        self.view_decrease_font_size_act.setStatusTip('Decrease the font size in the workspace.')
+        self.view_decrease_font_size_act.triggered.connect(self.decreaseWorksheetFontSize)
+
+        self.view_reset_font_size_act = QAction(self.getIcon('icons/Tile.png'), "Reset Font Size", self)
+        self.view_reset_font_size_act.setStatusTip('Reset the font size in the workspace to the defaults.')
+        self.view_reset_font_size_act.triggered.connect(self.resetWorksheetFontSize)
+
+        self.SelectTheme_act = QAction("Select Theme...", self)
+        self.SelectTheme_act.triggered.connect(self.SelectTheme)
+        self.SelectTheme_act.setStatusTip('Select from the current supported system themes.')
+
+        # Create help menu actions
+        self.help_about_act = QAction(self.getIcon('icons/About.png'), "About...", self)
+        self.help_about_act.setStatusTip('About the LaTeX Table Creator')
+        self.help_about_act.triggered.connect(self.aboutDialog)
+
+        self.help_help_act = QAction(self.getIcon('icons/Help2.png'), "Help...", self)
+        self.help_help_act.setStatusTip('Help with ' + self.program_title + " Version " + self.version + "...")
+        self.help_help_act.triggered.connect(self.onHelp)
+
+        # Create the menu bar
+        menu_bar = self.menuBar()
+        menu_bar.setNativeMenuBar(False)
+
+        # Create file menu and add actions
+        file_menu = menu_bar.addMenu('File')
+        file_menu.addAction(self.file_new_act)
+        file_menu.addAction(self.file_open_act)
+        self.recent_menu = file_menu.addMenu("Open Recent")
+        self.recent_menu.aboutToShow.connect(self.updateRecentMenu)
+        file_menu.addAction(self.file_view_act)
+        file_menu.addAction(self.file_import_tex_act)
+        file_menu.addSeparator()
+        file_menu.addAction(self.file_saveas_act)
+        file_menu.addAction(self.file_save_session_act)
+        file_menu.addSeparator()
+        file_menu.addAction(self.file_close_act)
+        file_menu.addAction(quit_act)
+
+        # Create Edit menu and add actions
+        edit_menu = menu_bar.addMenu('Edit')
+        edit_menu.aboutToShow.connect(self.loadDeferredIcons)
+        edit_menu.addAction(self.copy_selected_act)
+        edit_menu.addAction(self.copy_all_act)
+        edit_menu.addAction(self.select_all_act)
+        edit_menu.addAction(self.paste_act)
+        edit_menu.addSeparator()
+        edit_menu.addAction(self.copy_latex_act)
+        edit_menu.addAction(self.paste_from_latex_act)
+        edit_menu.addSeparator()
+        edit_menu.addAction(self.copy_geogebra_act)
+        edit_menu.addAction(self.copy_maxima_act)
+        edit_menu.addAction(self.copy_sage_act)
+        edit_menu.addSeparator()
+        edit_menu.addAction(self.copy_bracket_act)
+        edit_menu.addAction(self.copy_curleybracket_act)
+        edit_menu.addAction(self.copy_angle_bracket_act)
+        edit_menu.addAction(self.copy_html_act)
+        edit_menu.addSeparator()
+        edit_menu.addAction(self.SelectTheme_act)
+        edit_menu.addSeparator()
+        edit_menu.addAction(self.Undo_act)
+        edit_menu.addAction(self.Redo_act)
+
+        # Create table menu and add actions
+        table_menu = menu_bar.addMenu('Table')
+        table_menu.addAction(self.add_row_above_act)
+        table_menu.addAction(self.add_row_below_act)
+        table_menu.addSeparator()
+        table_menu.addAction(self.add_col_before_act)
+        table_menu.addAction(self.add_col_after_act)
+        table_menu.addSeparator()
+        table_menu.addAction(self.delete_row_act)
+        table_menu.addAction(self.delete_col_act)
+        table_menu.addAction(self.delete_row_col_act)
+        table_menu.addSeparator()
+        table_menu.addAction(self.merge_cells_act)
+        table_menu.addAction(self.unmerge_cells_act)
+        table_menu.addSeparator()
+        table_menu.addAction(self.transpose_act)
+        table_menu.addAction(self.trim_act)
+        table_menu.addAction(self.convert_unicode_act)
+        table_menu.addAction(self.fill_cells_act)
+        table_menu.addAction(self.suggest_options_act)
+        table_menu.addAction(self.save_preset_act)
+        table_menu.addAction(self.delete_preset_act)
+        table_menu.addSeparator()
+        table_menu.addAction(self.clear_table_act)
+
+        format_menu = menu_bar.addMenu('Format')
+        format_menu.addAction(self.bold_act)
+        format_menu.addAction(self.italic_act)
+        format_menu.addAction(self.underline_act)
+        format_menu.addSeparator()
+        color_menu = format_menu.addMenu("Text Color")
+        for number, (name, value) in enumerate(LTCCellStyles.colors):
+            action = color_menu.addAction(name.capitalize() if name is not None else "Default")
+            action.triggered.connect(lambda checked=False, number=number: self.table_widget.setCellColor(number))
+        align_menu = format_menu.addMenu("Alignment")
+        for alignment, title in zip(LTCCellStyles.alignments, ["Column Default", "Left", "Center", "Right"]):
+            action = align_menu.addAction(title)
+            action.triggered.connect(lambda checked=False, alignment=alignment:
+                                     self.table_widget.setCellAlignment(alignment))
+        format_menu.addSeparator()
+        format_menu.addAction(self.clear_styles_act)
+
+        view_menu = menu_bar.addMenu('View')
+        self.view_menu = view_menu
+        view_menu.addAction(self.adjust_widths_act)
+        view_menu.addAction(self.adjust_heights_act)
+        view_menu.addAction(self.adjust_width_height_act)
+        view_menu.addAction(self.auto_fit_act)
+        view_menu.addSeparator()
+        view_menu.addAction(self.view_increase_font_size_act)
+        view_menu.addAction(self.view_decrease_font_size_act)
+        view_menu.addAction(self.view_reset_font_size_act)
+
+        # Create help menu and add actions
+        help_menu = menu_bar.addMenu('Help')
+        help_menu.addAction(self.help_help_act)
+        help_menu.addAction(self.help_about_act)
+
+    def loadDeferredIcons(self):
+        """
+        Load the icons of menu only actions, done once when a menu is first shown.
+        """
+        for action, icon_file in self.deferredIcons:
+            action.setIcon(self.getIcon(icon_file))
+        self.deferredIcons = []
+
+    def createToolBar(self):
+        """
+        Create toolbar for GUI
+        """
+        # Set up toolbar
+        tool_bar = QToolBar("Main Toolbar")
+        tool_bar.setIconSize(QSize(18, 18))
+        tool_bar.setMovable(False)
+        self.addToolBar(tool_bar)
+
+        # Add actions to toolbar
+        tool_bar.addAction(self.file_new_act)
+        tool_bar.addAction(self.file_open_act)
+        tool_bar.addAction(self.file_saveas_act)
+        tool_bar.addSeparator()
+        tool_bar.addAction(self.copy_selected_act)
+        tool_bar.addAction(self.copy_all_act)
+        tool_bar.addAction(self.paste_act)
+        tool_bar.addSeparator()
+        tool_bar.addAction(self.copy_latex_act)
+
+        # Options presets, the list is filled from the presets file.
+        self.presets = LTCPresets()
+        self.preset_selector = QComboBox()
+        self.preset_selector.setPlaceholderText("Preset")
+        self.preset_selector.setMinimumWidth(150)
+        self.preset_selector.setToolTip("Apply a named options preset")
+        self.preset_selector.textActivated.connect(self.applyPreset)
+        self.updatePresetSelector()
+        tool_bar.addWidget(self.preset_selector)
+        tool_bar.addSeparator()
+        tool_bar.addAction(self.adjust_widths_act)
+        tool_bar.addAction(self.adjust_heights_act)
+        tool_bar.addAction(self.adjust_width_height_act)
+        tool_bar.addSeparator()
+        tool_bar.addAction(self.view_increase_font_size_act)
+        tool_bar.addAction(self.view_decrease_font_size_act)
+        tool_bar.addAction(self.view_reset_font_size_act)
+        tool_bar.addSeparator()
+        tool_bar.addAction(self.Undo_act)
+        tool_bar.addAction(self.Redo_act)
+        tool_bar.addSeparator()
+        tool_bar.addAction(self.help_help_act)
+        tool_bar.addAction(self.help_about_act)
+
+    def increaseWorksheetFontSize(self):
+        self.table_widget.increaseFontSize()
+        self.fontSizeChanged()
+
+    def decreaseWorksheetFontSize(self):
+        self.table_widget.decreaseFontSize()
+        self.fontSizeChanged()
+
+    def resetWorksheetFontSize(self):
+        self.table_widget.resetFontSize()
+        self.fontSizeChanged()
+
+    def fontSizeChanged(self):
+        """
+        Keeps the font size for new tables and refits the columns in auto-fit mode.
+        """
+        self.settings.update({'Font Size': self.table_widget.fontPointSize})
+        if self.autoFitColumns:
+            self.adjustWidths()
+
+    def setAutoFit(self, on):
+        """
+        Turns the auto-fit mode on or off for all documents.
+        """
+        self.autoFitColumns = on
+        for document in self.documents():
+            if not document.isReleased():
+                document.table_widget.autoFit = on
+        if on:
+            self.adjustWidths()
+
+    def SelectTheme(self):
+        items = QStyleFactory.keys()
+        if len(items) <= 1:
+            return
+
+        items.sort()
+        item, ok = QInputDialog.getItem(self, "Select Theme", "Available Themes", items, 0, False)
+
+        if ok:
+            QApplication.instance().setStyle(item)
+            self.currentTheme = item
+            if not self.settings.update({'Theme': item}):
+                QMessageBox.warning(self, "File Not Saved", "The settings file could not be saved.",
+                                    QMessageBox.Ok)
+
+    def createDockWidget(self):
+        """
+        Create dock widget which will hold the options panes.
+        """
+        # Set up dock widget
+        self.dock_widget = QDockWidget()
+        self.dock_widget.setWindowTitle("LaTeX Options")
+
+        # Set dock attributes
+        self.dock_widget.setAllowedAreas(Qt.LeftDockWidgetArea | Qt.RightDockWidgetArea)
+
+        self.dock_widget.setFeatures(QDockWidget.DockWidgetFloatable |
+                                     QDockWidget.DockWidgetMovable)
+        self.options_pane = LTCOptionsEditorPane()
+
+        # Create a scroll area for the options panels.
+        scroll_area = QScrollArea()
+        scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
+        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setWidget(self.options_pane)
+
+        # Add and place the dock.
+        self.dock_widget.setWidget(scroll_area)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.dock_widget)
+        self.options_pane.model.optionsChanged.connect(self.schedulePreview)
+        self.options_pane.model.optionsChanged.connect(self.checkPresetSelection)
+
+        # The code preview dock is hidden until it is selected in the View menu.
+        self.preview_pane = LTCPreviewPane(self)
+        self.preview_dock = QDockWidget()
+        self.preview_dock.setWindowTitle("Code Preview")
+        self.preview_dock.setObjectName("Code Preview")
+        self.preview_dock.setAllowedAreas(Qt.BottomDockWidgetArea | Qt.TopDockWidgetArea |
+                                          Qt.LeftDockWidgetArea | Qt.RightDockWidgetArea)
+        self.preview_dock.setWidget(self.preview_pane)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.preview_dock)
+        self.preview_dock.hide()
+        self.preview_pane.schedule()
+
+        preview_act = self.preview_dock.toggleViewAction()
+        preview_act.setText("Code Preview")
+        preview_act.setShortcut('Ctrl+Shift+P')
+        preview_act.setStatusTip('Show or hide the code preview')
+        self.view_menu.addSeparator()
+        self.view_menu.addAction(preview_act)
+
+    def aboutDialog(self):
+        """
+        Display information about program dialog box
+        """
+        QMessageBox.about(self, self.program_title + "  Version " + self.version,
+                          self.authors + "\nVersion " + self.version +
+                          "\nCopyright " + self.copyright +
+                          "\nDeveloped in Python using the PySide6 GUI toolset.\n" + self.licence)
+
+    def onHelp(self):
+        """
+        Display information about program dialog box
+        """
+        self.url_home_string = "file://" + self.resource_path("Help/index.html")
+        webbrowser.open(self.url_home_string)
+
+    def openFile(self):
+        """
+        Open a binary file containing a table item data and load it into the table.
+        """
+        file_name, _ = QFileDialog.getOpenFileName(self, "Open File", "",
+                                                   "Table Data Files (*.dat);;Session Files (*.ltcs);;"
+                                                   "All Files (*.*)")
+        self.openPath(file_name)
+
+    def openPath(self, file_name):
+        """
+        Opens a table data or session file into the current document.
+        """
+        if file_name and not os.path.isfile(file_name):
+            QMessageBox.warning(self, "File Not Loaded", "The file " + file_name + " could not be loaded.",
+                                QMessageBox.Ok)
+        elif file_name.lower().endswith('.ltcs'):
+            self.openSession(file_name)
+        elif file_name:
+            document = self.currentDocument()
+
+            def loaded(items):
+                if items is None:
+                    QMessageBox.warning(self, "File Not Loaded", "The file " + file_name + " could not be loaded.",
+                                        QMessageBox.Ok)
+                    return
+                self.loadTable(items)
+                self.setDocumentTitle(os.path.basename(file_name))
+                self.settings.addRecentFile(file_name)
+
+            self.task_runner.start("Open", self.loadDataFile, (file_name,), loaded, document,
+                                   os.path.getsize(file_name) // 8)
+
+    def updateRecentMenu(self):
+        """
+        Lists the recently used files, done each time the menu is shown.
+        """
+        self.recent_menu.clear()
+        for file_name in self.settings.get('Recent Files'):
+            action = self.recent_menu.addAction(file_name)
+            action.triggered.connect(lambda checked=False, name=file_name: self.openPath(name))
+        if self.recent_menu.isEmpty():
+            self.recent_menu.addAction("No Recent Files").setEnabled(False)
+
+    @staticmethod
+    def loadDataFile(file_name, task=None):
+        """
+        Reads a table data file, returns None if it could not be loaded.
+        """
+        try:
+            with open(file_name, 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            return None
 
-        # Close math mode and stretch.
-        if mathMode:
-            texCode += '\\] \n'
+    @staticmethod
+    def saveDataFile(file_name, items, task=None):
+        """
+        Writes a table data file, returns True if it was saved.
+        """
+        try:
+            with open(file_name, 'wb') as f:
+                pickle.dump(items, f)
+        except Exception:
+            return False
+        return True
 
-        if stretch:
-            texCode += '} \n'
+    def openSession(self, file_name):
+        """
+        Load a session file, restoring the table, options, undo history, font
+        size and column widths.
+        """
+        try:
+            session = self.readSession(file_name)
+            self.table_widget.setSessionState(session['Table'])
+            self.options_pane.setOptionsInfo(session['Options'])
+            self.setSizeSpinnersToTableSize()
+            self.setDocumentTitle(os.path.basename(file_name))
+            self.settings.addRecentFile(file_name)
+        except Exception:
+            QMessageBox.warning(self, "File Not Loaded", "The file " + file_name + " could not be loaded.",
+                                QMessageBox.Ok)
+
+    @classmethod
+    def readSession(cls, file_name):
+        """
+        Reads a session file into the session dictionary, raises an exception
+        if the file could not be read.
+        """
+        with open(file_name, 'rb') as f:
+            data = f.read()
+        if not data.startswith(cls.sessionMagic):
+            raise ValueError('Not a session file.')
+        return json.loads(zlib.decompress(data[len(cls.sessionMagic):]).decode('utf-8'))
+
+    @classmethod
+    def exportTableFile(cls, file_name, preset=None, presets=None):
+        """
+        Creates the LaTeX code of a table data or session file without a
+        window.  The options of a session are used, or the defaults for a data
+        file, with the named preset set over them.  Raises an exception if the
+        file could not be read or there is no such preset.
+        """
+        if file_name.lower().endswith('.ltcs'):
+            session = cls.readSession(file_name)
+            try:
+                state = session['Table']
+                rows = state['Rows']
+                items = [list(rows[rowId]) for rowId in state['History'][state['History Position']]]
+                spanHistory = state.get('Spans', [])
+                spans = LTCSpanIndex(spanHistory[state['History Position']] if len(spanHistory) > 0 else [])
+                styleHistory = state.get('Style History', [])
+                styles = None
+                if len(styleHistory) > 0:
+                    styles = LTCCellStyles.fromList(state['Styles'][styleHistory[state['History Position']]])
+                options = session['Options']
+            except (KeyError, IndexError, TypeError, AttributeError):
+                raise ValueError('The file ' + file_name + ' is not a complete session file.')
+        else:
+            items = cls.loadDataFile(file_name)
+            if items is None:
+                raise ValueError('The file ' + file_name + ' could not be loaded.')
+            spans = None
+            styles = None
+            options = {}
+
+        model = LTCOptionsModel()
+        model.update(options)
+        if preset is not None:
+            if presets is None:
+                presets = LTCPresets()
+            model.update(presets.options(preset, options))
+        return LTCExporter().createLaTeXCode(items, model.snapshot(), spans, styles)
+
+    def saveSession(self):
+        """
+        Save the table, options, undo history, font size and column widths to
+        a compressed session file.
+        """
+        dialog = QFileDialog()
+        dialog.setFilter(dialog.filter() | QDir.Hidden)
+        dialog.setDefaultSuffix('ltcs')
+        dialog.setAcceptMode(QFileDialog.AcceptSave)
+        dialog.setNameFilters(['Session Files (*.ltcs)'])
+        dialog.setWindowTitle('Save Session As')
 
-        return texCode
+        if dialog.exec() == QDialog.Accepted:
+            filelist = dialog.selectedFiles()
+            if len(filelist) > 0:
+                file_name = filelist[0]
+                self.table_widget.closeEditing()
+                session = {'Version': 1,
+                           'Table': self.table_widget.getSessionState(),
+                           'Options': dict(self.options_pane.getOptionsInfo())}
+                try:
+                    data = zlib.compress(json.dumps(session, separators=(',', ':')).encode('utf-8'))
+                    with open(file_name, 'wb') as f:
+                        f.write(self.sessionMagic + data)
+                    self.settings.addRecentFile(file_name)
+                except Exception:
+                    QMessageBox.warning(self, "File Not Saved", "The file " + file_name + " could not be saved.",
+                                        QMessageBox.Ok)
 
-    def createSpecialMatrix(self, textable, options):
+    def openReadOnlyView(self):
         """
-        Creates the LaTeX code for sprcial matrix types.
+        Open a large CSV or TSV file in a read-only view window.  Cells are read
+        from the file on demand and only a selected block is loaded into the grid.
         """
-        texCode = ''
+        file_name, _ = QFileDialog.getOpenFileName(self, "Open as Read-Only View", "",
+                                                   "Delimited Text Files (*.csv *.tsv *.txt);;All Files (*.*)")
 
-        rows = len(textable)
-        cols = len(textable[0])
+        if file_name:
+            try:
+                datafile = LTCDelimitedFile(file_name)
+            except Exception:
+                QMessageBox.warning(self, "File Not Loaded", "The file " + file_name + " could not be loaded.",
+                                    QMessageBox.Ok)
+                return
 
-        mathMode = options['Math Mode']
-        stretch = options['Array Stretch']
+            viewer = LTCReadOnlyViewer(self, datafile)
+            self.programList.append(viewer)
+            viewer.show()
 
-        mattype = options['Special Matrix Decoration']
+    def importTexDocument(self):
+        """
+        Index the table environments of a LaTeX document and load the ones the
+        user selects.  The first is loaded into the current tab and any others
+        into new tabs.
+        """
+        file_name, _ = QFileDialog.getOpenFileName(self, "Import from LaTeX Document", "",
+                                                   "LaTeX Files (*.tex);;All Files (*.*)")
 
-        # Include package hint.
-        texCode += '% Package: \\usepackage{amsmath} \n\n'
+        if not file_name:
+            return
 
-        # Processs arraystretch and math mode.
-        if stretch:
-            texCode += '{ \n'
-            texCode += '\\renewcommand{\\arraystretch}{1.0}\n\n'
+        try:
+            index = LTCTexDocumentIndex.load(file_name)
+        except Exception:
+            QMessageBox.warning(self, "File Not Loaded", "The file " + file_name + " could not be loaded.",
+                                QMessageBox.Ok)
+            return
 
-        if mathMode:
-            texCode += '\\[ \n'
+        if len(index.environments) == 0:
+            QMessageBox.information(self, "No Tables Found", "The file " + file_name +
+                                    " does not contain any supported table environments.", QMessageBox.Ok)
+            return
 
-        texCode += '\\begin{' + mattype + '} \n'
+        dialog = LTCTexImportDialog(index, self)
+        if dialog.exec() != QDialog.Accepted:
+            return
 
-        # Load matrix contents.
-        for i in range(rows):
-            for j in range(cols):
-                texCode += textable[i][j]
+        entries = dialog.selectedEnvironments()
+        try:
+            tables = index.parseEnvironments(entries)
+        except Exception:
+            QMessageBox.warning(self, "File Not Loaded", "The file " + file_name + " could not be loaded.",
+                                QMessageBox.Ok)
+            return
 
-                if j < cols - 1:
-                    texCode += ' & '
-                else:
-                    texCode += ' \\\\ '
+        first = True
+        for entry, items in zip(entries, tables):
+            if len(items) == 0:
+                continue
+            if not first:
+                self.newDocument()
+            self.loadTable(items)
+            self.options_pane.selectGridType(entry['Environment'])
+            self.setDocumentTitle(os.path.basename(file_name))
+            first = False
 
-            texCode += '\n'
+    def saveFile(self):
+        """
+        Save the table to a binary file.
+        """
+        dialog = QFileDialog()
+        dialog.setFilter(dialog.filter() | QDir.Hidden)
+        dialog.setDefaultSuffix('dat')
+        dialog.setAcceptMode(QFileDialog.AcceptSave)
+        dialog.setNameFilters(['Table Data Files (*.dat)'])
+        dialog.setWindowTitle('Save As')
 
-        texCode += '\\end{' + mattype + '} \n'
+        if dialog.exec() == QDialog.Accepted:
+            filelist = dialog.selectedFiles()
+            if len(filelist) > 0:
+                file_name = filelist[0]
+                items = self.table_widget.getSnapshot()
 
-        # Close arraystretch and math mode.
-        if mathMode:
-            texCode += '\\] \n'
+                def saved(ok):
+                    if not ok:
+                        QMessageBox.warning(self, "File Not Saved", "The file " + file_name + " could not be saved.",
+                                            QMessageBox.Ok)
+                    else:
+                        self.settings.addRecentFile(file_name)
 
-        if stretch:
-            texCode += '} \n'
+                self.task_runner.start("Save", self.saveDataFile, (file_name, items), saved,
+                                       cells=self.tableCells(items))
 
-        return texCode
+    def tableCells(self, items):
+        """
+        Number of cells in a list of row lists, used to decide if an operation
+        runs in the background.
+        """
+        return len(items) * len(items[0]) if len(items) > 0 else 0
 
-    def createLaTeXCode(self):
+    def createLaTeXCode(self, currentTable=None):
         """
-        Entry point for the LaTeX code creation code.  Farms out the code
-        by the type of structure tht is requested.
+        Creates the LaTeX code for the table with the current options.  If no
+        table is given the contents, merged cells and cell styles of the grid
+        are used.
         """
-        currentTable = self.table_widget.getTableContents()
+        spans = None
+        styles = None
+        revisions = None
+        if currentTable is None:
+            currentTable = self.table_widget.getTableContents()
+            spans = self.table_widget.spanIndex
+            styles = self.table_widget.cellStyles
         options = self.options_pane.getOptionsInfo()
+        if spans is not None:
+            revisions = self.columnRevisions(options)
+        return LTCExporter().createLaTeXCode(currentTable, options, spans, styles, revisions)
 
-        texCode = ''
-        gridtype = options['Grid Type']
-        if (gridtype == 'longtable') or (gridtype == 'tabular'):
-            texCode = self.createLongtable(currentTable, options)
-        elif gridtype == 'tabbing':
-            texCode = self.createTabbing(currentTable, options)
-        elif gridtype == 'array':
-            texCode = self.createArray(currentTable, options)
-        elif gridtype == 'matrix':
-            texCode = self.createMatrix(currentTable, options)
-        elif gridtype == 'Special Matrix':
-            texCode = self.createSpecialMatrix(currentTable, options)
-        else:
-            print('error')
+    def columnRevisions(self, options):
+        """
+        Returns the column revisions of the table when the options have
+        conditional or number formats, which cache their results by them, or
+        None.
+        """
+        if options['Conditional Formats'].strip() == '' and options['Number Formats'].strip() == '':
+            return None
+        return self.table_widget.columnRevisions()
 
-        return texCode
+    def exportToClipboard(self, title, method, items, *args):
+        """
+        Runs the exporter method on the items in the background and copies the
+        result to the clipboard.
+        """
+        def export(*args, task=None):
+            return method(LTCExporter(task), *args)
+
+        self.task_runner.start(title, export, (items,) + args, self.clipboard.setText,
+                               cells=self.tableCells(items))
 
     def latexCopy(self):
         """
         Calls the code creator and sends it to the clipboard.
         """
-        texCode = self.createLaTeXCode()
-        self.clipboard.setText(texCode)
+        options = self.options_pane.getOptionsInfo()
+        self.exportToClipboard("Copy as LaTeX", LTCExporter.createLaTeXCode, self.table_widget.getSnapshot(), options,
+                               self.table_widget.spanIndex, self.table_widget.cellStyles, self.columnRevisions(options))
 
     def copyAll(self):
         """
         Copies the table to the clipboard, tab delimited separation.
         """
-        items = self.table_widget.getTableContents()
-        str = self.itemsToTabString(items)
-        self.clipboard.setText(str)
+        self.exportToClipboard("Copy All", LTCExporter.itemsToTabString, self.table_widget.getSnapshot())
 
     def copySelected(self):
         """
         Copies the table selection to the clipboard, tab delimited separation.
         """
         items = self.table_widget.getSelectedTableContents()
-        str = self.itemsToTabString(items)
-        self.clipboard.setText(str)
+        self.exportToClipboard("Copy Selected", LTCExporter.itemsToTabString, items)
 
     def copyMaxima(self):
         """
         Copies the table as Maxima matrix code to the clipboard.
         """
-        items = self.table_widget.getTableContents()
-
-        retstr = 'matrix('
-        for i in range(len(items)):
-            row = items[i]
-            retstr = retstr + '['
-            for j in range(len(row)):
-                retstr = retstr + row[j]
-                if (j < len(row) - 1):
-                    retstr = retstr + ','
-
-            retstr = retstr + ']'
-
-            if (i < len(items) - 1):
-                retstr = retstr + ','
-
-        retstr = retstr + ')'
-        self.clipboard.setText(retstr)
+        self.exportToClipboard("Copy as Maxima", LTCExporter.createMaxima, self.table_widget.getSnapshot())
 
     def copySage(self):
         """
         Copies the table as SageMath matrix code to the clipboard.
         """
-        items = self.table_widget.getTableContents()
-
-        retstr = 'matrix(QQ, ['
-        for i in range(len(items)):
-            row = items[i]
-            retstr = retstr + '['
-            for j in range(len(row)):
-                retstr = retstr + row[j]
-                if (j < len(row) - 1):
-                    retstr = retstr + ','
-
-            retstr = retstr + ']'
-
-            if (i < len(items) - 1):
-                retstr = retstr + ','
-
-        retstr = retstr + '])'
-        self.clipboard.setText(retstr)
+        self.exportToClipboard("Copy as SageMath", LTCExporter.createSage, self.table_widget.getSnapshot())
 
     def copyHTML(self):
         """
         Copies the table as HTML code to the clipboard.
         """
-        items = self.table_widget.getTableContents()
-
-        retstr = '<TABLE BORDER=1 CELLPADDING=1 CELLSPACING=0>\n'
-        for i in range(len(items)):
-            row = items[i]
-            retstr = retstr + '<TR>\n'
-            for j in range(len(row)):
-                retstr = retstr + '<TD>' + row[j] + '</TD>'
-
-            retstr = retstr + '\n</TR>\n'
-
-        retstr = retstr + '</TABLE>'
-        self.clipboard.setText(retstr)
+        self.exportToClipboard("Copy as HTML", LTCExporter.createHTML, self.table_widget.getSnapshot(),
+                               self.table_widget.cellStyles)
 
     def copySpecial(self, ld, rd):
         """
         Copies the table using the specified delimiters (ld and rd) to the clipboard.
         """
-        items = self.table_widget.getTableContents()
-        str = self.itemsToDelimitedString(items, ld, rd)
-        self.clipboard.setText(str)
+        self.exportToClipboard("Copy", LTCExporter.itemsToDelimitedString, self.table_widget.getSnapshot(), ld, rd)
 
     def copyGeoGebra(self):
         """
@@ -2083,44 +6958,62 @@ class LaTeXTableEditor(QMainWindow):
 
     def paste(self):
         """
-        Pastes the clipboard contents, assumed to be tab delimited, to the table.
+        Pastes the clipboard contents to the table.  If the clipboard holds an
+        HTML table, as copied from spreadsheets and web pages, it is used,
+        otherwise the text is assumed to be tab delimited.
         """
-        str = self.clipboard.text()
-        items = self.tabStringToItems(str)
-        self.table_widget.paste(items)
-        self.setSizeSpinnersToTableSize()
+        html = ''
+        mimeData = self.clipboard.mimeData()
+        if mimeData is not None and mimeData.hasHtml():
+            html = mimeData.html()
+        text = self.clipboard.text()
+
+        def pasted(items):
+            self.table_widget.paste(items)
+            self.setSizeSpinnersToTableSize()
+
+        self.task_runner.start("Paste", self.parseClipboard, (html, text), pasted, self.currentDocument(),
+                               (len(html) + len(text)) // 8)
+
+    @staticmethod
+    def parseClipboard(html, text, task=None):
+        """
+        Converts the clipboard contents to a list of row lists, from the HTML
+        table if there is one and from the tab delimited text otherwise.
+        """
+        items = []
+        if html:
+            items = LTCHTMLTableParser.parseTable(html)
+        if len(items) == 0:
+            items = LaTeXTableEditor.tabStringToItems(text)
+        return items
 
     def pasteLatex(self):
         """
         Pastes the clipboard contents, assumed to be LaTeX format, to the table.
         """
-        items = []
-        str = self.clipboard.text()
-        str = str.replace('\\&', '<~~amp~~>')
-        str = str.replace('\\hline', '')
-        strlist = str.split('\\\\')
+        text = self.clipboard.text()
 
-        for line in strlist:
-            line = line.rstrip().lstrip()
-            if line != '':
-                linelist = line.split('&')
-                for i in range(len(linelist)):
-                    newline = linelist[i]
-                    newline = newline.replace('<~~amp~~>', '\\&')
-                    newline = newline.rstrip().lstrip()
-                    linelist[i] = newline
-                items.append(linelist)
-
-        self.table_widget.setRowCount(1)
-        self.table_widget.setColumnCount(1)
-        self.table_widget.setCurrentCell(0, 0)
-        self.table_widget.paste(items)
+        def parsed(items):
+            if len(items) > 0:
+                self.loadTable(items)
+
+        self.task_runner.start("Paste from LaTeX", lambda text, task=None: LTCLaTeXParser().parse(text), (text,),
+                               parsed, self.currentDocument(), len(text) // 8)
+
+    def loadTable(self, items):
+        """
+        Replaces the table with the list of row lists of items.
+        """
+        self.table_widget.replaceTable(items)
         self.setSizeSpinnersToTableSize()
 
     def setSizeSpinnersToTableSize(self):
         """
-        Resets the spinner values to match the size of the table.
+        Resets the spinner values to match the size of the table.  A pending
+        spinner resize is dropped.
         """
+        self.currentDocument().resize_timer.stop()
         self.rows.blockSignals(True)
         self.columns.blockSignals(True)
         if self.table_widget.rowCount() != self.rows.value():
@@ -2130,44 +7023,8 @@ class LaTeXTableEditor(QMainWindow):
         self.rows.blockSignals(False)
         self.columns.blockSignals(False)
 
-    def itemsToDelimitedString(self, items, ld, rd):
-        """
-        Converts a list of row lists of table elements to a string delimited by ld and rd
-        characters.
-        """
-        retstr = ld
-        for i in range(len(items)):
-            row = items[i]
-            retstr = retstr + ld
-            for j in range(len(row)):
-                retstr = retstr + row[j]
-                if (j < len(row) - 1):
-                    retstr = retstr + ','
-
-            retstr = retstr + rd
-
-            if (i < len(items) - 1):
-                retstr = retstr + ','
-
-        retstr = retstr + rd
-        return retstr
-
-    def itemsToTabString(self, items):
-        """
-        Converts a list of row lists of table elements to a tab delimited string.
-        """
-        retstr = ''
-        for i in range(len(items)):
-            row = items[i]
-            for j in range(len(row)):
-                retstr = retstr + row[j]
-                if (j == len(row) - 1):
-                    retstr = retstr + '\n'
-                else:
-                    retstr = retstr + '\t'
-        return retstr
-
-    def tabStringToItems(self, tdstr):
+    @staticmethod
+    def tabStringToItems(tdstr):
         """
         Converts a tab delimited string to a list of row lists of table elements.
         """
@@ -2229,34 +7086,156 @@ class LaTeXTableEditor(QMainWindow):
         self.table_widget.deleteRowsColumns()
         self.setSizeSpinnersToTableSize()
 
-    def clearTable(self):
+    def mergeCells(self):
         """
-        Clears the entire table.
+        Merges the selected cells.
         """
-        self.table_widget.clearTable()
+        self.table_widget.mergeCells()
 
-    def newtable(self):
+    def unmergeCells(self):
+        """
+        Splits the merged cells in the selection.
+        """
+        self.table_widget.unmergeCells()
+
+    def boldCells(self):
+        """
+        Toggles bold in the selected cells.
+        """
+        self.table_widget.toggleCellStyle(LTCCellStyles.bold)
+
+    def italicCells(self):
+        """
+        Toggles italic in the selected cells.
+        """
+        self.table_widget.toggleCellStyle(LTCCellStyles.italic)
+
+    def underlineCells(self):
+        """
+        Toggles the underline in the selected cells.
+        """
+        self.table_widget.toggleCellStyle(LTCCellStyles.underline)
+
+    def clearCellStyles(self):
         """
-        Creates a new instance of the program and launches it.  The
-        programList variable keeps the new instance from losing its
-        link and being automatically removed.
+        Removes the styles of the selected cells.
         """
-        # Seems to work, look for "better" solution.
-        self.newwindow = LaTeXTableEditor()
-        self.programList.append(self.newwindow)
+        self.table_widget.styleCells(0, LTCCellStyles.allMask)
+
+    def clearTable(self):
+        """
+        Clears the entire table.
+        """
+        self.table_widget.clearTable()
 
     def transpose(self):
         """
         Transposes the table.
         """
-        self.table_widget.transpose()
-        self.setSizeSpinnersToTableSize()
+        items = self.table_widget.getSnapshot()
+
+        def transposed(result):
+            self.table_widget.setTableItems(result, ['transpose'], self.table_widget.spanIndex.transpose(),
+                                            self.table_widget.cellStyles.transpose())
+            self.setSizeSpinnersToTableSize()
+
+        self.task_runner.start("Transpose", LTC_Table.transposeItems, (items,), transposed, self.currentDocument(),
+                               self.tableCells(items))
 
     def trim(self):
         """
         Trims whitespace from the front and back of all table elements.
         """
-        self.table_widget.trimcells()
+        items = self.table_widget.getSnapshot()
+
+        def trimmed(result):
+            self.table_widget.setTableItems(result, ['trim'])
+
+        self.task_runner.start("Trim", LTC_Table.trimItems, (items,), trimmed, self.currentDocument(),
+                               self.tableCells(items))
+
+    def convertUnicode(self):
+        """
+        Converts the Unicode characters in the cells to LaTeX, for math if the
+        options make math mode code.
+        """
+        items = self.table_widget.getSnapshot()
+        options = self.options_pane.getOptionsInfo()
+        math = options['Math Mode'] or options['Grid Type'] in ('array', 'matrix', 'Special Matrix')
+
+        def converted(result):
+            self.table_widget.setTableItems(result, ['unicode', math])
+
+        self.task_runner.start("Convert Unicode", LTCUnicodeConverter.convertItems, (items, math), converted,
+                               self.currentDocument(), self.tableCells(items))
+
+    def suggestOptions(self):
+        """
+        Sets the column alignments and the tabbing column width from the column
+        statistics, numeric tables are right aligned.
+        """
+        stats = self.table_widget.getColumnStatistics()
+        align = stats.suggestedAlignment()
+        self.options_pane.applySuggestions({'Table Column Align': align, 'Array Column Align': align,
+                                            'Tabbing Column Width': stats.suggestedTabbingWidth()})
+
+    def updatePresetSelector(self, selected=None):
+        """
+        Fills the preset list from the presets and selects the given preset.
+        """
+        self.preset_selector.blockSignals(True)
+        self.preset_selector.clear()
+        self.preset_selector.addItems(self.presets.names())
+        self.preset_selector.setCurrentIndex(self.preset_selector.findText(selected) if selected else -1)
+        self.preset_selector.blockSignals(False)
+
+    def applyPreset(self, name):
+        """
+        Sets all the options of the preset as one change.
+        """
+        preset = self.presets.get(name)
+        if preset is not None:
+            self.options_pane.setOptionsInfo(preset)
+            self.preset_selector.setCurrentIndex(self.preset_selector.findText(name))
+
+    def checkPresetSelection(self):
+        """
+        Clears the preset selection once the options differ from the preset.
+        """
+        name = self.preset_selector.currentText()
+        if self.presets.get(name) is not None and self.presets.options(name) != self.options_pane.getOptionsInfo():
+            self.preset_selector.setCurrentIndex(-1)
+
+    def savePreset(self):
+        """
+        Saves the current options under a name given by the user.
+        """
+        name, ok = QInputDialog.getText(self, "Save Preset", "Preset name:",
+                                        text=self.preset_selector.currentText())
+        name = name.strip()
+        if not ok or name == '':
+            return
+        if name in self.presets.names():
+            if QMessageBox.question(self, "Replace Preset", "Replace the preset " + name + "?") != QMessageBox.Yes:
+                return
+        if not self.presets.set(name, self.options_pane.getOptionsInfo()):
+            QMessageBox.warning(self, "File Not Saved", "The presets file could not be saved.", QMessageBox.Ok)
+        self.updatePresetSelector(name)
+
+    def deletePreset(self):
+        """
+        Deletes a preset chosen by the user.
+        """
+        names = self.presets.names()
+        if len(names) == 0:
+            return
+        selected = self.preset_selector.currentText()
+        name, ok = QInputDialog.getItem(self, "Delete Preset", "Preset:", names,
+                                        names.index(selected) if selected in names else 0, False)
+        if ok:
+            if not self.presets.remove(name):
+                QMessageBox.warning(self, "File Not Saved", "The presets file could not be saved.", QMessageBox.Ok)
+            self.updatePresetSelector(selected if selected != name else None)
 
     def filltext(self):
         """
@@ -2264,26 +7243,57 @@ class LaTeXTableEditor(QMainWindow):
         """
         fill_text, ok = QInputDialog.getText(self, "Fill Cells With", "Text:")
         if ok:
-            self.table_widget.fillcells(fill_text)
+            rows = self.table_widget.rowCount()
+            cols = self.table_widget.columnCount()
+
+            def filled(result):
+                self.table_widget.setTableItems(result, ['fill', fill_text])
+
+            self.task_runner.start("Fill", LTC_Table.fillItems, (rows, cols, fill_text), filled,
+                                   self.currentDocument(), rows * cols)
 
     def adjustWidths(self):
         """
-        Set the column widths to fit the size of the data.
+        Set the column widths to fit the size of the data.  Large tables are
+        measured in the background on a sample of the cells, the rows in view
+        and the rows with the longest items of each column.
         """
-        self.table_widget.resizeColumnsToContents()
+        document = self.currentDocument()
+        table = self.table_widget
+        items = table.getSnapshot()
+        if self.tableCells(items) < LTCTaskRunner.syncCellLimit:
+            table.resizeColumnsToContents()
+            return
+
+        def measured(result):
+            if document not in self.documents() or document.isReleased():
+                return
+            widths, stats = result
+            document.table_widget.applyColumnWidths(widths)
+            if stats.revision == document.table_widget.revision:
+                document.table_widget.columnStats = stats
+
+        self.task_runner.start("Adjust Column Widths", LTC_Table.measureColumnWidths,
+                               (items, table.columnStats, table.visibleRows(), QFont(table.font()), table.revision),
+                               measured, cells=self.tableCells(items))
 
     def adjustHeights(self):
         """
-        Set the row heights to fit the size of the data.
+        Set the row heights to fit the size of the data.  For large tables only
+        the rows in view are fitted.
         """
-        self.table_widget.resizeRowsToContents()
+        table = self.table_widget
+        if table.rowCount() * table.columnCount() < LTCTaskRunner.syncCellLimit:
+            table.resizeRowsToContents()
+        else:
+            table.fitVisibleRowHeights()
 
     def adjustWidthHeight(self):
         """
         Set the row heights and column widths to fit the size of the data.
         """
-        self.table_widget.resizeColumnsToContents()
-        self.table_widget.resizeRowsToContents()
+        self.adjustWidths()
+        self.adjustHeights()
 
     def undo(self):
         """
@@ -2304,8 +7314,40 @@ if __name__ == '__main__':
     """
     Initiate the program. 
     """
-    app = QApplication(sys.argv)
+    arg_parser = argparse.ArgumentParser(prog="LaTeXTableCreator")
+    arg_parser.add_argument('--profile-startup', action='store_true',
+                            help="print a per-phase timing breakdown of the program start")
+    arg_parser.add_argument('--export', metavar='FILE',
+                            help="write the LaTeX code of a table data (.dat) or session (.ltcs) file and exit")
+    arg_parser.add_argument('--preset', metavar='NAME', help="options preset used by --export")
+    arg_parser.add_argument('--output', metavar='FILE', help="file written by --export, standard output if omitted")
+    args, qt_args = arg_parser.parse_known_args()
+    LTCStartupProfiler.enabled = args.profile_startup
+    LTCStartupProfiler.mark("Imports", startupClock)
+    QApplication.setApplicationName("LaTeXTableCreator")
+    LTCSettings.instance().applyPerformance()
+    LTCStartupProfiler.mark("Settings")
+
+    if args.export:
+        try:
+            texCode = LaTeXTableEditor.exportTableFile(args.export, args.preset)
+            if args.output:
+                with open(args.output, 'w', encoding='utf-8') as f:
+                    f.write(texCode)
+            else:
+                sys.stdout.write(texCode)
+        except LTCUnknownPreset:
+            sys.exit("LaTeXTableCreator: no preset named " + args.preset)
+        except Exception as e:
+            sys.exit("LaTeXTableCreator: " + str(e))
+        sys.exit(0)
+
+    app = QApplication(sys.argv[:1] + qt_args)
     window = LaTeXTableEditor(app)
     progcss = LTCappcss()
     app.setStyleSheet(progcss.getCSS())
+    LTCStartupProfiler.mark("Style sheet")
+
+    # The report is printed once the event loop has processed the first events.
+    QTimer.singleShot(0, LTCStartupProfiler.report)
     sys.exit(app.exec())
@@ -0,0 +1,47 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# The tests run without a display and keep settings and recovery files out of
+# the user's directories.
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+dataDirectory = tempfile.mkdtemp(prefix='ltc-tests-')
+os.environ['XDG_DATA_HOME'] = os.path.join(dataDirectory, 'data')
+os.environ['XDG_CONFIG_HOME'] = os.path.join(dataDirectory, 'config')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtWidgets import QApplication, QTableWidgetSelectionRange
+
+import LaTeXTableCreator as LTC
+
+
+@pytest.fixture(scope='session')
+def app():
+    application = QApplication.instance() or QApplication(sys.argv[:1])
+    LTC.app = application
+    return application
+
+
+@pytest.fixture
+def table(app):
+    widget = LTC.LTC_Table()
+    yield widget
+    if widget.journal is not None:
+        widget.journal.discard()
+
+
+def select(table, row, col, rows=1, cols=1):
+    """
+    Selects a block of cells the way a mouse drag does.
+    """
+    table.clearSelection()
+    table.setCurrentCell(row, col)
+    table.setRangeSelected(QTableWidgetSelectionRange(row, col, row + rows - 1, col + cols - 1), True)
+
+
+@pytest.fixture
+def selectCells():
+    return select
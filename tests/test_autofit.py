@@ -0,0 +1,51 @@
+import math
+
+from PySide6.QtGui import QFontMetricsF
+from PySide6.QtWidgets import QTableWidgetItem
+
+import LaTeXTableCreator as LTC
+
+
+def test_statistics_track_the_longest_items():
+    items = [['a', 'bbbb'], ['ccc', ''], ['dd', 'ee']]
+    stats = LTC.LTCColumnStatistics(items, 0)
+    assert stats.candidateRows(0)[:2] == [1, 2]
+    assert stats.candidateRows(1)[0] == 0
+
+    stats.cellChanged(2, 1, 'eeeeee')
+    assert stats.candidateRows(1)[0] == 2
+    assert stats.stale == set()
+    stats.cellChanged(2, 1, 'e')
+    assert stats.stale == {1}
+
+
+def test_only_the_longest_rows_are_kept(monkeypatch):
+    monkeypatch.setattr(LTC.LTCColumnStatistics, 'longestCount', 2)
+    stats = LTC.LTCColumnStatistics([[str(i) * i] for i in range(10)], 0)
+    assert stats.candidateRows(0) == [9, 8]
+
+
+def test_text_width_uses_the_longest_line(table):
+    metrics = QFontMetricsF(table.font())
+    cache = {}
+    width = LTC.LTC_Table.textWidth('x\nwide line\ny', metrics, cache)
+    assert width == math.ceil(metrics.horizontalAdvance('wide line'))
+    assert cache == {'x\nwide line\ny': width}
+
+
+def test_sampled_widths_match_a_full_measurement(table):
+    items = [['a' * (i % 7), str(i)] for i in range(200)]
+    items[150][0] = 'the widest item of the column'
+    metrics = QFontMetricsF(table.font())
+    widths, stats = LTC.LTC_Table.measureColumnWidths(items, None, range(10), table.font(), 5)
+    assert stats.revision == 5
+    for j in range(2):
+        assert widths[j] == max(math.ceil(metrics.horizontalAdvance(row[j])) for row in items)
+
+
+def test_auto_fit_widens_the_edited_column(table):
+    table.autoFit = True
+    width = table.columnWidth(1)
+    table.setItem(0, 1, QTableWidgetItem('a much longer entry than fits'))
+    assert table.columnWidth(1) > width
+    assert table.columnWidth(0) < table.columnWidth(1)
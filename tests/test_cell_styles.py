@@ -0,0 +1,128 @@
+import LaTeXTableCreator as LTC
+
+Styles = LTC.LTCCellStyles
+
+
+def styleGrid(styles, rows, cols):
+    return [[styles.get(i, j) for j in range(cols)] for i in range(rows)]
+
+
+def test_apply_sets_and_clears_bits():
+    styles = Styles().apply(0, 1, 2, 2, Styles.bold | Styles.italic)
+    assert styleGrid(styles, 3, 3) == [[0, 3, 3], [0, 3, 3], [0, 0, 0]]
+    styles = styles.apply(1, 1, 1, 2, 0, Styles.bold | Styles.italic)
+    assert styleGrid(styles, 3, 3) == [[0, 3, 3], [0, 0, 0], [0, 0, 0]]
+    assert len(styles) == 1
+
+
+def test_alignment_and_color_fields():
+    style = (3 << Styles.alignShift) | (2 << Styles.colorShift) | Styles.underline
+    assert Styles.alignment(style) == 'r'
+    assert Styles.color(style) == ('green', '#00FF00')
+    assert Styles.alignment(Styles.bold) == ''
+    assert Styles.color(Styles.bold) == (None, None)
+    assert Styles().apply(0, 0, 1, 1, style).hasColor()
+    assert not Styles().apply(0, 0, 1, 1, Styles.bold).hasColor()
+
+
+def test_all_set():
+    styles = Styles().apply(0, 0, 1, 2, Styles.bold)
+    assert styles.allSet(0, 0, 1, 2, Styles.bold)
+    assert not styles.allSet(0, 0, 2, 2, Styles.bold)
+
+
+def test_list_round_trip():
+    styles = Styles().apply(2, 1, 1, 2, Styles.italic)
+    assert Styles.fromList(styles.toList()) == styles
+    assert Styles.fromList(styles.toList()).key() == styles.key()
+
+
+def test_row_and_column_shifts():
+    styles = Styles().apply(1, 1, 1, 1, Styles.bold)
+    assert styleGrid(styles.insertRows(0, 1), 3, 3) == [[0, 0, 0], [0, 0, 0], [0, 1, 0]]
+    assert styleGrid(styles.insertColumns(1, 1), 2, 3) == [[0, 0, 0], [0, 0, 1]]
+    assert styleGrid(styles.insertColumns(2, 1), 2, 3) == [[0, 0, 0], [0, 1, 0]]
+    assert len(styles.removeRows(1, 1)) == 0
+    assert len(styles.removeColumns(1, 1)) == 0
+    assert styleGrid(styles.removeColumns(0, 1), 2, 2) == [[0, 0], [1, 0]]
+    assert Styles().insertRows(0, 1).rows == {}
+
+
+def test_transpose_and_clip():
+    styles = Styles().apply(0, 2, 1, 1, Styles.bold)
+    assert styleGrid(styles.transpose(), 3, 1) == [[0], [0], [1]]
+    assert styles.clip(3, 3) is styles
+    assert len(styles.clip(3, 2)) == 0
+
+
+def test_table_styles_follow_inserts_deletes_and_transpose(table, selectCells):
+    selectCells(table, 1, 1)
+    table.toggleCellStyle(Styles.bold)
+    assert styleGrid(table.cellStyles, 3, 3) == [[0, 0, 0], [0, 1, 0], [0, 0, 0]]
+
+    selectCells(table, 0, 0)
+    table.addRowAbove()
+    table.addColumnBefore()
+    assert table.cellStyles.get(2, 2) == Styles.bold
+
+    items = LTC.LTC_Table.transposeItems(table.getSnapshot())
+    table.setTableItems(items, ['transpose'], table.spanIndex.transpose(), table.cellStyles.transpose())
+    assert table.cellStyles.get(2, 2) == Styles.bold
+
+    selectCells(table, 2, 0)
+    table.deleteRows()
+    assert len(table.cellStyles) == 0
+
+
+def test_toggle_alignment_and_color(table, selectCells):
+    selectCells(table, 0, 0, 1, 2)
+    table.toggleCellStyle(Styles.italic)
+    table.setCellAlignment('c')
+    table.setCellColor(3)
+    style = table.cellStyles.get(0, 1)
+    assert style & Styles.italic
+    assert Styles.alignment(style) == 'c'
+    assert Styles.color(style)[0] == 'blue'
+    table.toggleCellStyle(Styles.italic)
+    assert not table.cellStyles.get(0, 0) & Styles.italic
+    table.setCellAlignment('')
+    table.setCellColor(0)
+    assert len(table.cellStyles) == 0
+
+
+def test_undo_and_redo_restore_styles(table, selectCells):
+    selectCells(table, 0, 0)
+    table.toggleCellStyle(Styles.bold)
+    selectCells(table, 0, 0)
+    table.addRowAbove()
+    assert table.cellStyles.get(1, 0) == Styles.bold
+    table.undo()
+    assert table.cellStyles.get(0, 0) == Styles.bold
+    table.undo()
+    assert len(table.cellStyles) == 0
+    table.redo()
+    table.redo()
+    assert table.cellStyles.get(1, 0) == Styles.bold
+
+
+def test_session_state_keeps_style_history(table, selectCells):
+    selectCells(table, 1, 0)
+    table.toggleCellStyle(Styles.underline)
+    restored = LTC.LTC_Table()
+    restored.setSessionState(table.getSessionState())
+    assert restored.cellStyles == table.cellStyles
+    restored.undo()
+    assert len(restored.cellStyles) == 0
+
+
+def test_latex_and_html_export():
+    styles = Styles().apply(0, 0, 1, 1, Styles.bold | Styles.italic | (1 << Styles.colorShift))
+    styles = styles.apply(0, 1, 1, 1, 3 << Styles.alignShift)
+    options = LTC.LTCOptionsModel()
+    options.update({'Grid Type': 'tabular'})
+    code = LTC.LTCExporter().createLaTeXCode([['a', 'b']], options.snapshot(), None, styles)
+    assert '\\usepackage{xcolor}' in code
+    assert '\\textcolor{red}{\\textbf{\\textit{a}}} & \\multicolumn{1}{r}{b}' in code
+
+    html = LTC.LTCExporter().createHTML([['a', 'b']], styles)
+    assert '<TD><FONT COLOR="#FF0000"><B><I>a</I></B></FONT></TD><TD ALIGN=RIGHT>b</TD>' in html
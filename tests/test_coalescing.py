@@ -0,0 +1,76 @@
+from PySide6.QtCore import Qt
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QAbstractItemView, QTableWidgetItem
+
+
+def test_cell_edits_are_one_undo_entry(table):
+    table.setItem(0, 0, QTableWidgetItem('a'))
+    table.setItem(1, 1, QTableWidgetItem('b'))
+    table.setItem(2, 2, QTableWidgetItem('c'))
+    assert len(table.tableHistory) == 1
+    table.commitPendingEdits()
+    assert len(table.tableHistory) == 2
+    table.undo()
+    assert table.getTableContents() == [[''] * 3] * 3
+    table.redo()
+    assert table.getTableContents() == [['a', '', ''], ['', 'b', ''], ['', '', 'c']]
+
+
+def test_edits_are_committed_when_they_stop(table):
+    table.coalesce_timer.setInterval(50)
+    table.setItem(0, 0, QTableWidgetItem('a'))
+    QTest.qWait(150)
+    table.setItem(0, 1, QTableWidgetItem('b'))
+    QTest.qWait(150)
+    assert [entry[0][:2] for entry in table.tableHistory] == [['', ''], ['a', ''], ['a', 'b']]
+
+
+def test_other_operations_commit_pending_edits_first(table):
+    table.setItem(0, 0, QTableWidgetItem('a'))
+    table.resizeTable(3, 4)
+    assert len(table.tableHistory) == 3
+    table.undo()
+    assert table.getTableContents()[0] == ['a', '', '']
+
+
+def test_enter_run_is_one_entry(table):
+    table.coalesce_timer.setInterval(10)
+    table.setCurrentCell(0, 0)
+    for text in ('a', 'b', 'c'):
+        table.setItem(table.currentRow(), table.currentColumn(), QTableWidgetItem(text))
+        QTest.keyClick(table, Qt.Key_Return)
+        QTest.qWait(30)
+    assert len(table.tableHistory) == 1
+
+    table.setCurrentCell(0, 2)
+    assert len(table.tableHistory) == 2
+    assert [row[0] for row in table.tableHistory[-1]] == ['a', 'b', 'c']
+
+
+def test_nested_transactions_are_one_entry(table):
+    table.beginTransaction()
+    table.setItem(0, 0, QTableWidgetItem('a'))
+    table.beginTransaction()
+    table.resizeTable(4, 4)
+    table.endTransaction()
+    table.setItem(3, 3, QTableWidgetItem('d'))
+    assert len(table.tableHistory) == 1
+    table.endTransaction()
+    assert len(table.tableHistory) == 2
+    table.undo()
+    assert table.getTableContents() == [[''] * 3] * 3
+
+
+def test_timer_does_not_close_an_open_editor(table):
+    table.show()
+    table.coalesce_timer.setInterval(20)
+    table.setItem(0, 0, QTableWidgetItem('a'))
+    table.setItem(1, 1, QTableWidgetItem('b'))
+    table.editItem(table.item(1, 1))
+    QTest.qWait(80)
+    assert table.state() == QAbstractItemView.EditingState
+    assert len(table.tableHistory) == 1
+    table.closeEditing()
+    QTest.qWait(80)
+    assert len(table.tableHistory) == 2
+    table.close()
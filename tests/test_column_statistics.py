@@ -0,0 +1,72 @@
+import pytest
+from PySide6.QtWidgets import QTableWidgetItem
+
+import LaTeXTableCreator as LTC
+
+
+@pytest.mark.parametrize('text, kind', [('', None), ('  ', None), ('12', 0), ('3.14', 2), ('-1.5e3', 1),
+                                        ('$ +2.50 $', 2), ('1,000.25', 2), ('.5', 1), ('7.', 0),
+                                        ('abc', -1), ('1-2', -1), ('$x$', -1)])
+def test_classify(text, kind):
+    assert LTC.LTCColumnStatistics.classify(text) == kind
+
+
+def test_counts_and_suggestions():
+    items = [['1', 'a', ''], ['2.25', '', ''], ['', 'bcdef', '']]
+    stats = LTC.LTCColumnStatistics(items, 0)
+    assert [stats.emptyCount(j) for j in range(3)] == [1, 1, 3]
+    assert stats.isNumeric(0) and not stats.isNumeric(1) and not stats.isNumeric(2)
+    assert stats.maxDecimals(0) == 2
+    assert stats.maxLength(1) == 5
+    assert stats.suggestedAlignment() == 'Left'
+    assert stats.suggestedTabbingWidth() == 35
+
+    stats.cellChanged(0, 1, '3')
+    stats.cellChanged(2, 1, '')
+    assert stats.suggestedAlignment() == 'Right'
+
+
+def test_cell_change_updates_only_its_column():
+    stats = LTC.LTCColumnStatistics([['1', 'a'], ['2', 'b']], 0)
+    revisions = list(stats.columnRevision)
+    stats.cellChanged(1, 0, 'x')
+    assert stats.columnRevision[0] != revisions[0]
+    assert stats.columnRevision[1] == revisions[1]
+    assert not stats.isNumeric(0)
+    stats.cellChanged(1, 1, 'b')
+    assert stats.columnRevision[1] == revisions[1]
+
+
+def sameStatistics(stats, items):
+    fresh = LTC.LTCColumnStatistics(items, 0)
+    stats.refreshStale()
+    return (stats.empty, stats.numeric, stats.decimals, [e[:1] for e in stats.longest]) == \
+        (fresh.empty, fresh.numeric, fresh.decimals, [e[:1] for e in fresh.longest])
+
+
+def test_table_keeps_statistics_in_sync(table, selectCells):
+    stats = table.getColumnStatistics()
+    table.setItem(0, 0, QTableWidgetItem('1.5'))
+    table.setItem(1, 2, QTableWidgetItem('long text'))
+    selectCells(table, 1, 0)
+    table.paste([['2', 'x'], ['3', '']])
+    assert table.getColumnStatistics() is stats
+    assert sameStatistics(stats, table.getTableContents())
+
+    table.resizeTable(4, 4)
+    rebuilt = table.getColumnStatistics()
+    assert rebuilt is not stats
+    assert sameStatistics(rebuilt, table.getTableContents())
+
+
+def test_suggest_options_right_aligns_numbers(app):
+    editor = LTC.LaTeXTableEditor(app)
+    editor.loadTable([['1', '2.5'], ['3', '']])
+    editor.suggestOptions()
+    info = editor.options_pane.getOptionsInfo()
+    assert info['Table Column Align'] == 'Right'
+    assert info['Array Column Align'] == 'Right'
+    assert info['Tabbing Column Width'] == 25
+    for document in editor.documents():
+        document.discardJournal()
+    editor.close()
@@ -0,0 +1,86 @@
+import pytest
+
+import LaTeXTableCreator as LTC
+
+Formats = LTC.LTCConditionalFormats
+Styles = LTC.LTCCellStyles
+
+items = [['name', 'a', 'b'], ['x', '1,200', '-3'], ['y', '$5$', 'n/a'], ['z', '-7', '1000']]
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def numpyMode(request, monkeypatch):
+    """
+    Runs a test with NumPy, when it is installed, and with the plain Python
+    evaluation.
+    """
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(LTC, 'numpy', None)
+    Formats.cache.clear()
+    return request.param
+
+
+def test_parse_rules():
+    rules = Formats.parse('max in 2-3: bold; < 0: cell=red!20; /^n\\/a$/: italic color=gray; bogus; '
+                          '>= 1e3 in 3: nothing').rules
+    assert rules == [(('max', None), frozenset({1, 2}), Styles.bold, 0, None),
+                     (('<', 0.0), None, 0, 0, 'red!20'),
+                     (('regex', '^n\\/a$'), None, Styles.italic | (12 << Styles.colorShift), Styles.colorMask, None)]
+
+
+def test_parse_is_cached():
+    assert Formats.parse('max: bold') is Formats.parse('max: bold')
+
+
+@pytest.mark.parametrize('text, expected', [('1,200', 1200.0), ('$5$', 5.0), (' -2.5e1 ', -25.0)])
+def test_to_number(text, expected):
+    assert Formats.toNumber(text) == expected
+
+
+@pytest.mark.parametrize('text', ['n/a', '', 'nan', 'inf', '1,2'])
+def test_to_number_rejects_text(text):
+    assert Formats.toNumber(text) != Formats.toNumber(text)
+
+
+def test_conditions(numpyMode):
+    styles, cellColors = Formats.parse('max in 2-3: bold; < 0: cell=red!20; /^n\\/a$/: italic').apply(
+        items, Styles())
+    assert styles.get(1, 1) == Styles.bold
+    assert styles.get(3, 2) == Styles.bold
+    assert styles.get(2, 2) == Styles.italic
+    assert styles.get(2, 1) == 0
+    assert cellColors == {1: {2: 'red!20'}, 3: {1: 'red!20'}}
+
+
+def test_later_rules_win(numpyMode):
+    styles, cellColors = Formats.parse('> 0: color=red; = 5: color=blue').apply(items, Styles())
+    assert Styles.color(styles.get(2, 1))[0] == 'blue'
+    assert Styles.color(styles.get(1, 1))[0] == 'red'
+
+
+def test_export_adds_styles_and_cell_colors(numpyMode):
+    options = LTC.LTCOptionsModel()
+    options.update({'Grid Type': 'tabular', 'Conditional Formats': 'max in 2: bold; < 0: cell=red!20'})
+    code = LTC.LTCExporter().createLaTeXCode(items, options.snapshot())
+    assert '\\usepackage[table]{xcolor}' in code
+    assert 'x & \\textbf{1,200} & \\cellcolor{red!20}-3' in code
+    assert '\\cellcolor{red!20}-7' in code
+
+
+def test_results_are_cached_by_column_revision(table):
+    table.replaceTable(items)
+    formats = Formats.parse('max in 2: bold')
+    Formats.cache.clear()
+    revisions = table.columnRevisions()
+    assert formats.apply(items, Styles(), revisions)[0].get(1, 1) == Styles.bold
+    assert len(Formats.cache) == 2
+
+    table.item(3, 1).setText('5000')
+    newRevisions = table.columnRevisions()
+    assert newRevisions[0] == revisions[0] and newRevisions[2] == revisions[2]
+    assert newRevisions[1] != revisions[1]
+    styles = formats.apply(table.currentItems(), Styles(), newRevisions)[0]
+    assert styles.get(3, 1) == Styles.bold
+    assert styles.get(1, 1) == 0
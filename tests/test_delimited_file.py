@@ -0,0 +1,112 @@
+import os
+
+import pytest
+
+import LaTeXTableCreator as LTC
+
+
+@pytest.fixture
+def openFile(tmp_path):
+    """
+    Writes the bytes to a file and opens it, the files are closed after the
+    test.
+    """
+    opened = []
+
+    def openFile(data, name='table.csv'):
+        file_name = os.path.join(str(tmp_path), name)
+        with open(file_name, 'wb') as f:
+            f.write(data)
+        datafile = LTC.LTCDelimitedFile(file_name)
+        opened.append(datafile)
+        return datafile
+
+    yield openFile
+    for datafile in opened:
+        datafile.close()
+
+
+def test_rows_and_columns(openFile):
+    datafile = openFile(b'a,b,c\n1,"2,5",3\n4,5\n')
+    assert datafile.rowCount() == 3
+    assert datafile.columnCount() == 3
+    assert datafile.getRow(1) == ['1', '2,5', '3']
+    assert datafile.getRows(1, 2, 1, 2) == [['2,5', '3'], ['5', '']]
+
+
+def test_crlf_bom_and_missing_final_newline(openFile):
+    datafile = openFile(b'\xef\xbb\xbfx,y\r\n1,2\r\n3,4')
+    assert datafile.rowCount() == 3
+    assert datafile.getRow(0) == ['x', 'y']
+    assert datafile.getRow(2) == ['3', '4']
+
+
+def test_empty_file(openFile):
+    datafile = openFile(b'')
+    assert datafile.rowCount() == 0
+    assert datafile.columnCount() == 1
+
+
+@pytest.mark.parametrize('name, data, delimiter', [('t.tsv', b'a,b\tc\n', '\t'), ('t.csv', b'a;b;c\n1;2;3\n', ';'),
+                                                   ('t.txt', b'a|b|c\n1|2|3\n', '|')])
+def test_delimiter_detection(openFile, name, data, delimiter):
+    assert openFile(data, name).delimiter == delimiter
+
+
+def test_index_across_chunks(openFile, monkeypatch):
+    monkeypatch.setattr(LTC.LTCDelimitedFile, 'chunkSize', 7)
+    lines = [str(i) * (i % 5 + 1) + ',x' for i in range(50)]
+    datafile = openFile(('\n'.join(lines) + '\n').encode())
+    assert datafile.rowCount() == 50
+    assert [datafile.getRow(i)[0] for i in range(50)] == [line.split(',')[0] for line in lines]
+
+
+def test_quoted_newlines_stay_in_the_record(openFile):
+    datafile = openFile(b'a,b\r\n"x\r\ny",2\r\n"say ""hi""\n",3\r\n')
+    assert datafile.rowCount() == 3
+    assert datafile.getRow(1) == ['x\r\ny', '2']
+    assert datafile.getRows(2, 2, 0, 1) == [['say "hi"\n', '3']]
+
+
+def test_quoted_newlines_across_chunks(openFile, monkeypatch):
+    monkeypatch.setattr(LTC.LTCDelimitedFile, 'chunkSize', 5)
+    records = ['"%d\nline\nline",%d' % (i, i) for i in range(20)]
+    datafile = openFile(('\n'.join(records) + '\n').encode())
+    assert datafile.rowCount() == 20
+    assert [datafile.getRow(i) for i in range(20)] == [['%d\nline\nline' % i, str(i)] for i in range(20)]
+
+
+def test_unbalanced_quotes_index_lines(openFile):
+    datafile = openFile(b'size,name\n5",screen\n7,tablet\n')
+    assert datafile.rowCount() == 3
+    assert datafile.getRow(2) == ['7', 'tablet']
+
+
+def test_saved_index_is_reused_and_rebuilt_when_the_file_changes(openFile, tmp_path):
+    datafile = openFile(b'a\nb\n')
+    assert os.path.exists(datafile.index_name)
+    with open(datafile.index_name, 'rb') as f:
+        saved = f.read()
+    reopened = LTC.LTCDelimitedFile(datafile.file_name)
+    assert reopened.offsets == datafile.offsets
+    reopened.close()
+
+    datafile = openFile(b'a\nb\nc\n')
+    assert datafile.rowCount() == 3
+    with open(datafile.index_name, 'rb') as f:
+        assert f.read() != saved
+
+
+def test_broken_index_is_rebuilt(openFile):
+    datafile = openFile(b'a\nb\n')
+    with open(datafile.index_name, 'wb') as f:
+        f.write(b'junk')
+    reopened = openFile(b'a\nb\n')
+    assert reopened.rowCount() == 2
+
+
+def test_model_serves_cells(openFile, app):
+    model = LTC.LTCDelimitedFileModel(openFile(b'a,b\n1\n'))
+    assert (model.rowCount(), model.columnCount()) == (2, 2)
+    assert model.data(model.index(0, 1)) == 'b'
+    assert model.data(model.index(1, 1)) == ''
@@ -0,0 +1,77 @@
+import os
+
+import pytest
+from PySide6.QtWidgets import QTableWidgetItem
+
+import LaTeXTableCreator as LTC
+
+
+@pytest.fixture
+def editor(app):
+    window = LTC.LaTeXTableEditor(app)
+    yield window
+    for document in window.documents():
+        document.discardJournal()
+    window.close()
+
+
+def test_documents_have_their_own_tables(editor):
+    first = editor.currentDocument()
+    editor.table_widget.setItem(0, 0, QTableWidgetItem('a'))
+    second = editor.newDocument()
+    assert editor.document_tabs.count() == 2
+    assert editor.currentDocument() is second
+    assert editor.table_widget is second.table_widget
+    assert editor.table_widget.getTableContents() == [[''] * 3] * 3
+
+    editor.rows.setValue(5)
+    second.applyResize()
+    assert second.table_widget.rowCount() == 5
+    assert first.table_widget.rowCount() == 3
+
+    editor.document_tabs.setCurrentWidget(first)
+    assert editor.table_widget.getTableContents()[0][0] == 'a'
+    assert editor.rows is first.rows
+
+
+def test_icons_are_shared(editor):
+    assert editor.getIcon('icons/copy.png') is editor.getIcon('icons/copy.png')
+    assert 'icons/copy.png' in LTC.LaTeXTableEditor.iconCache
+
+
+def test_idle_background_document_is_released_and_restored(editor, monkeypatch):
+    first = editor.currentDocument()
+    editor.table_widget.setItem(1, 1, QTableWidgetItem('b'))
+    editor.table_widget.commitPendingEdits()
+    history = list(editor.table_widget.tableHistory)
+    editor.newDocument()
+
+    monkeypatch.setattr(LTC.LaTeXTableEditor, 'idleReleaseSeconds', -1)
+    editor.autosave()
+    assert first.isReleased() and first.table_widget is None
+    assert not editor.currentDocument().isReleased()
+
+    editor.document_tabs.setCurrentWidget(first)
+    assert not first.isReleased()
+    assert editor.table_widget.getTableContents() == [['', '', ''], ['', 'b', ''], ['', '', '']]
+    assert editor.table_widget.tableHistory == history
+
+
+def test_closing_the_last_document_opens_a_new_one(editor):
+    document = editor.currentDocument()
+    editor.table_widget.setItem(0, 0, QTableWidgetItem('a'))
+    journal_name = document.journal.journal_name
+    assert os.path.exists(journal_name)
+
+    editor.closeDocument(0)
+    assert not os.path.exists(journal_name)
+    assert editor.document_tabs.count() == 1
+    assert editor.currentDocument() is not document
+
+
+def test_new_opens_a_tab_not_a_window(editor):
+    actions = [action.text() for action in editor.menuBar().actions()[0].menu().actions()]
+    assert 'New Window' not in actions
+    assert not hasattr(editor, 'newtable')
+    editor.file_new_act.trigger()
+    assert editor.document_tabs.count() == 2
@@ -0,0 +1,130 @@
+import json
+import os
+
+import pytest
+from PySide6.QtWidgets import QMessageBox, QTableWidgetItem
+
+import LaTeXTableCreator as LTC
+
+
+def test_apply_operations():
+    apply = LTC.LTCEditJournal.apply
+    table = [['a', 'b'], ['c', 'd']]
+    table = apply(table, ['cell', 0, 1, 'x'])
+    assert table == [['a', 'x'], ['c', 'd']]
+    table = apply(table, ['paste', 1, 1, [['p', 'q'], ['r', 's']]])
+    assert table == [['a', 'x', ''], ['c', 'p', 'q'], ['', 'r', 's']]
+    table = apply(table, ['insertRow', 0])
+    table = apply(table, ['insertColumn', 1])
+    assert table == [['', '', '', ''], ['a', '', 'x', ''], ['c', '', 'p', 'q'], ['', '', 'r', 's']]
+    table = apply(table, ['removeRows', 0, 1])
+    table = apply(table, ['removeColumns', 1, 1])
+    assert table == [['a', 'x', ''], ['c', 'p', 'q'], ['', 'r', 's']]
+    table = apply(table, ['resize', 2, 4])
+    assert table == [['a', 'x', '', ''], ['c', 'p', 'q', '']]
+    table = apply(table, ['transpose'])
+    assert table == [['a', 'c'], ['x', 'p'], ['', 'q'], ['', '']]
+    assert apply(table, ['fill', 'z']) == [['z', 'z']] * 4
+    assert apply(table, ['clear']) == [['', '']] * 4
+    assert apply([[' a ']], ['trim']) == [['a']]
+    assert apply(table, ['table', [['t']]]) == [['t']]
+
+
+def test_removing_everything_leaves_one_cell_row():
+    assert LTC.LTCEditJournal.apply([['a', 'b']], ['removeRows', 0, 1]) == [['', '']]
+    assert LTC.LTCEditJournal.apply([['a'], ['b']], ['removeColumns', 0, 1]) == [[''], ['']]
+
+
+def test_recover_replays_table_edits(table, selectCells):
+    table.journal = LTC.LTCEditJournal()
+    table.setItem(0, 0, QTableWidgetItem('a'))
+    table.setItem(2, 1, QTableWidgetItem('b'))
+    selectCells(table, 1, 1)
+    table.addRowBelow()
+    table.addColumnBefore()
+    selectCells(table, 1, 0)
+    table.paste([['p', 'q'], ['r', 's']])
+    table.resizeTable(5, 5)
+    selectCells(table, 0, 2)
+    table.deleteColumns()
+    table.commitPendingEdits()
+
+    assert table.journal.recover() == table.currentItems()
+
+
+def test_compaction_keeps_recovery_and_skips_folded_journal(table):
+    table.journal = LTC.LTCEditJournal()
+    table.setItem(0, 0, QTableWidgetItem('a'))
+    table.compactJournal()
+    assert table.journal.entries == 0
+    table.setItem(1, 1, QTableWidgetItem('b'))
+    table.commitPendingEdits()
+    assert table.journal.recover() == [['a', '', ''], ['', 'b', ''], ['', '', '']]
+
+    # A journal from an older generation was already folded into the snapshot.
+    with open(table.journal.journal_name, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+    lines[0] = json.dumps(['journal', table.journal.generation - 1]) + '\n'
+    with open(table.journal.journal_name, 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+    assert table.journal.recover() == [['a', '', ''], ['', '', ''], ['', '', '']]
+
+
+def test_partly_written_line_is_ignored(table):
+    table.journal = LTC.LTCEditJournal()
+    table.setItem(0, 0, QTableWidgetItem('a'))
+    table.commitPendingEdits()
+    with open(table.journal.journal_name, 'a', encoding='utf-8') as f:
+        f.write('["cell",1,1,"trunc')
+    assert table.journal.recover() == [['a', '', ''], ['', '', ''], ['', '', '']]
+
+
+def test_discard_removes_files(table):
+    journal = LTC.LTCEditJournal()
+    table.journal = journal
+    table.setItem(0, 0, QTableWidgetItem('a'))
+    table.compactJournal()
+    table.setItem(0, 1, QTableWidgetItem('b'))
+    names = (journal.snapshot_name, journal.journal_name)
+    journal.discard()
+    table.journal = None
+    assert not any(os.path.exists(name) for name in names)
+
+
+@pytest.mark.parametrize('op', [['cell', 5, 0, 'x'], ['cell', 0, 0], ['cell', 0, 0, 1], ['paste', -1, 0, [['a']]],
+                                ['paste', 0, 0, [['a'], ['b', 'c']]], ['resize', 0, 3], ['insertRow', 4],
+                                ['removeColumns', 3, 1], ['table', []], ['unknown'], 'cell', []])
+def test_apply_rejects_bad_operations(op):
+    with pytest.raises(ValueError):
+        LTC.LTCEditJournal.apply([['a', 'b', 'c']] * 3, op)
+
+
+def test_recover_raises_for_an_operation_that_does_not_fit(table):
+    table.journal = LTC.LTCEditJournal()
+    table.setItem(0, 0, QTableWidgetItem('a'))
+    table.commitPendingEdits()
+    with open(table.journal.journal_name, 'a', encoding='utf-8') as f:
+        f.write('["cell",7,0,"x"]\n')
+    with pytest.raises(ValueError):
+        table.journal.recover()
+
+
+def test_damaged_journal_is_discarded_with_a_warning(app, monkeypatch):
+    editor = LTC.LaTeXTableEditor(app)
+    directory = LTC.LTCEditJournal.recoveryDirectory()
+    names = [os.path.join(directory, 'damaged.' + ext) for ext in ('snapshot', 'journal')]
+    with open(names[0], 'w', encoding='utf-8') as f:
+        json.dump({'generation': 1, 'table': [['a']]}, f)
+    with open(names[1], 'w', encoding='utf-8') as f:
+        f.write('["journal",1]\n["removeRows",0,"x"]\n')
+    shown = []
+    monkeypatch.setattr(QMessageBox, 'question', lambda *args: QMessageBox.Yes)
+    monkeypatch.setattr(QMessageBox, 'warning', lambda *args: shown.append(args[1]))
+
+    editor.checkRecovery()
+    assert shown == ['Table Not Recovered']
+    assert not any(os.path.exists(name) for name in names)
+    assert editor.document_tabs.count() == 1
+    for document in editor.documents():
+        document.discardJournal()
+    editor.close()
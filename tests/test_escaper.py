@@ -0,0 +1,48 @@
+import pytest
+
+import LaTeXTableCreator as LTC
+
+Escaper = LTC.LTCEscaper
+
+
+def exportTable(items, options):
+    model = LTC.LTCOptionsModel()
+    model.update(options)
+    return LTC.LTCExporter().createLaTeXCode(items, model.snapshot())
+
+
+@pytest.mark.parametrize('text, escaped', [('a & b', 'a \\& b'), ('50%', '50\\%'), ('$5', '\\$5'),
+                                           ('#1', '\\#1'), ('x_1', 'x\\_1'), ('{a}', '\\{a\\}'),
+                                           ('~', '\\textasciitilde{}'), ('2^3', '2\\textasciicircum{}3'),
+                                           ('C:\\dir', 'C:\\textbackslash{}dir'), ('plain', 'plain')])
+def test_escape(text, escaped):
+    assert Escaper.escape(text) == escaped
+
+
+@pytest.mark.parametrize('text', ['$x_1$', ' $a & b$ ', '\\(x^2\\)', '\\[\\frac{1}{2}\\]'])
+def test_math_cells_are_unchanged(text):
+    assert Escaper.escape(text) == text
+
+
+@pytest.mark.parametrize('spec, columns', [('', None), ('  ', None), ('1', {0}), ('1, 3-5', {0, 2, 3, 4}),
+                                           ('2, x, 4-y', {1}), ('x', set())])
+def test_parse_columns(spec, columns):
+    assert Escaper.parseColumns(spec) == columns
+
+
+def test_export_escapes_the_listed_columns():
+    items = [['a_1', 'b_2', '$c_3$']]
+    code = exportTable(items, {'Grid Type': 'tabular', 'Escape Special Characters': True})
+    assert 'a\\_1 & b\\_2 & $c_3$' in code
+    code = exportTable(items, {'Grid Type': 'tabular', 'Escape Special Characters': True, 'Escape Columns': '2'})
+    assert 'a_1 & b\\_2 & $c_3$' in code
+    assert exportTable(items, {'Grid Type': 'tabular'}) == exportTable(items, {'Grid Type': 'tabular',
+                                                                              'Escape Columns': '2'})
+
+
+@pytest.mark.parametrize('options', [{'Grid Type': 'array'}, {'Grid Type': 'matrix'},
+                                     {'Grid Type': 'tabular', 'Math Mode': True}])
+def test_math_output_is_not_escaped(options):
+    items = [['x_1', 'y^2']]
+    escaped = dict(options, **{'Escape Special Characters': True})
+    assert exportTable(items, escaped) == exportTable(items, options)
@@ -0,0 +1,78 @@
+import json
+import os
+import subprocess
+import sys
+import zlib
+
+import pytest
+
+import LaTeXTableCreator as LTC
+
+script = os.path.abspath(LTC.__file__)
+
+
+def runExport(cwd, *args):
+    return subprocess.run([sys.executable, script, '--export'] + list(args), cwd=str(cwd),
+                          capture_output=True, text=True, timeout=60)
+
+
+@pytest.fixture
+def dataFile(tmp_path):
+    file_name = str(tmp_path / 'table.dat')
+    assert LTC.LaTeXTableEditor.saveDataFile(file_name, [['a', 'b'], ['c', 'd']])
+    return file_name
+
+
+def test_export_to_standard_output(tmp_path, dataFile):
+    result = runExport(tmp_path, dataFile)
+    assert result.returncode == 0
+    assert result.stdout == LTC.LaTeXTableEditor.exportTableFile(dataFile)
+    assert '\\begin{longtable}' in result.stdout
+
+
+def test_export_to_a_file(tmp_path, dataFile):
+    output = tmp_path / 'table.tex'
+    result = runExport(tmp_path, dataFile, '--output', str(output))
+    assert result.returncode == 0 and result.stdout == ''
+    assert output.read_text() == LTC.LaTeXTableEditor.exportTableFile(dataFile)
+
+
+def test_missing_preset_is_reported(tmp_path, dataFile):
+    result = runExport(tmp_path, dataFile, '--preset', 'nothing')
+    assert result.returncode == 1
+    assert result.stderr.strip() == 'LaTeXTableCreator: no preset named nothing'
+
+
+def test_unreadable_file_is_reported(tmp_path):
+    result = runExport(tmp_path, str(tmp_path / 'missing.dat'))
+    assert result.returncode == 1
+    assert result.stderr.startswith('LaTeXTableCreator: ')
+    assert 'Traceback' not in result.stderr
+
+
+def writeSession(file_name, session):
+    file_name.write_bytes(LTC.LaTeXTableEditor.sessionMagic + zlib.compress(json.dumps(session).encode('utf-8')))
+
+
+def test_session_export_uses_its_options(tmp_path):
+    file_name = tmp_path / 'table.ltcs'
+    session = {'Version': 1, 'Options': {'Grid Type': 'array', 'Math Mode': True},
+               'Table': {'Rows': [['x', 'y'], ['1', '2']], 'History': [[0, 0], [0, 1]], 'History Position': 1,
+                         'Font Size': 12, 'Column Widths': [100, 100]}}
+    writeSession(file_name, session)
+
+    model = LTC.LTCOptionsModel()
+    model.update(session['Options'])
+    expected = LTC.LTCExporter().createLaTeXCode([['x', 'y'], ['1', '2']], model.snapshot())
+    result = runExport(tmp_path, str(file_name))
+    assert result.returncode == 0
+    assert result.stdout == expected
+
+
+@pytest.mark.parametrize('preset', [[], ['--preset', 'nothing']])
+def test_incomplete_session_is_reported(tmp_path, preset):
+    file_name = tmp_path / 'table.ltcs'
+    writeSession(file_name, {'Version': 1, 'Options': {}})
+    result = runExport(tmp_path, str(file_name), *preset)
+    assert result.returncode == 1
+    assert result.stderr.strip() == 'LaTeXTableCreator: The file ' + str(file_name) + ' is not a complete session file.'
@@ -0,0 +1,46 @@
+import LaTeXTableCreator as LTC
+
+
+def test_rows_and_cells():
+    html = '<html><body><table><tr><th>a</th><td>b</td></tr><tr><td>c&amp;d</td><td>e&nbsp;f</td></tr></table>'
+    assert LTC.LTCHTMLTableParser.parseTable(html) == [['a', 'b'], ['c&d', 'e f']]
+
+
+def test_no_table():
+    assert LTC.LTCHTMLTableParser.parseTable('<p>text</p>') == []
+
+
+def test_only_first_table_is_read():
+    html = '<table><tr><td>a</td></tr></table><table><tr><td>b</td></tr></table>'
+    assert LTC.LTCHTMLTableParser.parseTable(html) == [['a']]
+
+
+def test_spans_leave_covered_cells_empty():
+    html = '<table><tr><td rowspan="2">a</td><td colspan=2>b</td></tr><tr><td>c</td><td>d</td></tr></table>'
+    assert LTC.LTCHTMLTableParser.parseTable(html) == [['a', 'b', ''], ['', 'c', 'd']]
+
+
+def test_rows_are_padded():
+    html = '<table><tr><td>a</td><td>b</td></tr><tr><td>c</td></tr></table>'
+    assert LTC.LTCHTMLTableParser.parseTable(html) == [['a', 'b'], ['c', '']]
+
+
+def test_text_between_cells_is_ignored():
+    html = '<table>\n<tr><th>a</th> x <td>b</td>\n y </tr> z <tr><td>c</td><td>d</td></tr></table>'
+    assert LTC.LTCHTMLTableParser.parseTable(html) == [['a', 'b'], ['c', 'd']]
+
+
+def test_nested_table_is_skipped():
+    html = '<table><tr><td>a<table><tr><td>in</td></tr></table>b</td><td>c</td></tr></table>'
+    assert LTC.LTCHTMLTableParser.parseTable(html) == [['ab', 'c']]
+
+
+def test_formatting_styles_and_line_breaks():
+    html = ('<style>td { color: red; }</style><table><tr><td style="x"><b>bold</b><br>next</td>'
+            '<td><!-- <td>comment</td> -->kept</td></tr></table>')
+    assert LTC.LTCHTMLTableParser.parseTable(html) == [['bold next', 'kept']]
+
+
+def test_rows_are_yielded_across_chunks():
+    html = '<table>' + ''.join('<tr><td>' + str(i) + '</td></tr>' for i in range(100)) + '</table>'
+    assert list(LTC.LTCHTMLTableParser.iterRows(html, chunkSize=7)) == [[str(i)] for i in range(100)]
@@ -0,0 +1,94 @@
+import pytest
+
+import LaTeXTableCreator as LTC
+
+gridOptions = [{'Grid Type': 'longtable'}, {'Grid Type': 'tabular'}, {'Grid Type': 'tabbing'},
+               {'Grid Type': 'array'}, {'Grid Type': 'matrix'}] + \
+              [{'Grid Type': 'Special Matrix', 'Special Matrix Decoration': decoration}
+               for decoration in ('pmatrix', 'bmatrix', 'vmatrix', 'Vmatrix')]
+
+extraOptions = [{},
+                {'Table Border': True, 'Table Division All Rows': True, 'Table Division All Columns': True,
+                 'Array Border': True, 'Array Division All Rows': True, 'Array Decoration': '()',
+                 'Matrix Decoration': '[]'},
+                {'Math Mode': True, 'Table Column Header': True, 'Table Row Header': True,
+                 'Array Stretch': True}]
+
+tables = [[['a', 'b'], ['', 'x'], ['c', '']],
+          [['x', '', 'y']],
+          [['a'], ['b']],
+          [['1', '2.5', '-3'], ['x^2', 'a b', '']],
+          [['']],
+          [['a'], [''], ['b']],
+          [[''], ['']],
+          [['a', 'b'], ['', ''], ['c', '']]]
+
+
+def exportTable(items, options):
+    model = LTC.LTCOptionsModel()
+    model.update(options)
+    return LTC.LTCExporter().createLaTeXCode(items, model.snapshot())
+
+
+@pytest.mark.parametrize('extra', extraOptions)
+@pytest.mark.parametrize('grid', gridOptions, ids=lambda options: '-'.join(options.values()))
+@pytest.mark.parametrize('items', tables)
+def test_round_trip(items, grid, extra):
+    code = exportTable(items, dict(grid, **extra))
+    assert LTC.LTCLaTeXParser().parse(code) == items
+
+
+def test_unknown_grid_type_raises():
+    options = dict(LTC.LTCOptionsModel().snapshot(), **{'Grid Type': 'table'})
+    with pytest.raises(ValueError):
+        LTC.LTCExporter().createLaTeXCode([['a']], options)
+
+
+def test_environment_and_column_spec():
+    parser = LTC.LTCLaTeXParser()
+    items = parser.parse('Text before \\begin{tabular}{|l|r|} a & b \\\\ \\hline c & d \\end{tabular} after')
+    assert items == [['a', 'b'], ['c', 'd']]
+    assert parser.environment == 'tabular'
+    assert parser.columnSpec == '|l|r|'
+
+
+def test_only_first_table_is_read():
+    text = '\\begin{tabular}{l} a \\\\ \\end{tabular} \\begin{tabular}{l} b \\\\ \\end{tabular}'
+    assert LTC.LTCLaTeXParser().parse(text) == [['a']]
+
+
+def test_cells_with_groups_math_and_escapes():
+    text = '\\textbf{a & b} & $x & y$ & 50\\% \\\\ \\$5 & {c} & % comment\n d \\\\'
+    assert LTC.LTCLaTeXParser().parse(text) == [['\\textbf{a & b}', '$x & y$', '50\\%'],
+                                                  ['\\$5', '{c}', 'd']]
+
+
+def test_multicolumn():
+    parser = LTC.LTCLaTeXParser()
+    items = parser.parse('\\multicolumn{2}{c}{ab} & c \\\\ d & e & f \\\\')
+    assert items == [['ab', '', 'c'], ['d', 'e', 'f']]
+    assert parser.spans == [(0, 0, 2)]
+
+
+def test_rows_are_padded():
+    assert LTC.LTCLaTeXParser().parse('a \\\\ b & c & d') == [['a', '', ''], ['b', 'c', 'd']]
+
+
+def test_tabbing_kill_line_is_dropped():
+    text = '\\begin{tabbing}\nxx \\= xx \\kill\na \\> b \\\\\nc \\> d\n\\end{tabbing}'
+    assert LTC.LTCLaTeXParser().parse(text) == [['a', 'b'], ['c', 'd']]
+
+
+def test_empty_rows_ending_in_row_end_are_kept():
+    parser = LTC.LTCLaTeXParser()
+    assert parser.parse('a \\\\\n\\\\\nb') == [['a'], [''], ['b']]
+    assert parser.parse('a & b \\\\ \\hline\n') == [['a', 'b']]
+    assert parser.parse('') == []
+
+
+def test_paste_latex_loads_the_table(app):
+    editor = LTC.LaTeXTableEditor(app)
+    editor.clipboard.setText('\\begin{tabular}{ll} a & b \\\\ c & d \\end{tabular}')
+    editor.pasteLatex()
+    assert editor.table_widget.getTableContents() == [['a', 'b'], ['c', 'd']]
+    editor.close()
@@ -0,0 +1,99 @@
+import pytest
+
+import LaTeXTableCreator as LTC
+
+Formats = LTC.LTCNumberFormats
+
+items = [['name', 'a', 'b', 'c'], ['x', '1234.5', '-3', '12'], ['y', 'n/a', '2.125', '0.00123'],
+         ['z', '-7', '1000', '']]
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def numpyMode(request, monkeypatch):
+    """
+    Runs a test with NumPy, when it is installed, and with the plain Python
+    formatting.
+    """
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(LTC, 'numpy', None)
+    LTC.LTCConditionalFormats.cache.clear()
+    return request.param
+
+
+def exportTable(options, spans=None):
+    model = LTC.LTCOptionsModel()
+    model.update(options)
+    return LTC.LTCExporter().createLaTeXCode(items, model.snapshot(), spans)
+
+
+def test_parse_formats():
+    assert Formats.parse('2-3: ,.2f split; 4: .3e S; bogus; 1: S; .1').formats == \
+        [(frozenset({1, 2}), ',.2f', 'split'), (frozenset({3}), '.3e', 'S'), (frozenset({0}), '', 'S'),
+         (None, '.1f', '')]
+
+
+@pytest.mark.parametrize('spec', ['.2f', ',.2f', '.1e', '.3E', '.2g', '.0%'])
+def test_numpy_and_python_agree(spec, monkeypatch):
+    pytest.importorskip('numpy')
+    column = ['1e400', '-1e400', '2.5', '-1,234.567', 'x', '', 'nan', '$3$']
+    values = LTC.LTCConditionalFormats.columnValues(column)
+    withNumpy = Formats.formatColumn(column, spec, values)
+    monkeypatch.setattr(LTC, 'numpy', None)
+    values = LTC.LTCConditionalFormats.columnValues(column)
+    assert Formats.formatColumn(column, spec, values) == withNumpy
+    assert withNumpy[:2] == ['1e400', '-1e400']
+    assert withNumpy[4:7] == ['x', '', 'nan']
+
+
+def test_apply_formats_numbers_only(numpyMode):
+    formatted, alignments = Formats.parse('2: ,.2f; 3: .1f S; 4: .1e split').apply(items)
+    assert [row[1] for row in formatted] == ['a', '1,234.50', 'n/a', '-7.00']
+    assert [row[2] for row in formatted] == ['b', '-3.0', '2.1', '1000.0']
+    assert [row[3] for row in formatted] == ['c', '1.2e+01', '1.2e-03', '']
+    assert alignments == ['', '', 'S', 'split']
+    assert items[1][1] == '1234.5'
+
+
+def test_siunitx_columns_drop_thousands_separators(numpyMode):
+    formatted, alignments = Formats.parse('2: ,.1f S').apply(items)
+    assert formatted[1][1] == '1234.5'
+
+
+def test_results_are_cached_by_column_revision():
+    LTC.LTCConditionalFormats.cache.clear()
+    formats = Formats.parse('2: .1f')
+    revisions = [10 ** 7 + j for j in range(4)]
+    first = formats.apply(items, revisions)[0]
+    assert ('format', revisions[1], '.1f') in LTC.LTCConditionalFormats.cache
+    assert formats.apply(items, revisions)[0] == first
+
+
+def test_no_formats_leave_the_export_unchanged():
+    for grid in ('longtable', 'tabular', 'array'):
+        assert exportTable({'Grid Type': grid, 'Number Formats': ''}) == exportTable({'Grid Type': grid})
+
+
+def test_siunitx_column(numpyMode):
+    code = exportTable({'Grid Type': 'tabular', 'Number Formats': '4: .2e S'})
+    assert '\\usepackage{siunitx}' in code
+    assert '\\begin{tabular}{lllS}' in code
+    assert 'name & a & b & {c} \\\\' in code
+    assert 'x & 1234.5 & -3 & 1.20e+01 \\\\' in code
+
+
+def test_split_column_with_rules_and_spans(numpyMode):
+    code = exportTable({'Grid Type': 'longtable', 'Number Formats': '2-3: .1f split',
+                        'Table Division All Rows': True}, LTC.LTCSpanIndex([(1, 2, 2, 1)]))
+    assert '{lr@{.}lr@{.}ll}' in code
+    assert 'name & \\multicolumn{2}{l}{a} & \\multicolumn{2}{l}{b} & c' in code
+    assert 'x & 1234 & 5 & \\multicolumn{2}{l}{\\multirow{2}{*}{-3.0}} & 12 \\\\  \\cline{1-3} \\cline{6-6}' in code
+    assert 'y & \\multicolumn{2}{l}{n/a} & \\multicolumn{2}{l}{} & 0.00123' in code
+    assert 'z & -7 & 0 & 1000 & 0 &  \\\\' in code
+
+
+def test_alignment_is_left_out_of_other_environments():
+    code = exportTable({'Grid Type': 'array', 'Number Formats': '2: .1f split'})
+    assert 'r@{.}l' not in code
+    assert 'x & 1234.5 & -3 & 12' in code
@@ -0,0 +1,43 @@
+import pytest
+
+import LaTeXTableCreator as LTC
+
+
+def test_snapshot_is_reused_until_a_change():
+    model = LTC.LTCOptionsModel()
+    snapshot = model.snapshot()
+    assert model.snapshot() is snapshot
+    model.update({'Grid Type': 'array'})
+    changed = model.snapshot()
+    assert changed is not snapshot
+    assert changed.version > snapshot.version
+    assert snapshot['Grid Type'] == 'longtable'
+    assert changed['Grid Type'] == 'array'
+
+
+def test_equal_options_hash_alike():
+    first = LTC.LTCOptions({'Grid Type': 'array', 'Math Mode': True}, 1)
+    second = LTC.LTCOptions({'Math Mode': True, 'Grid Type': 'array'}, 2)
+    assert first == second
+    assert hash(first) == hash(second)
+    assert len({first: 1, second: 2}) == 1
+
+
+def test_values_are_read_only():
+    options = LTC.LTCOptions({'Grid Type': 'array'})
+    hashValue = hash(options)
+    with pytest.raises(TypeError):
+        options.values['Grid Type'] = 'tabular'
+    assert hash(options) == hashValue
+
+
+def test_snapshot_does_not_follow_the_source_dictionary():
+    values = {'Grid Type': 'array'}
+    options = LTC.LTCOptions(values)
+    values['Grid Type'] = 'tabular'
+    assert options['Grid Type'] == 'array'
+
+
+def test_json():
+    options = LTC.LTCOptions({'b': 1, 'a': 'x'})
+    assert options.toJSON() == '{"a":"x","b":1}'
@@ -0,0 +1,52 @@
+import os
+
+import pytest
+
+import LaTeXTableCreator as LTC
+
+
+@pytest.fixture
+def presets(tmp_path):
+    return LTC.LTCPresets(LTC.LTCSettings(str(tmp_path)))
+
+
+def test_set_get_and_remove(presets):
+    assert presets.names() == []
+    assert presets.set('b', {'Grid Type': 'array'})
+    assert presets.set('A', {'Grid Type': 'tabular'})
+    assert presets.names() == ['A', 'b']
+    assert presets.get('b') == {'Grid Type': 'array'}
+    assert presets.remove('b')
+    assert presets.names() == ['A']
+    assert presets.get('b') is None
+
+
+def test_options_are_set_over_the_base(presets):
+    presets.set('bordered', {'Table Border': True})
+    options = presets.options('bordered', {'Grid Type': 'tabular'})
+    assert isinstance(options, LTC.LTCOptions)
+    assert options['Table Border'] is True
+    assert options['Grid Type'] == 'tabular'
+    assert presets.options('bordered')['Grid Type'] == 'longtable'
+
+
+def test_missing_preset_raises_unknown_preset(presets):
+    with pytest.raises(LTC.LTCUnknownPreset):
+        presets.options('missing')
+
+
+def test_presets_are_kept_in_the_settings_file(presets, tmp_path):
+    presets.set('math', {'Math Mode': True})
+    assert LTC.LTCPresets(LTC.LTCSettings(str(tmp_path))).get('math') == {'Math Mode': True}
+
+
+def test_export_with_a_preset_matches_the_editor_options(presets, tmp_path):
+    file_name = os.path.join(str(tmp_path), 'table.ltc')
+    items = [['a', 'b'], ['c', 'd']]
+    assert LTC.LaTeXTableEditor.saveDataFile(file_name, items)
+    presets.set('array', {'Grid Type': 'array', 'Array Border': True})
+
+    model = LTC.LTCOptionsModel()
+    model.update({'Grid Type': 'array', 'Array Border': True})
+    expected = LTC.LTCExporter().createLaTeXCode(items, model.snapshot())
+    assert LTC.LaTeXTableEditor.exportTableFile(file_name, 'array', presets) == expected
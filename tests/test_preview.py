@@ -0,0 +1,67 @@
+import pytest
+from PySide6.QtCore import QThreadPool
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QTableWidgetItem
+
+import LaTeXTableCreator as LTC
+
+
+def defaultOptions(**options):
+    model = LTC.LTCOptionsModel()
+    model.update(options)
+    return model.snapshot()
+
+
+def test_current_items_include_pending_edits(table):
+    entry = table.tableHistory[table.historyPos]
+    table.setItem(1, 1, QTableWidgetItem('b'))
+    assert table.currentItems() == [['', '', ''], ['', 'b', ''], ['', '', '']]
+    assert table.pendingEdits and len(table.tableHistory) == 1
+    assert entry == [[''] * 3] * 3
+    assert table.currentItems()[0] is entry[0]
+
+
+@pytest.mark.parametrize('grid', ['longtable', 'tabular', 'array', 'tabbing'])
+def test_row_fragments_are_reused(grid):
+    options = defaultOptions(**{'Grid Type': grid, 'Table Border': True})
+    items = [[str(i), 'x' * i, ''] for i in range(6)]
+    fragments = {}
+    first = LTC.LTCPreviewPane.render(items, options, 'LaTeX', fragments)
+    assert first == LTC.LTCExporter().createLaTeXCode(items, options)
+
+    items = [list(row) for row in items]
+    items[3][2] = 'changed'
+    second = LTC.LTCPreviewPane.render(items, options, 'LaTeX', fragments)
+    assert second == LTC.LTCExporter().createLaTeXCode(items, options)
+    assert 'changed' in second
+
+
+def test_long_code_is_cut(monkeypatch):
+    monkeypatch.setattr(LTC.LTCPreviewPane, 'lineLimit', 3)
+    code = LTC.LTCPreviewPane.render([[str(i)] for i in range(10)], defaultOptions(), 'Tab Delimited', None)
+    assert code == '0\n1\n2\n\n... The rest of the code is not shown, use the copy actions to get all of it.\n'
+
+
+def test_preview_follows_edits_once_shown(app, monkeypatch):
+    monkeypatch.setattr(LTC.LTCPreviewPane, 'refreshDelay', 10)
+    editor = LTC.LaTeXTableEditor(app)
+    pane = editor.preview_pane
+    pane.refresh_timer.setInterval(10)
+    pane.format_selector.setCurrentText('Tab Delimited')
+    editor.table_widget.setItem(0, 0, QTableWidgetItem('shown'))
+    assert pane.pending and not pane.refresh_timer.isActive()
+
+    editor.show()
+    editor.preview_dock.show()
+    for i in range(100):
+        QTest.qWait(10)
+        if pane.code_view.toPlainText().startswith('shown'):
+            break
+    assert pane.code_view.toPlainText().startswith('shown\t\t\n')
+    assert editor.table_widget.pendingEdits
+
+    pane.cancel()
+    QThreadPool.globalInstance().waitForDone()
+    for document in editor.documents():
+        document.discardJournal()
+    editor.close()
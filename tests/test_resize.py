@@ -0,0 +1,48 @@
+import pytest
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QTableWidgetItem
+
+import LaTeXTableCreator as LTC
+
+
+@pytest.fixture
+def document(app):
+    window = LTC.LaTeXTableEditor(app)
+    yield window.currentDocument()
+    for document in window.documents():
+        document.discardJournal()
+    window.close()
+
+
+def test_spinner_steps_resize_once(document):
+    table = document.table_widget
+    entries = len(table.tableHistory)
+    for rows in range(4, 9):
+        document.rows.setValue(rows)
+    assert table.rowCount() == 3
+    assert document.resize_timer.isActive()
+
+    QTest.qWait(document.resizeDelay + 100)
+    assert table.rowCount() == 8
+    assert len(table.tableHistory) == entries + 1
+
+
+def test_grow_after_shrink_restores_cells(document):
+    table = document.table_widget
+    table.setItem(2, 2, QTableWidgetItem('c'))
+    table.setItem(0, 2, QTableWidgetItem('r'))
+    table.resizeTable(2, 2)
+    table.resizeTable(2, 3)
+    assert table.getTableContents() == [['', '', 'r'], ['', '', '']]
+    table.resizeTable(4, 3)
+    assert table.getTableContents() == [['', '', 'r'], ['', '', ''], ['', '', 'c'], ['', '', '']]
+    assert document.journal.recover() == table.getTableContents()
+
+
+def test_other_edit_drops_the_cut_cells(document):
+    table = document.table_widget
+    table.setItem(2, 2, QTableWidgetItem('c'))
+    table.resizeTable(2, 2)
+    table.setItem(0, 0, QTableWidgetItem('a'))
+    table.resizeTable(3, 3)
+    assert table.getTableContents() == [['a', '', ''], ['', '', ''], ['', '', '']]
@@ -0,0 +1,38 @@
+import os
+import re
+
+import pytest
+
+import LaTeXTableCreator as LTC
+
+sourceFolder = os.path.dirname(os.path.abspath(LTC.__file__))
+
+
+def bundledFiles():
+    with open(os.path.join(sourceFolder, 'LTCResources.qrc'), 'r', encoding='utf-8') as f:
+        return re.findall(r'<file>([^<]+)</file>', f.read())
+
+
+@pytest.fixture(scope='module')
+def editor(app):
+    window = LTC.LaTeXTableEditor(app)
+    yield window
+    window.close()
+
+
+def test_bundled_files_exist():
+    for file_name in bundledFiles():
+        assert os.path.isfile(os.path.join(sourceFolder, file_name)), file_name
+
+
+def test_every_icon_used_is_bundled():
+    with open(LTC.__file__, 'r', encoding='utf-8') as f:
+        used = set(re.findall(r"""['"](icons/[^'"]+\.png)['"]""", f.read()))
+    assert used and used <= set(bundledFiles())
+
+
+def test_icon_path_prefers_the_bundle(editor, monkeypatch):
+    monkeypatch.setattr(LTC, 'hasResourceBundle', True)
+    assert editor.icon_path('icons/copy.png') == ':/icons/copy.png'
+    monkeypatch.setattr(LTC, 'hasResourceBundle', False)
+    assert editor.icon_path('icons/copy.png') == editor.resource_path('icons/copy.png')
@@ -0,0 +1,82 @@
+import json
+import zlib
+
+import pytest
+from PySide6.QtWidgets import QMessageBox, QTableWidgetItem
+
+import LaTeXTableCreator as LTC
+
+
+@pytest.fixture(scope='module')
+def editor(app):
+    window = LTC.LaTeXTableEditor(app)
+    yield window
+    window.close()
+
+
+@pytest.fixture
+def warnings(monkeypatch):
+    shown = []
+    monkeypatch.setattr(QMessageBox, 'warning', lambda *args: shown.append(args[1]))
+    return shown
+
+
+def editedTable(table):
+    table.setItem(0, 0, QTableWidgetItem('a'))
+    table.resizeTable(3, 4)
+    table.setItem(0, 1, QTableWidgetItem('b'))
+    table.resizeTable(3, 3)
+    table.setItem(2, 2, QTableWidgetItem('c'))
+    table.adjustFontSize(15)
+    table.horizontalHeader().resizeSection(1, 140)
+    return table
+
+
+def test_history_rows_are_stored_once(table):
+    state = editedTable(table).getSessionState()
+    assert len(state['History']) == len(table.tableHistory) > 3
+    assert len(state['Rows']) == len({tuple(row) for entry in table.tableHistory for row in entry})
+    assert json.loads(json.dumps(state)) == state
+
+
+def test_table_state_round_trip(app, table):
+    editedTable(table).getSessionState()
+    table.undo()
+    state = table.getSessionState()
+
+    restored = LTC.LTC_Table()
+    restored.setSessionState(state)
+    assert restored.tableHistory == table.tableHistory
+    assert restored.historyPos == len(table.tableHistory) - 2
+    assert restored.getTableContents() == table.getTableContents()
+    assert restored.fontPointSize == 15
+    assert restored.horizontalHeader().sectionSize(1) == 140
+    restored.redo()
+    assert restored.getTableContents() == [['a', 'b', ''], ['', '', ''], ['', '', 'c']]
+
+
+def writeSession(file_name, session):
+    with open(file_name, 'wb') as f:
+        f.write(LTC.LaTeXTableEditor.sessionMagic + zlib.compress(json.dumps(session).encode('utf-8')))
+
+
+def test_open_session_restores_table_and_options(app, editor, table, tmp_path, warnings):
+    options = dict(editor.options_pane.getOptionsInfo())
+    options['Table Border'] = not options['Table Border']
+    file_name = str(tmp_path / 'table.ltcs')
+    writeSession(file_name, {'Version': 1, 'Table': editedTable(table).getSessionState(), 'Options': options})
+
+    editor.openSession(file_name)
+    assert warnings == []
+    assert editor.table_widget.getTableContents() == [['a', 'b', ''], ['', '', ''], ['', '', 'c']]
+    assert dict(editor.options_pane.getOptionsInfo()) == options
+
+
+def test_open_session_rejects_other_files(editor, tmp_path, warnings):
+    file_name = str(tmp_path / 'table.ltcs')
+    with open(file_name, 'wb') as f:
+        f.write(b'not a session')
+    contents = editor.table_widget.getTableContents()
+    editor.openSession(file_name)
+    assert warnings == ['File Not Loaded']
+    assert editor.table_widget.getTableContents() == contents
@@ -0,0 +1,99 @@
+import json
+import os
+
+from PySide6.QtWidgets import QStyleFactory
+
+import LaTeXTableCreator as LTC
+
+
+def readJSON(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_defaults_without_a_file(tmp_path):
+    settings = LTC.LTCSettings(str(tmp_path))
+    assert settings.get('Theme') == ''
+    assert settings.get('Font Size') == 12
+    assert settings.get('Performance')['Preview Delay'] == 300
+
+
+def test_update_writes_versioned_json(tmp_path):
+    settings = LTC.LTCSettings(str(tmp_path))
+    assert settings.update({'Theme': 'Fusion', 'Font Size': 14})
+    data = readJSON(settings.path())
+    assert data['Theme'] == 'Fusion'
+    assert data['Font Size'] == 14
+    assert data['Version'] == LTC.LTCSettings.version
+    assert LTC.LTCSettings(str(tmp_path)).get('Theme') == 'Fusion'
+
+
+def test_invalid_values_fall_back_to_defaults(tmp_path):
+    with open(os.path.join(str(tmp_path), 'settings.json'), 'w', encoding='utf-8') as f:
+        json.dump({'Theme': 5, 'Recent Files': ['a', 3], 'Performance': {'Preview Delay': 'x', 'Resize Delay': 10},
+                   'Presets': {'good': {}, 'bad': 1}}, f)
+    settings = LTC.LTCSettings(str(tmp_path))
+    assert settings.get('Theme') == ''
+    assert settings.get('Recent Files') == ['a']
+    assert settings.get('Performance')['Preview Delay'] == 300
+    assert settings.get('Performance')['Resize Delay'] == 10
+    assert settings.get('Presets') == {'good': {}}
+
+
+def test_broken_file_is_read_as_empty(tmp_path):
+    with open(os.path.join(str(tmp_path), 'settings.json'), 'w', encoding='utf-8') as f:
+        f.write('{"Theme": ')
+    assert LTC.LTCSettings(str(tmp_path)).get('Theme') == ''
+
+
+def test_concurrent_writers_keep_each_others_changes(tmp_path):
+    first = LTC.LTCSettings(str(tmp_path))
+    second = LTC.LTCSettings(str(tmp_path))
+    first.get('Theme')
+    second.get('Theme')
+    assert first.update({'Theme': 'Fusion'})
+    assert second.update({'Font Size': 16})
+    data = readJSON(first.path())
+    assert data['Theme'] == 'Fusion'
+    assert data['Font Size'] == 16
+
+
+def test_unknown_settings_of_newer_versions_are_kept(tmp_path):
+    with open(os.path.join(str(tmp_path), 'settings.json'), 'w', encoding='utf-8') as f:
+        json.dump({'Version': 7, 'Future': [1, 2]}, f)
+    settings = LTC.LTCSettings(str(tmp_path))
+    assert settings.update({'Theme': 'Fusion'})
+    data = readJSON(settings.path())
+    assert data['Future'] == [1, 2]
+    assert data['Version'] == 7
+
+
+def test_recent_files(tmp_path):
+    settings = LTC.LTCSettings(str(tmp_path))
+    for i in range(LTC.LTCSettings.maxRecentFiles + 2):
+        settings.addRecentFile(os.path.join(str(tmp_path), str(i) + '.tex'))
+    settings.addRecentFile(os.path.join(str(tmp_path), '5.tex'))
+    files = settings.get('Recent Files')
+    assert len(files) == LTC.LTCSettings.maxRecentFiles
+    assert os.path.basename(files[0]) == '5.tex'
+    assert os.path.basename(files[1]) == '11.tex'
+    assert files.count(files[0]) == 1
+
+
+def test_saved_theme_is_applied_without_a_parent(app, tmp_path, monkeypatch):
+    themes = QStyleFactory.keys()
+    theme = 'Windows' if 'Windows' in themes else themes[0]
+    settings = LTC.LTCSettings(str(tmp_path))
+    assert settings.update({'Theme': theme})
+    monkeypatch.setattr(LTC.LTCSettings, 'settings', settings)
+    original = app.style().name()
+
+    editor = LTC.LaTeXTableEditor()
+    try:
+        assert editor.currentTheme == theme
+        assert app.style().name().lower() == theme.lower()
+    finally:
+        for document in editor.documents():
+            document.discardJournal()
+        editor.close()
+        app.setStyle(original)
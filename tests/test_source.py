@@ -0,0 +1,11 @@
+import warnings
+
+import LaTeXTableCreator as LTC
+
+
+def test_source_compiles_without_warnings():
+    with open(LTC.__file__, encoding='utf-8') as source:
+        text = source.read()
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        compile(text, LTC.__file__, 'exec')
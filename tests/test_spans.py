@@ -0,0 +1,163 @@
+import LaTeXTableCreator as LTC
+
+
+def gridSpans(table):
+    """
+    Returns the spans set on the grid, to check they mirror the span index.
+    Covered cells report the span too, so each span is taken once from its
+    upper left cell.
+    """
+    spans = []
+    covered = set()
+    for i in range(table.rowCount()):
+        for j in range(table.columnCount()):
+            rows = table.rowSpan(i, j)
+            cols = table.columnSpan(i, j)
+            if rows * cols > 1 and (i, j) not in covered:
+                spans.append((i, j, rows, cols))
+                covered.update((r, c) for r in range(i, i + rows) for c in range(j, j + cols))
+    return spans
+
+
+def assertSpans(table, spans):
+    assert table.spanIndex.toList() == [list(span) for span in spans]
+    assert gridSpans(table) == sorted(spans)
+
+
+def test_find_and_rows():
+    index = LTC.LTCSpanIndex([(1, 1, 2, 2), (0, 3, 1, 2)])
+    assert index.find(1, 1) == (1, 1, 2, 2)
+    assert index.find(2, 2) == (1, 1, 2, 2)
+    assert index.find(1, 3) is None
+    assert index.find(0, 4) == (0, 3, 1, 2)
+    assert index.find(3, 1) is None
+    assert [span[1] for span in index.spansInRow(0)] == [3]
+    assert index.hasMultirow()
+    assert not LTC.LTCSpanIndex([(0, 0, 1, 3)]).hasMultirow()
+
+
+def test_merge_grows_to_take_in_overlapped_spans():
+    index = LTC.LTCSpanIndex([(0, 0, 2, 1), (2, 1, 1, 2)])
+    assert index.merge(1, 0, 2, 2).spans == ((0, 0, 3, 3),)
+    assert index.merge(3, 3, 1, 1) == index
+
+
+def test_unmerge():
+    index = LTC.LTCSpanIndex([(0, 0, 2, 2), (3, 0, 1, 2)])
+    assert index.unmerge(1, 1, 1, 1).spans == ((3, 0, 1, 2),)
+
+
+def test_shift_rows_and_columns():
+    index = LTC.LTCSpanIndex([(1, 1, 2, 2)])
+    assert index.insertRows(0, 2).spans == ((3, 1, 2, 2),)
+    assert index.insertRows(2, 1).spans == ((1, 1, 3, 2),)
+    assert index.insertRows(3, 1) == index
+    assert index.removeRows(1, 1).spans == ((1, 1, 1, 2),)
+    assert index.removeRows(0, 3).spans == ()
+    assert index.insertColumns(1, 1).spans == ((1, 2, 2, 2),)
+    assert index.removeColumns(2, 1).spans == ((1, 1, 2, 1),)
+    assert LTC.LTCSpanIndex([(0, 0, 1, 2)]).removeColumns(1, 1).spans == ()
+
+
+def test_transpose_and_clip():
+    index = LTC.LTCSpanIndex([(0, 1, 2, 3)])
+    assert index.transpose().spans == ((1, 0, 3, 2),)
+    assert index.clip(5, 5) is index
+    assert index.clip(1, 3).spans == ((0, 1, 1, 2),)
+    assert index.clip(1, 2).spans == ()
+
+
+def test_merge_and_unmerge_on_the_table(table, selectCells):
+    selectCells(table, 0, 0, 2, 2)
+    table.mergeCells()
+    assertSpans(table, [(0, 0, 2, 2)])
+    selectCells(table, 0, 0)
+    table.unmergeCells()
+    assertSpans(table, [])
+
+
+def test_spans_follow_inserts_and_deletes(table, selectCells):
+    table.resizeTable(4, 4)
+    selectCells(table, 1, 1, 2, 2)
+    table.mergeCells()
+
+    selectCells(table, 0, 0)
+    table.addRowAbove()
+    assertSpans(table, [(2, 1, 2, 2)])
+    table.addColumnBefore()
+    assertSpans(table, [(2, 2, 2, 2)])
+    selectCells(table, 2, 2)
+    table.addRowBelow()
+    assertSpans(table, [(2, 2, 3, 2)])
+
+    selectCells(table, 3, 0, 2, 1)
+    table.deleteRows()
+    assertSpans(table, [(2, 2, 1, 2)])
+    selectCells(table, 0, 3)
+    table.deleteColumns()
+    assertSpans(table, [])
+
+
+def test_spans_follow_transpose(table, selectCells):
+    table.resizeTable(2, 3)
+    selectCells(table, 0, 1, 1, 2)
+    table.mergeCells()
+    items = LTC.LTC_Table.transposeItems(table.getSnapshot())
+    table.setTableItems(items, ['transpose'], table.spanIndex.transpose(), table.cellStyles.transpose())
+    assert (table.rowCount(), table.columnCount()) == (3, 2)
+    assertSpans(table, [(1, 0, 2, 1)])
+
+
+def test_shrinking_clips_spans(table, selectCells):
+    selectCells(table, 1, 1, 2, 2)
+    table.mergeCells()
+    table.resizeTable(2, 3)
+    assertSpans(table, [(1, 1, 1, 2)])
+    table.resizeTable(2, 2)
+    assertSpans(table, [])
+
+
+def test_undo_and_redo_restore_spans(table, selectCells):
+    selectCells(table, 0, 0, 1, 2)
+    table.mergeCells()
+    selectCells(table, 2, 0)
+    table.addRowAbove()
+    assertSpans(table, [(0, 0, 1, 2)])
+    selectCells(table, 0, 0)
+    table.addRowAbove()
+    assertSpans(table, [(1, 0, 1, 2)])
+
+    table.undo()
+    assertSpans(table, [(0, 0, 1, 2)])
+    table.undo()
+    table.undo()
+    assertSpans(table, [])
+    table.redo()
+    assertSpans(table, [(0, 0, 1, 2)])
+    table.redo()
+    table.redo()
+    assertSpans(table, [(1, 0, 1, 2)])
+
+
+def test_session_state_keeps_span_history(table, selectCells):
+    selectCells(table, 0, 0, 2, 1)
+    table.mergeCells()
+    state = table.getSessionState()
+
+    restored = LTC.LTC_Table()
+    restored.setSessionState(state)
+    assertSpans(restored, [(0, 0, 2, 1)])
+    restored.undo()
+    assertSpans(restored, [])
+
+
+def test_export_writes_multicolumn_multirow_and_cline():
+    options = LTC.LTCOptionsModel()
+    options.update({'Grid Type': 'tabular', 'Table Division All Rows': True})
+    items = [['a', '', 'b'], ['c', 'd', 'e'], ['', 'f', 'g']]
+    code = LTC.LTCExporter().createLaTeXCode(items, options.snapshot(),
+                                             LTC.LTCSpanIndex([(0, 0, 1, 2), (1, 0, 2, 1)]))
+    assert '\\usepackage{multirow}' in code
+    assert '\\multicolumn{2}{l}{a} & b' in code
+    assert '\\multirow{2}{*}{c} & d & e \\\\  \\cline{2-3}' in code
+    assert LTC.LTCLaTeXParser().parse(code) == [['a', '', 'b'], ['\\multirow{2}{*}{c}', 'd', 'e'], ['', 'f', 'g']]
@@ -0,0 +1,47 @@
+import pytest
+
+import LaTeXTableCreator as LTC
+
+
+@pytest.fixture
+def pane(app):
+    widget = LTC.LTCOptionsEditorPane()
+    yield widget
+    widget.deleteLater()
+
+
+def test_panel_defaults_match_built_panels(pane):
+    lazy = dict(pane.getOptionsInfo())
+    for i in range(len(pane.panelBuilders)):
+        pane.ensurePanel(i)
+    assert dict(pane.getOptionsInfo()) == lazy
+
+
+def test_panel_is_built_when_its_type_is_selected(pane):
+    built = list(pane.panelsBuilt)
+    pane.types_selector.setCurrentText('array')
+    assert pane.panelsBuilt[2]
+    assert pane.panelsBuilt[3:] == built[3:]
+
+
+def test_journal_lock_is_taken_on_first_write(app):
+    journal = LTC.LTCEditJournal()
+    assert not journal.locked
+    journal.record(['cell', 0, 0, 'a'])
+    assert journal.locked and journal.entries == 1
+    journal.discard()
+
+
+def test_profiler_records_phases_only_when_enabled(monkeypatch, capsys):
+    monkeypatch.setattr(LTC.LTCStartupProfiler, 'phases', [])
+    monkeypatch.setattr(LTC.LTCStartupProfiler, 'lastMark', None)
+    LTC.LTCStartupProfiler.mark('Off')
+    assert LTC.LTCStartupProfiler.phases == []
+
+    monkeypatch.setattr(LTC.LTCStartupProfiler, 'enabled', True)
+    LTC.LTCStartupProfiler.mark('Imports', 0.0)
+    LTC.LTCStartupProfiler.mark('Menus')
+    LTC.LTCStartupProfiler.report()
+    err = capsys.readouterr().err
+    assert [phase for phase, _ in LTC.LTCStartupProfiler.phases] == ['Imports', 'Menus', 'First event loop pass']
+    assert 'Startup profile:' in err and 'Menus' in err and 'Total' in err
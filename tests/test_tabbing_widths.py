@@ -0,0 +1,36 @@
+import pytest
+
+import LaTeXTableCreator as LTC
+
+
+@pytest.mark.parametrize('text, width', [('', 0), ('ab', 10.556), ('W i', 16.389), ('{x}$', 5.278),
+                                         ('\\alpha', 8.333), ('\\alpha b', 13.889), ('\\%', 8.333),
+                                         ('é', 5.0)])
+def test_text_width(text, width):
+    assert LTC.LTCTabbingWidths.textWidth(text) == pytest.approx(width)
+
+
+def test_column_widths_are_the_widest_item_plus_the_gap():
+    items = [['a', 'mm'], ['ab', '']]
+    assert LTC.LTCTabbingWidths.columnWidths(items) == [20.6, 26.7]
+    assert LTC.LTCTabbingWidths.columnWidths(items, gap=0) == [10.6, 16.7]
+    assert LTC.LTCTabbingWidths.columnWidths([]) == []
+
+
+def test_auto_width_tabbing_export():
+    model = LTC.LTCOptionsModel()
+    model.update({'Grid Type': 'tabbing', 'Tabbing Auto Width': True})
+    code = LTC.LTCExporter().createLaTeXCode([['a', 'mm'], ['ab', '']], model.snapshot())
+    assert code.startswith('\\begin{tabbing} \n\\hspace{20.6pt}\\=\\hspace{26.7pt}\\=\\kill \n')
+
+    model.update({'Tabbing Auto Width': False})
+    code = LTC.LTCExporter().createLaTeXCode([['a', 'mm'], ['ab', '']], model.snapshot())
+    assert '\\hspace{20pt}\\=\\hspace{20pt}\\=\\kill' in code
+
+
+def test_width_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(LTC.LTCTabbingWidths, 'widthCache', {})
+    monkeypatch.setattr(LTC.LTCTabbingWidths, 'widthCacheLimit', 3)
+    texts = ['a' * n for n in range(1, 8)]
+    assert [LTC.LTCTabbingWidths.textWidth(text) for text in texts] == [5.0 * n for n in range(1, 8)]
+    assert len(LTC.LTCTabbingWidths.widthCache) <= 3
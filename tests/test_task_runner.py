@@ -0,0 +1,115 @@
+import threading
+
+import pytest
+from PySide6.QtCore import QThreadPool
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QMessageBox, QPushButton, QTableWidgetItem
+
+import LaTeXTableCreator as LTC
+
+
+@pytest.fixture
+def editor(app):
+    window = LTC.LaTeXTableEditor(app)
+    yield window
+    window.task_runner.cancelAll()
+    QThreadPool.globalInstance().waitForDone()
+    for document in window.documents():
+        document.discardJournal()
+    window.close()
+
+
+def waitFor(condition, timeout=5000):
+    while not condition() and timeout > 0:
+        QTest.qWait(10)
+        timeout -= 10
+    return condition()
+
+
+def test_item_functions():
+    items = [[' a', 'b '], ['c', ' d ']]
+    assert LTC.LTC_Table.transposeItems(items) == [[' a', 'c'], ['b ', ' d ']]
+    assert LTC.LTC_Table.trimItems(items) == [['a', 'b'], ['c', 'd']]
+    assert LTC.LTC_Table.fillItems(2, 3, 'x') == [['x'] * 3] * 2
+
+
+def test_small_task_runs_right_away(editor):
+    results = []
+    editor.task_runner.start("Fill", LTC.LTC_Table.fillItems, (1, 2, 'x'), results.append)
+    assert results == [[['x', 'x']]]
+    assert editor.task_runner.tasks == []
+
+
+def test_large_task_runs_on_the_pool(editor, monkeypatch):
+    monkeypatch.setattr(LTC.LTCTaskRunner, 'syncCellLimit', 0)
+    results = []
+    threads = []
+
+    def work(rows, task=None):
+        threads.append(threading.current_thread())
+        return LTC.LTC_Table.fillItems(rows, 1, 'y', task)
+
+    editor.task_runner.start("Fill", work, (3,), results.append, editor.currentDocument(), 3)
+    assert waitFor(lambda: len(results) == 1)
+    assert results[0] == [['y']] * 3
+    assert threads[0] is not threading.main_thread()
+    assert editor.task_runner.tasks == []
+
+
+def test_cancelled_task_is_not_applied(editor, monkeypatch):
+    monkeypatch.setattr(LTC.LTCTaskRunner, 'syncCellLimit', 0)
+    started = threading.Event()
+    results = []
+
+    def work(task=None):
+        started.set()
+        while True:
+            task.setProgress(0, 1)
+
+    task = editor.task_runner.start("Loop", work, (), results.append, cells=1)
+    assert started.wait(5)
+    task.dialog.findChild(QPushButton).click()
+    assert QThreadPool.globalInstance().waitForDone(5000)
+    QTest.qWait(20)
+    assert results == [] and editor.task_runner.tasks == []
+
+
+def test_failed_task_is_reported(editor, monkeypatch):
+    shown = []
+    monkeypatch.setattr(QMessageBox, 'warning', lambda *args: shown.append(args[2]))
+
+    def work(task=None):
+        raise ValueError('bad table')
+
+    editor.task_runner.start("Trim", work, (), shown.append)
+    assert shown == ["Trim could not be completed.\nbad table"]
+
+
+def test_result_for_an_edited_table_asks_first(editor, monkeypatch):
+    monkeypatch.setattr(LTC.LTCTaskRunner, 'syncCellLimit', 0)
+    monkeypatch.setattr(QMessageBox, 'question', lambda *args: QMessageBox.No)
+    gate = threading.Event()
+    results = []
+
+    def work(task=None):
+        gate.wait(5)
+        return 'done'
+
+    editor.task_runner.start("Trim", work, (), results.append, editor.currentDocument(), 1)
+    editor.table_widget.setItem(0, 0, QTableWidgetItem('a'))
+    gate.set()
+    assert QThreadPool.globalInstance().waitForDone(5000)
+    QTest.qWait(20)
+    assert results == [] and editor.task_runner.tasks == []
+
+
+def test_task_result_is_one_undo_entry(editor):
+    editor.loadTable([['', ' b ', ''], ['', '', ''], ['', '', '']])
+    table = editor.table_widget
+    entries = len(table.tableHistory)
+    editor.trim()
+    editor.transpose()
+    assert table.getTableContents() == [['', '', ''], ['b', '', ''], ['', '', '']]
+    assert len(table.tableHistory) == entries + 2
+    editor.undo()
+    assert table.getTableContents()[0][1] == 'b'
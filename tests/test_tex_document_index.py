@@ -0,0 +1,96 @@
+import os
+
+import pytest
+
+import LaTeXTableCreator as LTC
+
+
+DOCUMENT = r"""\documentclass{article}
+\begin{document}
+% \begin{tabular}{cc} x & y \end{tabular}
+\begin{tabular}{|l|*{2}{c}|p{2cm}|}
+\hline
+a & b & c & d \\
+e & f & g & h \\
+\hline
+\end{tabular}
+50\% of the
+\begin{tabbing}
+xx \= yy \kill
+a \> b \\
+c \> d
+\end{tabbing}
+$\begin{pmatrix} 1 & 2 \\ 3 & 4 \end{pmatrix}$
+\end{document}
+"""
+
+
+@pytest.fixture
+def texFile(tmp_path):
+    path = tmp_path / 'doc.tex'
+    path.write_text(DOCUMENT)
+    LTC.LTCTexDocumentIndex.indexCache.clear()
+    yield str(path)
+    LTC.LTCTexDocumentIndex.indexCache.clear()
+
+
+def test_environments_are_indexed(texFile):
+    index = LTC.LTCTexDocumentIndex.load(texFile)
+    found = [(e['Environment'], e['First Line'], e['Last Line']) for e in index.environments]
+    assert found == [('tabular', 4, 9), ('tabbing', 11, 15), ('pmatrix', 16, 16)]
+    assert [(e['Rows'], e['Columns']) for e in index.environments if e['Environment'] != 'tabbing'] == \
+        [(2, 4), (2, 2)]
+    assert index.environments[0]['Column Spec'] == '|l|*{2}{c}|p{2cm}|'
+
+
+def test_commented_environment_is_skipped(texFile):
+    index = LTC.LTCTexDocumentIndex.load(texFile)
+    assert all(e['First Line'] != 3 for e in index.environments)
+
+
+@pytest.mark.parametrize('spec, cols', [('lcr', 3), ('|l|*{3}{c}|', 4), ('@{}p{2cm}X@{}', 2),
+                                        ('*{2}{*{2}{l}}', 4), ('', 0)])
+def test_columns_in_spec(spec, cols):
+    index = LTC.LTCTexDocumentIndex('x.tex', '')
+    assert index.columnsInSpec(spec) == cols
+
+
+def test_only_selected_environment_is_parsed(texFile):
+    index = LTC.LTCTexDocumentIndex.load(texFile)
+    assert index.parseEnvironment(index.environments[0]) == [['a', 'b', 'c', 'd'], ['e', 'f', 'g', 'h']]
+    assert index.parseEnvironment(index.environments[2]) == [['1', '2'], ['3', '4']]
+
+
+def test_index_is_cached_until_the_file_changes(texFile):
+    index = LTC.LTCTexDocumentIndex.load(texFile)
+    assert LTC.LTCTexDocumentIndex.load(texFile) is index
+
+    with open(texFile, 'a') as f:
+        f.write('% more\n')
+    stat = os.stat(texFile)
+    os.utime(texFile, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+    assert LTC.LTCTexDocumentIndex.load(texFile) is not index
+
+
+def test_cache_keeps_offsets_and_drops_the_oldest_document(texFile, tmp_path, monkeypatch):
+    monkeypatch.setattr(LTC.LTCTexDocumentIndex, 'indexCacheSize', 2)
+    index = LTC.LTCTexDocumentIndex.load(texFile)
+    assert index.text is None
+    assert index.parseEnvironments(index.environments[:2])[0] == [['a', 'b', 'c', 'd'], ['e', 'f', 'g', 'h']]
+
+    others = []
+    for name in ('second.tex', 'third.tex'):
+        path = tmp_path / name
+        path.write_text(DOCUMENT)
+        others.append(LTC.LTCTexDocumentIndex.load(str(path)))
+    assert len(LTC.LTCTexDocumentIndex.indexCache) == 2
+    assert LTC.LTCTexDocumentIndex.load(str(tmp_path / 'third.tex')) is others[1]
+    assert LTC.LTCTexDocumentIndex.load(texFile) is not index
+
+
+def test_parsing_a_changed_file_raises(texFile):
+    index = LTC.LTCTexDocumentIndex.load(texFile)
+    with open(texFile, 'w') as f:
+        f.write('\\begin{tabular}{c} x \\end{tabular}\n')
+    with pytest.raises(ValueError):
+        index.parseEnvironment(index.environments[0])
@@ -0,0 +1,50 @@
+import pytest
+
+import LaTeXTableCreator as LTC
+
+Converter = LTC.LTCUnicodeConverter
+
+
+@pytest.mark.parametrize('text, converted', [('α ≤ β', '$\\alpha$ $\\leq$ $\\beta$'), ('café', "caf\\'{e}"),
+                                             ('“ok” – fine…', "``ok'' -- fine\\ldots{}"),
+                                             ('€5', '\\texteuro{}5'), ('Straße', 'Stra\\ss{}e'),
+                                             ('$α$', '$\\alpha $'), ('中', '中')])
+def test_text_mode(text, converted):
+    assert Converter.convert(text) == converted
+
+
+@pytest.mark.parametrize('text, converted', [('αb', '\\alpha b'), ('x²', 'x^{2}'), ('é', '\\acute{e}'),
+                                             ('ç', '\\mbox{\\c{c}}'), ('€', '\\mbox{\\texteuro{}}'),
+                                             ('a−b', 'a-b')])
+def test_math_mode(text, converted):
+    assert Converter.convertMath(text) == converted
+
+
+def test_ascii_is_returned_unchanged():
+    text = 'plain \\alpha & text'
+    assert Converter.convert(text) is text
+
+
+def test_new_characters_are_kept_in_the_table():
+    code = ord('ŵ')
+    Converter.textTable.pop(code, None)
+    assert Converter.convert('ŵ') == '\\^{w}'
+    assert Converter.textTable[code] == '\\^{w}'
+
+
+def test_convert_items_and_journal_replay():
+    items = [['α', 'b'], ['ü', '']]
+    assert Converter.convertItems(items) == [['$\\alpha$', 'b'], ['\\"{u}', '']]
+    assert Converter.convertItems(items, True) == [['\\alpha ', 'b'], ['\\ddot{u}', '']]
+    assert LTC.LTCEditJournal.apply(items, ['unicode', True]) == Converter.convertItems(items, True)
+
+
+def test_export_converts_after_escaping():
+    model = LTC.LTCOptionsModel()
+    model.update({'Grid Type': 'tabular', 'Escape Special Characters': True, 'Convert Unicode': True})
+    code = LTC.LTCExporter().createLaTeXCode([['α & β', 'x_μ']], model.snapshot())
+    assert '$\\alpha$ \\& $\\beta$ & x\\_$\\mu$' in code
+
+    model.update({'Grid Type': 'array'})
+    code = LTC.LTCExporter().createLaTeXCode([['α & β', 'x_μ']], model.snapshot())
+    assert '\\alpha  & \\beta  & x_\\mu ' in code